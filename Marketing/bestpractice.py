@@ -1,113 +1,12 @@
-def main():
-    """Main function to generate posts"""
-    print("Generating Twitter posts for Treasure.Corp...")
-    
-    company_info = {
-        "company_name": COMPANY_NAME,
-        "industry": INDUSTRY,
-        "product_service": PRODUCT_SERVICE,
-        "benefits": KEY_BENEFITS,
-        "pain_points": PAIN_POINTS,
-        "hashtags": HASHTAGS
-    }
-    
-    # Generate posts
-    posts = generate_posts_for_week(company_info)
-    
-    # Save to file
-    filename = f"treasure_corp_twitter_posts_{datetime.datetime.now().strftime('%Y%m%d')}.md"
-    save_posts_to_file(posts, filename)
-    
-    print(f"Generated {len(posts)} posts and saved to {filename}")
-    print("\nSample post for today:")
-    print("-" * 50)
-    print(posts[0][1])
-    print("-" * 50)
-    print(f"\nOpen {filename} to view all posts for copy-pasting to Buffer.")
-    
-    print("\nText-to-Image Tools for Twitter Posts:")
-    print("1. Canva (www.canva.com) - Free templates for social media")
-    print("2. Pablo by Buffer - Built right into Buffer")
-    print("3. Adobe Express (www.adobe.com/express) - Professional templates")
-    print("4. Visme (www.visme.co) - Great for data visualization")
-    print("5. Piktochart (piktochart.com) - For infographics and charts")
-    
-    input("\nPress Enter to exit...")  # Add this line to keep console window open
-
-if __name__ == "__main__":
-    main()def generate_post_from_template(theme: str, company_info: Dict) -> str:
-    """Generate a post from our template library"""
-    if theme in POST_TEMPLATES:
-        template = random.choice(POST_TEMPLATES[theme])
-        return fill_template(template, company_info)
-    else:
-        # Fallback to Anthropic if we don't have templates for this theme
-        return generate_post_with_anthropic(theme, company_info)
-
-def get_day_theme(date: datetime.datetime) -> str:
-    """Get the theme for a specific day"""
-    day_of_week = date.weekday()
-    return WEEKLY_THEMES[day_of_week]
-
-def generate_posts_for_week(company_info: Dict) -> List[Tuple[str, str]]:
-    """Generate posts for the entire week"""
-    today = datetime.datetime.now()
-    posts = []
-    
-    # Generate a post for each day of the week
-    for i in range(7):
-        day = today + datetime.timedelta(days=i)
-        theme = get_day_theme(day)
-        post = generate_post_from_template(theme, company_info)
-        posts.append((day.strftime("%A"), post))
-    
-    return posts
-
-def save_posts_to_file(posts: List[Tuple[str, str]], filename: str):
-    """Save generated posts to a file for easy copy-pasting to Buffer"""
-    try:
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write("# Generated Twitter Posts for Treasure.Corp\n\n")
-            f.write(f"Generated on: {datetime.datetime.now().strftime('%Y-%m-%d')}\n\n")
-            
-            f.write("## Text-to-Image Tools Recommendation\n\n")
-            f.write("To convert these posts to eye-catching images for higher engagement, try these tools:\n\n")
-            f.write("1. **Canva** - Free templates specifically designed for social media\n")
-            f.write("2. **Pablo by Buffer** - Since you're using Buffer, their built-in image creator is convenient\n")
-            f.write("3. **Adobe Express** - Professional-quality templates with free tier\n")
-            f.write("4. **Visme** - Great for data visualization if sharing treasury metrics\n")
-            f.write("5. **Piktochart** - Good for creating infographics about DAO benchmarks\n\n")
-            
-            f.write("## DAO Benchmark Data\n\n")
-            f.write("These real-world examples are included in your posts for comparison:\n\n")
-            for benchmark in DAO_BENCHMARKS:
-                f.write(f"- {benchmark}\n")
-            f.write("\n")
-            
-            for day, post in posts:
-                f.write(f"## {day}\n\n")
-                f.write(f"{post}\n\n")
-                f.write("-" * 80 + "\n\n")
-        print(f"Successfully wrote posts to {filename}")
-    except Exception as e:
-        # Fallback to ASCII encoding if UTF-8 fails
-        print(f"Error with UTF-8 encoding: {e}")
-        print("Trying with ASCII encoding and ignoring errors...")
-        
-        with open(filename, "w", encoding="ascii", errors="ignore") as f:
-            f.write("# Generated Twitter Posts for Treasure.Corp\n\n")
-            f.write(f"Generated on: {datetime.datetime.now().strftime('%Y-%m-%d')}\n\n")
-            
-            for day, post in posts:
-                f.write(f"## {day}\n\n")
-                f.write(f"{post}\n\n")
-                f.write("-" * 80 + "\n\n")
-        print(f"Successfully wrote posts with ASCII encoding to {filename}")import os
-import requests
+import os
 import json
 import datetime
 import random
 from typing import List, Dict, Tuple
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from llm_gateway import LLMError, get_gateway
 
 # Configuration - Use environment variables
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
@@ -261,32 +160,13 @@ def get_emoji():
     return random.choice(emojis)
 
 def get_anthropic_response(prompt: str) -> str:
-    """Get a response from Anthropic API"""
-    headers = {
-        "x-api-key": ANTHROPIC_API_KEY,
-        "content-type": "application/json"
-    }
-    
-    data = {
-        "model": "claude-3-opus-20240229",
-        "max_tokens": 1000,
-        "messages": [
-            {"role": "user", "content": prompt}
-        ]
-    }
-    
-    response = requests.post(
-        "https://api.anthropic.com/v1/messages",
-        headers=headers,
-        json=data
-    )
-    
-    if response.status_code == 200:
-        return response.json()["content"][0]["text"]
-    else:
-        print(f"Error: {response.status_code}")
-        print(response.text)
-        return f"Error generating content: {response.status_code}"
+    """Get a response from Anthropic API through the shared gateway"""
+    try:
+        return get_gateway().complete_sync(prompt, model="claude-3-opus-20240229", max_tokens=1000,
+                                           caller="bestpractice")
+    except LLMError as e:
+        print(f"Error: {e}")
+        return f"Error generating content: {e.status}"
 
 def generate_post_with_anthropic(theme: str, company_info: Dict) -> str:
     """Generate a Twitter post using Anthropic API"""
@@ -343,4 +223,112 @@ def fill_template(template: str, company_info: Dict) -> str:
             hashtag_str = " ".join(selected_hashtags)
             filled_template = filled_template.replace(f"{{{placeholder}}}", hashtag_str)
     
-    return filled_template
\ No newline at end of file
+    return filled_template
+
+def generate_post_from_template(theme: str, company_info: Dict) -> str:
+    """Generate a post from our template library"""
+    if theme in POST_TEMPLATES:
+        template = random.choice(POST_TEMPLATES[theme])
+        return fill_template(template, company_info)
+    else:
+        # Fallback to Anthropic if we don't have templates for this theme
+        return generate_post_with_anthropic(theme, company_info)
+
+def get_day_theme(date: datetime.datetime) -> str:
+    """Get the theme for a specific day"""
+    day_of_week = date.weekday()
+    return WEEKLY_THEMES[day_of_week]
+
+def generate_posts_for_week(company_info: Dict) -> List[Tuple[str, str]]:
+    """Generate posts for the entire week"""
+    today = datetime.datetime.now()
+    posts = []
+    
+    # Generate a post for each day of the week
+    for i in range(7):
+        day = today + datetime.timedelta(days=i)
+        theme = get_day_theme(day)
+        post = generate_post_from_template(theme, company_info)
+        posts.append((day.strftime("%A"), post))
+    
+    return posts
+
+def save_posts_to_file(posts: List[Tuple[str, str]], filename: str):
+    """Save generated posts to a file for easy copy-pasting to Buffer"""
+    try:
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write("# Generated Twitter Posts for Treasure.Corp\n\n")
+            f.write(f"Generated on: {datetime.datetime.now().strftime('%Y-%m-%d')}\n\n")
+            
+            f.write("## Text-to-Image Tools Recommendation\n\n")
+            f.write("To convert these posts to eye-catching images for higher engagement, try these tools:\n\n")
+            f.write("1. **Canva** - Free templates specifically designed for social media\n")
+            f.write("2. **Pablo by Buffer** - Since you're using Buffer, their built-in image creator is convenient\n")
+            f.write("3. **Adobe Express** - Professional-quality templates with free tier\n")
+            f.write("4. **Visme** - Great for data visualization if sharing treasury metrics\n")
+            f.write("5. **Piktochart** - Good for creating infographics about DAO benchmarks\n\n")
+            
+            f.write("## DAO Benchmark Data\n\n")
+            f.write("These real-world examples are included in your posts for comparison:\n\n")
+            for benchmark in DAO_BENCHMARKS:
+                f.write(f"- {benchmark}\n")
+            f.write("\n")
+            
+            for day, post in posts:
+                f.write(f"## {day}\n\n")
+                f.write(f"{post}\n\n")
+                f.write("-" * 80 + "\n\n")
+        print(f"Successfully wrote posts to {filename}")
+    except Exception as e:
+        # Fallback to ASCII encoding if UTF-8 fails
+        print(f"Error with UTF-8 encoding: {e}")
+        print("Trying with ASCII encoding and ignoring errors...")
+        
+        with open(filename, "w", encoding="ascii", errors="ignore") as f:
+            f.write("# Generated Twitter Posts for Treasure.Corp\n\n")
+            f.write(f"Generated on: {datetime.datetime.now().strftime('%Y-%m-%d')}\n\n")
+            
+            for day, post in posts:
+                f.write(f"## {day}\n\n")
+                f.write(f"{post}\n\n")
+                f.write("-" * 80 + "\n\n")
+        print(f"Successfully wrote posts with ASCII encoding to {filename}")
+
+def main():
+    """Main function to generate posts"""
+    print("Generating Twitter posts for Treasure.Corp...")
+    
+    company_info = {
+        "company_name": COMPANY_NAME,
+        "industry": INDUSTRY,
+        "product_service": PRODUCT_SERVICE,
+        "benefits": KEY_BENEFITS,
+        "pain_points": PAIN_POINTS,
+        "hashtags": HASHTAGS
+    }
+    
+    # Generate posts
+    posts = generate_posts_for_week(company_info)
+    
+    # Save to file
+    filename = f"treasure_corp_twitter_posts_{datetime.datetime.now().strftime('%Y%m%d')}.md"
+    save_posts_to_file(posts, filename)
+    
+    print(f"Generated {len(posts)} posts and saved to {filename}")
+    print("\nSample post for today:")
+    print("-" * 50)
+    print(posts[0][1])
+    print("-" * 50)
+    print(f"\nOpen {filename} to view all posts for copy-pasting to Buffer.")
+    
+    print("\nText-to-Image Tools for Twitter Posts:")
+    print("1. Canva (www.canva.com) - Free templates for social media")
+    print("2. Pablo by Buffer - Built right into Buffer")
+    print("3. Adobe Express (www.adobe.com/express) - Professional templates")
+    print("4. Visme (www.visme.co) - Great for data visualization")
+    print("5. Piktochart (piktochart.com) - For infographics and charts")
+    
+    input("\nPress Enter to exit...")  # Add this line to keep console window open
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,31 @@
-import requests
 import json
 import datetime
 import random
 import os
 import hashlib
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from llm_gateway import get_gateway
+from post_batch import print_progress, run_batch
 
 class ProfessionalTweetGenerator:
+    # One theme per day of the weekly batch
+    weekly_themes = [
+        "Treasury Risk Management",
+        "Quantitative Treasury Allocation",
+        "On-Chain Governance Analytics",
+        "Treasury Diversification Strategies",
+        "Capital Efficiency Metrics", 
+        "Treasury Management ROI",
+        "Protocol Runway Optimization"
+    ]
+    
     def __init__(self, api_key):
         # API configuration
         self.api_key = api_key
-        self.api_url = "https://api.anthropic.com/v1/messages"
+        self.llm = get_gateway(api_key)
         self.model = "claude-3-opus-20240229"
         
         # Company information
@@ -95,8 +111,8 @@ class ProfessionalTweetGenerator:
             
         self.save_post_history()
     
-    def generate_post_with_api(self, theme, include_emojis=True):
-        """Generate a post using the Anthropic API"""
+    def build_prompt(self, theme, include_emojis=True):
+        """Prompt for one post on `theme`"""
         
         # Construct the prompt
         emoji_instruction = "Include 1-2 relevant emojis in the post." if include_emojis else "Do not use emojis in the post."
@@ -127,83 +143,37 @@ class ProfessionalTweetGenerator:
         Format: Just provide the post text, nothing else.
         """
         
-        # Prepare the API request
-        headers = {
-            "x-api-key": self.api_key,
-            "content-type": "application/json",
-            "anthropic-version": "2023-06-01"
-        }
-        
-        data = {
-            "model": self.model,
-            "max_tokens": 300,
-            "messages": [
-                {"role": "user", "content": prompt}
-            ]
-        }
+        return prompt
+    
+    def generate_post_with_api(self, theme, include_emojis=True):
+        """Generate a post using the Anthropic API"""
+        prompt = self.build_prompt(theme, include_emojis)
         
-        # Make the API request
+        # Request through the shared gateway (pooled keep-alive connections, retries with backoff)
         try:
-            response = requests.post(
-                self.api_url,
-                headers=headers,
-                json=data
-            )
-            
-            response.raise_for_status()  # Raise exception for HTTP errors
-            result = response.json()
-            
-            if "content" in result and len(result["content"]) > 0:
-                post = result["content"][0]["text"].strip()
-                return post
-            else:
-                raise Exception("Empty response from API")
-                
+            return self.llm.complete_sync(prompt, model=self.model, max_tokens=300,
+                                          caller=type(self).__name__).strip()
         except Exception as e:
             print(f"API Error: {e}")
             return None
     
     def generate_unique_post(self, theme, max_attempts=5):
         """Generate a unique post that isn't a duplicate of previous posts"""
-        attempts = 0
-        
-        while attempts < max_attempts:
-            post = self.generate_post_with_api(theme)
-            
-            if post and not self.is_duplicate(post):
-                # Add to history and return
-                self.add_to_history(post)
-                return post
-            
-            attempts += 1
-            if post:
-                print(f"Generated duplicate post, retrying... (Attempt {attempts}/{max_attempts})")
-            else:
-                print(f"Failed to generate post, retrying... (Attempt {attempts}/{max_attempts})")
-        
-        # If we couldn't generate a unique post after max attempts
-        return "Failed to generate a unique post after multiple attempts. Please try again later."
+        return run_batch(self, [theme], max_attempts)[0]
     
     def generate_professional_posts(self, count=7):
         """Generate professional posts focused on investment insights"""
-        themes = [
-            "Treasury Risk Management",
-            "Quantitative Treasury Allocation",
-            "On-Chain Governance Analytics",
-            "Treasury Diversification Strategies",
-            "Capital Efficiency Metrics", 
-            "Treasury Management ROI",
-            "Protocol Runway Optimization"
-        ]
+        themes = self.weekly_themes[:count]
+        days = [(datetime.datetime.now() + datetime.timedelta(days=i)).strftime("%A") for i in range(len(themes))]
+        for day, theme in zip(days, themes):
+            print(f"Generating professional post for {day} with theme: {theme}")
+        
+        # All themes are generated concurrently; uniqueness is checked across the batch and history
+        contents = run_batch(self, themes, on_post=print_progress(time.monotonic()))
         
         posts = []
         
-        for i in range(min(count, len(themes))):
-            theme = themes[i]
-            day = (datetime.datetime.now() + datetime.timedelta(days=i)).strftime("%A")
-            
-            print(f"Generating professional post for {day} with theme: {theme}")
-            post = self.generate_unique_post(theme)
+        for day, theme, post in zip(days, themes, contents):
             posts.append({"day": day, "theme": theme, "content": post})
         
         return posts
@@ -1,15 +1,31 @@
-import requests
 import json
 import datetime
 import random
 import os
 import hashlib
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from llm_gateway import get_gateway
+from post_batch import post_system_prompt, print_progress, run_batch
 
 class EngagementOptimizedGenerator:
+    # One theme per day of the weekly batch
+    weekly_themes = [
+        "DAO Treasury Analytics",
+        "On-Chain Governance Data",
+        "Treasury Diversification Insights",
+        "Voter Participation Metrics",
+        "Sustainability Indicators", 
+        "Data Literacy in DAOs",
+        "Treasury Transparency Patterns"
+    ]
+    
     def __init__(self, api_key):
         # API configuration
         self.api_key = api_key
-        self.api_url = "https://api.anthropic.com/v1/messages"
+        self.llm = get_gateway(api_key)
         self.model = "claude-3-opus-20240229"
         
         # Company information
@@ -157,8 +173,29 @@ class EngagementOptimizedGenerator:
             
         self.save_post_history()
     
-    def generate_post_with_api(self, theme):
-        """Generate a post using the Anthropic API based on deep engagement analysis"""
+    @property
+    def system_prompt(self):
+        """Instructions shared by every post, sent as the system prompt ahead of build_prompt()"""
+        return f"""
+        Create Twitter posts for {self.company_name} about {self.product} that will generate high engagement.
+        
+        For context, this previous post received 57 engagements from our audience:
+        "{self.high_engagement_post}"
+        
+        Requirements:
+        - Match the intellectual, curious tone of the high-engagement post
+        - Follow the three-part structure: observation → examples → broader implication
+        - Include specific technical details that demonstrate expertise
+        - End with a thought-provoking insight about the future
+        - Use precise hashtags (max 2-3) that would reach the right audience
+        - Avoid promotional language - focus on genuine insights
+        - Be concise yet substantive (max 280 characters)
+        
+        Format: Just provide the post text, nothing else.
+        """
+    
+    def build_prompt(self, theme):
+        """Prompt for one post on `theme`"""
         
         # Select patterns from our engagement analysis
         tone = random.choice(self.engagement_factors["tone"])
@@ -172,14 +209,9 @@ class EngagementOptimizedGenerator:
         key_topic = random.choice(self.key_topics)
         
         prompt = f"""
-        Create a Twitter post for {self.company_name} about {self.product} that will generate high engagement.
-        
         The post should focus on the theme: {theme}
         
-        For context, this previous post received 57 engagements from our audience:
-        "{self.high_engagement_post}"
-        
-        What made this post successful:
+        What made the high-engagement post successful:
         1. Tone: {tone}
         2. Structure: {structure}
         3. Language pattern to incorporate: "{language_pattern}"
@@ -189,75 +221,26 @@ class EngagementOptimizedGenerator:
         Also, here's a relevant benchmark written in the successful style:
         "{benchmark}"
         
-        Requirements:
-        - Match the intellectual, curious tone of the high-engagement post
-        - Focus on {key_topic} with specific, technical details
-        - Follow the three-part structure: observation → examples → broader implication
-        - Include specific technical details that demonstrate expertise
-        - End with a thought-provoking insight about the future
-        - Use precise hashtags (max 2-3) that would reach the right audience
-        - Avoid promotional language - focus on genuine insights
-        - Be concise yet substantive (max 280 characters)
-        
-        Format: Just provide the post text, nothing else.
+        Focus on {key_topic} with specific, technical details.
         """
         
-        # Prepare the API request
-        headers = {
-            "x-api-key": self.api_key,
-            "content-type": "application/json",
-            "anthropic-version": "2023-06-01"
-        }
-        
-        data = {
-            "model": self.model,
-            "max_tokens": 300,
-            "messages": [
-                {"role": "user", "content": prompt}
-            ]
-        }
+        return prompt
+    
+    def generate_post_with_api(self, theme):
+        """Generate a post using the Anthropic API based on deep engagement analysis"""
+        prompt = self.build_prompt(theme)
         
-        # Make the API request
+        # Request through the shared gateway (pooled keep-alive connections, retries with backoff)
         try:
-            response = requests.post(
-                self.api_url,
-                headers=headers,
-                json=data
-            )
-            
-            response.raise_for_status()  # Raise exception for HTTP errors
-            result = response.json()
-            
-            if "content" in result and len(result["content"]) > 0:
-                post = result["content"][0]["text"].strip()
-                return post
-            else:
-                raise Exception("Empty response from API")
-                
+            return self.llm.complete_sync(prompt, model=self.model, max_tokens=300,
+                                          system=post_system_prompt(self), caller=type(self).__name__).strip()
         except Exception as e:
             print(f"API Error: {e}")
             return None
     
     def generate_unique_post(self, theme, max_attempts=5):
         """Generate a unique post that isn't a duplicate of previous posts"""
-        attempts = 0
-        
-        while attempts < max_attempts:
-            post = self.generate_post_with_api(theme)
-            
-            if post and not self.is_duplicate(post):
-                # Add to history and return
-                self.add_to_history(post)
-                return post
-            
-            attempts += 1
-            if post:
-                print(f"Generated duplicate post, retrying... (Attempt {attempts}/{max_attempts})")
-            else:
-                print(f"Failed to generate post, retrying... (Attempt {attempts}/{max_attempts})")
-        
-        # If we couldn't generate a unique post after max attempts
-        return "Failed to generate a unique post after multiple attempts. Please try again later."
+        return run_batch(self, [theme], max_attempts)[0]
     
     def analyze_engagement_potential(self, post):
         """Analyze a post for engagement potential based on our learned patterns"""
@@ -299,25 +282,17 @@ class EngagementOptimizedGenerator:
     
     def generate_engagement_optimized_posts(self, count=7):
         """Generate posts optimized for high engagement based on successful patterns"""
-        themes = [
-            "DAO Treasury Analytics",
-            "On-Chain Governance Data",
-            "Treasury Diversification Insights",
-            "Voter Participation Metrics",
-            "Sustainability Indicators", 
-            "Data Literacy in DAOs",
-            "Treasury Transparency Patterns"
-        ]
+        themes = self.weekly_themes[:count]
+        days = [(datetime.datetime.now() + datetime.timedelta(days=i)).strftime("%A") for i in range(len(themes))]
+        for day, theme in zip(days, themes):
+            print(f"Generating engagement-optimized post for {day} with theme: {theme}")
+        
+        # All themes are generated concurrently; uniqueness is checked across the batch and history
+        contents = run_batch(self, themes, on_post=print_progress(time.monotonic()))
         
         posts = []
         
-        for i in range(min(count, len(themes))):
-            theme = themes[i]
-            day = (datetime.datetime.now() + datetime.timedelta(days=i)).strftime("%A")
-            
-            print(f"Generating engagement-optimized post for {day} with theme: {theme}")
-            post = self.generate_unique_post(theme)
-            
+        for day, theme, post in zip(days, themes, contents):
             # Analyze engagement potential
             engagement_score = self.analyze_engagement_potential(post)
             
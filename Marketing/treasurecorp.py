@@ -1,9 +1,12 @@
 import os
-import requests
 import json
 import datetime
 import random
 from typing import List, Dict, Tuple
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from llm_gateway import LLMError, get_gateway
 
 # Configuration - Use environment variables
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
@@ -134,32 +137,13 @@ CONTENT_FILLERS = {
 }
 
 def get_anthropic_response(prompt: str) -> str:
-    """Get a response from Anthropic API"""
-    headers = {
-        "x-api-key": ANTHROPIC_API_KEY,
-        "content-type": "application/json"
-    }
-    
-    data = {
-        "model": "claude-3-opus-20240229",
-        "max_tokens": 1000,
-        "messages": [
-            {"role": "user", "content": prompt}
-        ]
-    }
-    
-    response = requests.post(
-        "https://api.anthropic.com/v1/messages",
-        headers=headers,
-        json=data
-    )
-    
-    if response.status_code == 200:
-        return response.json()["content"][0]["text"]
-    else:
-        print(f"Error: {response.status_code}")
-        print(response.text)
-        return f"Error generating content: {response.status_code}"
+    """Get a response from Anthropic API through the shared gateway"""
+    try:
+        return get_gateway().complete_sync(prompt, model="claude-3-opus-20240229", max_tokens=1000,
+                                           caller="treasurecorp")
+    except LLMError as e:
+        print(f"Error: {e}")
+        return f"Error generating content: {e.status}"
 
 def generate_post_with_anthropic(theme: str, company_info: Dict) -> str:
     """Generate a Twitter post using Anthropic API"""
@@ -1,22 +1,18 @@
-from anthropic import Anthropic
 import os
+import sys
 
-# Set your API key from environment variable
-api_key = os.getenv("ANTHROPIC_API_KEY")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from llm_gateway import get_gateway
 
-# Initialize Anthropic client
-client = Anthropic(api_key=api_key)
-
-# Get content
+# Get content (ANTHROPIC_API_KEY is read from the environment)
 try:
-    message = client.messages.create(
+    post = get_gateway().complete_sync(
+        "Create a single Twitter post about DAO treasury analytics",
         model="claude-3-7-sonnet-20250219",
         max_tokens=300,
-        messages=[
-            {"role": "user", "content": "Create a single Twitter post about DAO treasury analytics"}
-        ]
+        caller="twitter_script"
     )
-    print(message.content[0].text)
+    print(post)
 except Exception as e:
     print(f"Error: {e}")
 
@@ -6,7 +6,78 @@ Ultra-fast growth tactics and mobile app integration
 
 import json
 from datetime import datetime, timedelta
-from typing import Dict, List
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Tuple
+
+# Engagement targets per platform and content type (read-only; shared by every slot)
+ENGAGEMENT_TARGETS = {
+    'twitter': {
+        'breaking_news': {'likes': 50, 'retweets': 25, 'replies': 10},
+        'viral_threads': {'likes': 200, 'retweets': 100, 'replies': 50},
+        'engagement_bait': {'likes': 100, 'retweets': 30, 'replies': 25}
+    },
+    'linkedin': {
+        'thought_leadership': {'likes': 100, 'shares': 20, 'comments': 15},
+        'controversial_takes': {'likes': 200, 'shares': 50, 'comments': 30}
+    },
+    'telegram': {
+        'exclusive_alpha': {'views': 500, 'forwards': 50, 'reactions': 100},
+        'real_time_alerts': {'views': 300, 'forwards': 30, 'reactions': 60}
+    }
+}
+
+# Peak hours where slots get viral priority
+VIRAL_PEAK_TIMES = ('09:00', '12:00', '18:00', '21:00')
+
+
+def _freeze(value: Any) -> Any:
+    """Read-only copy of nested config data: dicts become mapping proxies, lists tuples"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Plain dict/list copy of data frozen by _freeze, for editing"""
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+class ScheduleSlot:
+    """One precomputed posting slot; read-only, since cached slots are shared by every caller"""
+    __slots__ = ('time', 'content_type', 'platform', 'priority', 'automation_level', 'engagement_target')
+
+    def __init__(self, time: str, content_type: str, platform: str, priority: str,
+                 automation_level: str, engagement_target: Mapping):
+        set_field = super().__setattr__
+        set_field('time', time)
+        set_field('content_type', content_type)
+        set_field('platform', platform)
+        set_field('priority', priority)
+        set_field('automation_level', automation_level)
+        set_field('engagement_target', MappingProxyType(dict(engagement_target)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"ScheduleSlot is read-only; cannot set {name!r}")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"ScheduleSlot is read-only; cannot delete {name!r}")
+
+    def to_dict(self) -> Dict:
+        return {
+            'time': self.time,
+            'content_type': self.content_type,
+            'platform': self.platform,
+            'priority': self.priority,
+            'automation_level': self.automation_level,
+            'engagement_target': dict(self.engagement_target)
+        }
+
 
 class AggressiveGrowthConfig:
     """2-month aggressive growth configuration"""
@@ -31,7 +102,14 @@ class AggressiveGrowthConfig:
             'week_8': {'twitter': 4500, 'linkedin': 3500, 'telegram': 2000}
         }
         
-        # AGGRESSIVE posting schedule
+        # ((config_version, optimizer_version), {(platform, day_of_week): slots}),
+        # replaced as a whole so readers never see a half-built week
+        self._config_version = 0
+        self._schedule_cache: Tuple[Tuple[int, int], Dict[Tuple[str, int], Tuple[ScheduleSlot, ...]]] = ((-1, -1), {})
+        self._time_optimizer = None
+        
+        # AGGRESSIVE posting schedule; assigning it builds the week's schedule matrix,
+        # and it is read-only afterwards (edit through update_posting_strategy)
         self.posting_strategies = {
             'twitter': {
                 'posts_per_day': 15,  # Every 1.6 hours when awake
@@ -133,8 +211,59 @@ class AggressiveGrowthConfig:
             'cross_platform_sync': True     # Sync content across platforms
         }
 
+    @property
+    def posting_strategies(self) -> Mapping[str, Mapping]:
+        """Per-platform posting strategy, read-only so every change goes through the setter"""
+        return self._posting_strategies
+
+    @posting_strategies.setter
+    def posting_strategies(self, strategies: Mapping[str, Mapping]):
+        self._posting_strategies = _freeze(strategies)
+        self._config_version += 1
+        self._rebuild_schedule_cache()
+
+    @property
+    def time_optimizer(self):
+        """Learned posting times (see posting_time_optimizer.attach_optimizer); None uses the static optimal_times"""
+        return self._time_optimizer
+
+    @time_optimizer.setter
+    def time_optimizer(self, optimizer):
+        self._time_optimizer = optimizer
+        self._rebuild_schedule_cache()
+
     def get_daily_aggressive_schedule(self, platform: str, day_of_week: int) -> List[Dict]:
         """Generate aggressive posting schedule optimized for maximum engagement"""
+        return [slot.to_dict() for slot in self.get_cached_schedule(platform, day_of_week)]
+
+    def get_cached_schedule(self, platform: str, day_of_week: int) -> Tuple[ScheduleSlot, ...]:
+        """Precomputed slots for a platform and weekday, rebuilt only after config or optimizer changes"""
+        cache_key, matrix = self._schedule_cache
+        if cache_key != self._current_cache_key():
+            cache_key, matrix = self._rebuild_schedule_cache()
+        return matrix[(platform, day_of_week)]
+
+    def update_posting_strategy(self, platform: str, **changes):
+        """Edit a platform's posting strategy; the precomputed schedule is rebuilt"""
+        strategies = _thaw(self.posting_strategies)
+        strategies[platform].update(changes)
+        self.posting_strategies = strategies
+
+    def _current_cache_key(self) -> Tuple[int, int]:
+        optimizer_version = self.time_optimizer.version if self.time_optimizer else -1
+        return (self._config_version, optimizer_version)
+
+    def _rebuild_schedule_cache(self):
+        cache_key = self._current_cache_key()
+        matrix = {
+            (platform, day_of_week): self._build_daily_schedule(platform, day_of_week)
+            for platform in self.posting_strategies
+            for day_of_week in range(7)
+        }
+        self._schedule_cache = (cache_key, matrix)
+        return self._schedule_cache
+
+    def _build_daily_schedule(self, platform: str, day_of_week: int) -> Tuple[ScheduleSlot, ...]:
         strategy = self.posting_strategies[platform]
         posts_per_day = strategy['posts_per_day']
         
@@ -145,45 +274,43 @@ class AggressiveGrowthConfig:
         schedule = []
         content_types = list(strategy['content_mix'].keys())
         
-        for i, post_time in enumerate(strategy['optimal_times'][:posts_per_day]):
-            content_type = content_types[i % len(content_types)]
+        if self.time_optimizer and self.automation_config['schedule_optimization']:
+            post_times = self.time_optimizer.best_times(platform, day_of_week, posts_per_day)
+        else:
+            post_times = strategy['optimal_times'][:posts_per_day]
+        
+        # Content types follow the configured times, so a learned time that joins or
+        # leaves the day does not shift the type posted at every other time
+        positions = {hhmm: i for i, hhmm in enumerate(strategy['optimal_times'])}
+        next_learned = len(positions)
+        
+        for post_time in post_times:
+            if post_time in positions:
+                position = positions[post_time]
+            else:
+                position, next_learned = next_learned, next_learned + 1
+            content_type = content_types[position % len(content_types)]
             
             # Prioritize viral content during peak hours
-            if post_time in ['09:00', '12:00', '18:00', '21:00']:
+            if post_time in VIRAL_PEAK_TIMES:
                 priority = 'viral'
             else:
                 priority = 'high'
             
-            schedule.append({
-                'time': post_time,
-                'content_type': content_type,
-                'platform': platform,
-                'priority': priority,
-                'automation_level': 'high',
-                'engagement_target': self._get_engagement_target(platform, content_type)
-            })
+            schedule.append(ScheduleSlot(
+                time=post_time,
+                content_type=content_type,
+                platform=platform,
+                priority=priority,
+                automation_level='high',
+                engagement_target=self._get_engagement_target(platform, content_type)
+            ))
         
-        return schedule
+        return tuple(schedule)
 
-    def _get_engagement_target(self, platform: str, content_type: str) -> Dict:
+    def _get_engagement_target(self, platform: str, content_type: str) -> Mapping:
         """Set engagement targets for each post type"""
-        targets = {
-            'twitter': {
-                'breaking_news': {'likes': 50, 'retweets': 25, 'replies': 10},
-                'viral_threads': {'likes': 200, 'retweets': 100, 'replies': 50},
-                'engagement_bait': {'likes': 100, 'retweets': 30, 'replies': 25}
-            },
-            'linkedin': {
-                'thought_leadership': {'likes': 100, 'shares': 20, 'comments': 15},
-                'controversial_takes': {'likes': 200, 'shares': 50, 'comments': 30}
-            },
-            'telegram': {
-                'exclusive_alpha': {'views': 500, 'forwards': 50, 'reactions': 100},
-                'real_time_alerts': {'views': 300, 'forwards': 30, 'reactions': 60}
-            }
-        }
-        
-        return targets.get(platform, {}).get(content_type, {})
+        return ENGAGEMENT_TARGETS.get(platform, {}).get(content_type, {})
 
     def get_influencer_target_list(self) -> Dict[str, List[str]]:
         """List of top influencers to engage with for rapid follower acquisition"""
@@ -5,6 +5,7 @@ Analyze TreasureCorp tweet engagement patterns
 
 import asyncio
 from dao_monitoring_llm import DAOMonitoringLLM
+from engagement_analytics import EngagementFrame
 import logging
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -33,14 +34,20 @@ def analyze_engagement():
             print(f"   Text: {tweet['text']}")
             print("-" * 60)
         
-        # Engagement patterns
-        avg_engagement = sum(t['engagement_rate'] for t in engagement_data) / len(engagement_data)
-        high_performing = [t for t in engagement_data if t['engagement_rate'] > avg_engagement * 1.5]
+        # Engagement patterns across the whole stored history
+        frame = EngagementFrame.from_db(monitor.db_connection, platform='twitter')
+        report = frame.report()
+        high_performing = report['high_performers']
         
         print(f"\n📊 INSIGHTS:")
-        print(f"   Average Engagement Rate: {avg_engagement:.2f}%")
+        print(f"   Average Engagement Rate: {report['average_rate']:.2f}%")
+        print(f"   Median / P90 Engagement Rate: {report['percentiles'][50]:.2f}% / {report['percentiles'][90]:.2f}%")
         print(f"   High Performing Tweets: {len(high_performing)}")
-        print(f"   Total Tweets Analyzed: {len(engagement_data)}")
+        print(f"   Total Tweets Analyzed: {report['total_posts']}")
+        
+        best_hours = sorted(report['hour_of_day'].items(), key=lambda x: x[1]['avg_rate'], reverse=True)[:3]
+        if best_hours:
+            print(f"   Best Posting Hours (UTC): " + ", ".join(f"{hour:02d}:00 ({stats['avg_rate']}%)" for hour, stats in best_hours))
         
         if high_performing:
             print(f"\n🎯 PATTERNS IN HIGH-PERFORMING TWEETS:")
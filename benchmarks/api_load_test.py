@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+Mobile Backend Load Test
+Drives mobile_app_backend with a mix of authenticated REST polling and posting
+while holding many /ws connections open, and reports throughput and latency
+percentiles per endpoint plus WebSocket connect, ping and fan-out latency.
+
+Manual posts go out at a fixed Poisson rate and carry a marker, so the time
+until each /ws client gets the post_created event (monitor event log -> relay ->
+publish) is measured end to end. With --spawn the backend is started with
+uvicorn on a temporary, pre-seeded database (MONITOR_MODE=external, so no
+monitor cycles run). The load generator is a single process; for many thousands
+of sockets run several copies with --no-gate.
+
+Compared with benchmarks/api_baseline.json, the run fails (exit 1) when the
+error rate or WebSocket delivery is out of bounds, or when throughput or p95
+latency regressed past the tolerance. Baselines only compare runs with the
+same load settings, and like all timings here they are machine-specific.
+
+Usage:
+    python benchmarks/api_load_test.py --spawn                            # 50 users, 1000 sockets, 30 s
+    python benchmarks/api_load_test.py --spawn --workers 2 --ws-clients 5000 --duration 60
+    python benchmarks/api_load_test.py --url https://staging.example.com --token $API_TOKEN --no-gate
+    python benchmarks/api_load_test.py --spawn --update-baseline
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'api_baseline.json')
+
+DEFAULT_TOKEN = "treasurecorp-mobile-2024"
+
+# (path, weight): what a polling mobile client requests between think times
+ENDPOINT_MIX = (
+    ('/api/content/recent?limit=20', 30),
+    ('/api/dashboard/metrics', 20),
+    ('/api/viral/alerts?limit=10', 15),
+    ('/api/growth/schedule', 10),
+    ('/api/monitoring/traces?limit=5', 5),
+    ('/api/llm/metrics?days=7', 5),
+    ('/metrics', 5),
+    ('/api/analytics/competitors', 2),
+)
+
+# Content rows put in the spawned backend's database so polling returns real payloads
+SEED_CONTENT_ROWS = 200
+
+# Concurrent WebSocket handshakes while ramping up
+WS_CONNECT_CONCURRENCY = 200
+
+# Seconds to keep sockets open after the last post so its events can arrive
+FANOUT_DRAIN_SECONDS = 3.0
+
+DEFAULT_TOLERANCE = 0.3
+MAX_ERROR_RATE = 0.01
+MIN_WS_DELIVERY = 0.99
+
+# p95 changes below this many milliseconds are noise, not regressions
+LATENCY_NOISE_MS = 20.0
+
+# Endpoints with fewer requests than this are reported but their p95 is too noisy to gate on
+MIN_GATED_SAMPLES = 200
+
+_POST_MARKER = re.compile(r'loadtest (\d+) ([\d.]+)')
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(math.ceil(fraction * len(ordered))) - 1))]
+
+
+def latency_summary(values: List[float]) -> Dict:
+    """Count and p50/p95/p99/max in milliseconds of latencies given in seconds"""
+    return {'count': len(values),
+            **{name: round(_percentile(values, fraction) * 1000, 2)
+               for name, fraction in (('p50_ms', 0.5), ('p95_ms', 0.95), ('p99_ms', 0.99), ('max_ms', 1.0))}}
+
+
+class LoadStats:
+    """Latencies, errors and WebSocket deliveries collected during a run"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.posts_sent: Dict[int, float] = {}
+        self.ws_connect: List[float] = []
+        self.ws_connect_failures = 0
+        self.ws_ping: List[float] = []
+        self.ws_fanout: List[float] = []
+        self.ws_messages = 0
+        self.ws_dropped = 0
+
+    def request_done(self, endpoint: str, latency: float, ok: bool):
+        self.latencies.setdefault(endpoint, []).append(latency)
+        if not ok:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+
+async def timed_request(session, method: str, url: str, endpoint: str, stats: LoadStats,
+                        headers: Dict, body: Optional[Dict] = None) -> bool:
+    started = time.perf_counter()
+    try:
+        async with session.request(method, url, json=body, headers=headers) as response:
+            await response.read()
+            ok = response.status == 200
+    except Exception:
+        ok = False
+    stats.request_done(endpoint, time.perf_counter() - started, ok)
+    return ok
+
+
+async def rest_user(session, base_url: str, headers: Dict, stats: LoadStats, deadline: float,
+                    think_seconds: float, rng: random.Random):
+    """One polling mobile client: weighted endpoint mix with exponential think time"""
+    paths = [path for path, _ in ENDPOINT_MIX]
+    weights = [weight for _, weight in ENDPOINT_MIX]
+    while time.time() < deadline:
+        path = rng.choices(paths, weights)[0]
+        await timed_request(session, 'GET', base_url + path, f"GET {path.split('?')[0]}", stats, headers)
+        if think_seconds:
+            await asyncio.sleep(rng.expovariate(1 / think_seconds))
+
+
+async def poster(session, base_url: str, headers: Dict, stats: LoadStats, deadline: float,
+                 posts_per_second: float, rng: random.Random):
+    """Manual posts from the app at a Poisson rate; each is fanned out to every /ws subscriber"""
+    post_id = 0
+    while posts_per_second and time.time() < deadline:
+        await asyncio.sleep(rng.expovariate(posts_per_second))
+        post_id += 1
+        sent_at = time.time()
+        body = {'platform': rng.choice(['twitter', 'telegram']),
+                'content': f"loadtest {post_id} {sent_at:.6f} DAO treasury runway update"}
+        if await timed_request(session, 'POST', base_url + '/api/content/post', 'POST /api/content/post',
+                               stats, headers, body):
+            stats.posts_sent[post_id] = sent_at
+
+
+async def ws_client(session, ws_url: str, stats: LoadStats, index: int, connect_slots: asyncio.Semaphore,
+                    stop: asyncio.Event, ping_seconds: float, rng: random.Random):
+    """One /ws subscriber; half of them narrow their subscription like the app's feed screen"""
+    import aiohttp
+
+    async with connect_slots:
+        started = time.perf_counter()
+        try:
+            ws = await session.ws_connect(ws_url, heartbeat=None, autoping=True)
+            welcome = await ws.receive_json(timeout=30)
+            if welcome.get('type') != 'welcome':
+                raise ValueError(f"unexpected first message {welcome.get('type')}")
+        except Exception:
+            stats.ws_connect_failures += 1
+            return
+        stats.ws_connect.append(time.perf_counter() - started)
+
+    try:
+        if index % 2:
+            await ws.send_json({'action': 'unsubscribe', 'topics': ['metrics', 'proposals', 'monitoring']})
+
+        ping_sent: Optional[float] = None
+        next_ping = time.perf_counter() + rng.uniform(0, ping_seconds)
+        while not stop.is_set():
+            timeout = max(0.05, next_ping - time.perf_counter())
+            try:
+                message = await ws.receive(timeout=min(timeout, 0.5))
+            except asyncio.TimeoutError:
+                message = None
+
+            if message is not None:
+                if message.type != aiohttp.WSMsgType.TEXT:
+                    stats.ws_dropped += 1
+                    return
+                stats.ws_messages += 1
+                data = json.loads(message.data)
+                if data.get('type') == 'pong' and ping_sent is not None:
+                    stats.ws_ping.append(time.perf_counter() - ping_sent)
+                    ping_sent = None
+                elif data.get('topic') == 'posting':
+                    marker = _POST_MARKER.search(str(data.get('data', {}).get('content', '')))
+                    if marker:
+                        stats.ws_fanout.append(time.time() - float(marker.group(2)))
+
+            if ping_seconds and time.perf_counter() >= next_ping:
+                ping_sent = time.perf_counter()
+                await ws.send_json({'action': 'ping'})
+                next_ping = ping_sent + ping_seconds
+    except Exception:
+        stats.ws_dropped += 1
+    finally:
+        await ws.close()
+
+
+async def run_load(base_url: str, token: str, users: int, ws_clients: int, duration: float,
+                   think_seconds: float, posts_per_second: float, ping_seconds: float, seed: int) -> LoadStats:
+    import aiohttp
+
+    stats = LoadStats()
+    rng = random.Random(seed)
+    headers = {'Authorization': f"Bearer {token}"}
+    ws_url = re.sub(r'^http', 'ws', base_url) + '/ws'
+    stop = asyncio.Event()
+    connect_slots = asyncio.Semaphore(WS_CONNECT_CONCURRENCY)
+
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0)) as session:
+        sockets = [asyncio.create_task(ws_client(session, ws_url, stats, i, connect_slots, stop, ping_seconds,
+                                                 random.Random(rng.random())))
+                   for i in range(ws_clients)]
+        # Let the sockets ramp up before the REST load starts
+        while len(stats.ws_connect) + stats.ws_connect_failures < ws_clients:
+            await asyncio.sleep(0.1)
+
+        deadline = time.time() + duration
+        await asyncio.gather(
+            poster(session, base_url, headers, stats, deadline, posts_per_second, random.Random(rng.random())),
+            *(rest_user(session, base_url, headers, stats, deadline, think_seconds, random.Random(rng.random()))
+              for _ in range(users))
+        )
+        await asyncio.sleep(FANOUT_DRAIN_SECONDS)
+        stop.set()
+        await asyncio.gather(*sockets)
+    return stats
+
+
+def build_report(stats: LoadStats, duration: float, settings: Dict) -> Dict:
+    endpoints = {}
+    for endpoint, values in sorted(stats.latencies.items()):
+        endpoints[endpoint] = {**latency_summary(values), 'errors': stats.errors.get(endpoint, 0),
+                               'rps': round(len(values) / duration, 2)}
+    requests = sum(len(values) for values in stats.latencies.values())
+    connected = len(stats.ws_connect)
+    expected = len(stats.posts_sent) * connected
+    return {
+        'settings': settings,
+        'requests': requests,
+        'rps': round(requests / duration, 2),
+        'latency': latency_summary([value for values in stats.latencies.values() for value in values]),
+        'error_rate': round(sum(stats.errors.values()) / requests, 4) if requests else 0.0,
+        'endpoints': endpoints,
+        'ws': {
+            'connected': connected,
+            'connect_failures': stats.ws_connect_failures,
+            'dropped': stats.ws_dropped,
+            'messages': stats.ws_messages,
+            'connect': latency_summary(stats.ws_connect),
+            'ping': latency_summary(stats.ws_ping),
+            'fanout': latency_summary(stats.ws_fanout),
+            'delivery': round(len(stats.ws_fanout) / expected, 4) if expected else 1.0,
+        },
+    }
+
+
+def find_regressions(report: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Absolute limits, plus throughput and p95 regressions against a baseline of the same settings"""
+    problems = []
+    ws = report['ws']
+    if report['error_rate'] > MAX_ERROR_RATE:
+        problems.append(f"error rate {report['error_rate']:.2%} over {MAX_ERROR_RATE:.0%}")
+    if ws['connect_failures'] + ws['dropped'] > MAX_ERROR_RATE * max(1, report['settings']['ws_clients']):
+        problems.append(f"{ws['connect_failures']} WebSocket connect failures and {ws['dropped']} dropped sockets")
+    if ws['delivery'] < MIN_WS_DELIVERY:
+        problems.append(f"only {ws['delivery']:.1%} of post events reached subscribed sockets")
+
+    if not baseline:
+        return problems
+    if baseline['settings'] != report['settings']:
+        problems.append(f"baseline was recorded with different settings {baseline['settings']}")
+        return problems
+
+    if report['rps'] < baseline['rps'] * (1 - tolerance):
+        problems.append(f"throughput {report['rps']} req/s vs baseline {baseline['rps']}")
+
+    def slower(name: str, now: float, before: float):
+        if now > before * (1 + tolerance) and now - before > LATENCY_NOISE_MS:
+            problems.append(f"{name} p95 {now}ms vs baseline {before}ms")
+
+    slower("REST", report['latency']['p95_ms'], baseline['latency']['p95_ms'])
+    for endpoint, expected in baseline['endpoints'].items():
+        current = report['endpoints'].get(endpoint)
+        if current and min(current['count'], expected['count']) >= MIN_GATED_SAMPLES:
+            slower(endpoint, current['p95_ms'], expected['p95_ms'])
+    for name in ('connect', 'fanout'):
+        slower(f"ws {name}", ws[name]['p95_ms'], baseline['ws'][name]['p95_ms'])
+    return problems
+
+
+def print_report(report: Dict):
+    print(f"📊 {report['requests']} requests, {report['rps']} req/s, p95 {report['latency']['p95_ms']}ms, "
+          f"error rate {report['error_rate']:.2%}")
+    for endpoint, stats in report['endpoints'].items():
+        print(f"   {endpoint:<32} {stats['rps']:>8.1f}/s  p50 {stats['p50_ms']:>7.1f}ms  "
+              f"p95 {stats['p95_ms']:>7.1f}ms  p99 {stats['p99_ms']:>7.1f}ms  errors {stats['errors']}")
+    ws = report['ws']
+    print(f"🔌 {ws['connected']} sockets ({ws['connect_failures']} failed, {ws['dropped']} dropped), "
+          f"{ws['messages']} messages, post delivery {ws['delivery']:.1%}")
+    for name in ('connect', 'ping', 'fanout'):
+        stats = ws[name]
+        print(f"   ws {name:<29} {stats['count']:>8}    p50 {stats['p50_ms']:>7.1f}ms  "
+              f"p95 {stats['p95_ms']:>7.1f}ms  p99 {stats['p99_ms']:>7.1f}ms")
+
+
+def _raise_file_limit():
+    """Thousands of sockets need more descriptors than the usual soft limit"""
+    try:
+        import resource
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if hard == resource.RLIM_INFINITY or hard > soft:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (hard if hard != resource.RLIM_INFINITY else 65536, hard))
+    except (ImportError, ValueError, OSError) as e:
+        print(f"⚠️ Could not raise the open file limit: {e}")
+
+
+def _seed_database(db_path: str, rows: int):
+    """Summarized content so the polled endpoints return realistic payloads"""
+    os.environ['DATABASE_PATH'] = db_path
+    from social_summaries import dump_summaries
+    from storage_backends import get_storage
+
+    async def seed():
+        storage = get_storage()
+        for n in range(rows):
+            summary = dump_summaries({'twitter': f"📊 DAO treasury update {n}: runway and diversification #DAO",
+                                      'telegram': f"Treasury report {n}. " + "Stablecoin share and runway. " * 8})
+            await storage.insert_content('loadtest', f"Load test article {n}", f"https://example.com/articles/{n}",
+                                         f"loadtest-{n}", summary)
+        await storage.close()
+
+    asyncio.run(seed())
+
+
+class SpawnedBackend:
+    """mobile_app_backend under uvicorn on a free port with a temporary database"""
+
+    def __init__(self, workers: int, token: str):
+        self.workers = workers
+        self.token = token
+        self.workdir = tempfile.mkdtemp(prefix='api_load_test_')
+        self.process: Optional[subprocess.Popen] = None
+
+    def start(self) -> str:
+        with socket.socket() as probe:
+            probe.bind(('127.0.0.1', 0))
+            port = probe.getsockname()[1]
+        db_path = os.path.join(self.workdir, 'loadtest.db')
+        _seed_database(db_path, SEED_CONTENT_ROWS)
+
+        env = {k: v for k, v in os.environ.items() if k not in ('DATABASE_URL', 'STORAGE_BACKEND')}
+        env.update({'DATABASE_PATH': db_path, 'MONITOR_MODE': 'external', 'API_TOKEN': self.token})
+        self.process = subprocess.Popen(
+            [sys.executable, '-m', 'uvicorn', 'mobile_app_backend:app', '--host', '127.0.0.1', '--port', str(port),
+             '--workers', str(self.workers), '--log-level', 'warning', '--no-access-log'],
+            cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=open(os.path.join(self.workdir, 'server.log'), 'w')
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        self._wait_ready(base_url)
+        return base_url
+
+    def _wait_ready(self, base_url: str, timeout: float = 60):
+        import urllib.request
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"backend exited with {self.process.returncode}:\n{self.server_log()}")
+            try:
+                with urllib.request.urlopen(base_url + '/', timeout=2):
+                    return
+            except OSError:
+                time.sleep(0.2)
+        raise RuntimeError(f"backend did not come up within {timeout:.0f}s:\n{self.server_log()}")
+
+    def server_log(self) -> str:
+        with open(os.path.join(self.workdir, 'server.log')) as f:
+            return f.read()[-4000:]
+
+    def stop(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test of the mobile backend REST API and /ws fan-out")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--url', help="base URL of a running backend")
+    target.add_argument('--spawn', action='store_true', help="start the backend locally on a seeded temp database")
+    parser.add_argument('--workers', type=int, default=1, help="uvicorn workers with --spawn")
+    parser.add_argument('--token', default=os.getenv("API_TOKEN", DEFAULT_TOKEN))
+    parser.add_argument('--users', type=int, default=50, help="concurrent REST clients")
+    parser.add_argument('--ws-clients', type=int, default=1000, help="concurrent /ws connections")
+    parser.add_argument('--duration', type=float, default=30, help="seconds of REST load")
+    parser.add_argument('--think-ms', type=float, default=200, help="mean pause between a client's requests")
+    parser.add_argument('--posts-per-second', type=float, default=1, help="manual post rate fanned out to /ws")
+    parser.add_argument('--ws-ping-seconds', type=float, default=10, help="ping interval per socket (0: off)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--tolerance', type=float, default=None,
+                        help=f"allowed relative regression (default: baseline's or {DEFAULT_TOLERANCE})")
+    parser.add_argument('--update-baseline', action='store_true', help="store this run as the new baseline")
+    parser.add_argument('--no-gate', action='store_true', help="report only, never fail")
+    parser.add_argument('--json', action='store_true', help="print the raw report as JSON")
+    args = parser.parse_args()
+
+    _raise_file_limit()
+    settings = {'users': args.users, 'ws_clients': args.ws_clients, 'duration': args.duration,
+                'think_ms': args.think_ms, 'posts_per_second': args.posts_per_second,
+                'ws_ping_seconds': args.ws_ping_seconds,
+                'workers': args.workers if args.spawn else None}
+
+    backend = SpawnedBackend(args.workers, args.token) if args.spawn else None
+    try:
+        base_url = backend.start() if backend else args.url.rstrip('/')
+        print(f"🚀 {args.users} REST clients and {args.ws_clients} sockets against {base_url} for {args.duration:.0f}s",
+              file=sys.stderr)
+        stats = asyncio.run(run_load(base_url, args.token, args.users, args.ws_clients, args.duration,
+                                     args.think_ms / 1000, args.posts_per_second, args.ws_ping_seconds,
+                                     args.seed))
+    finally:
+        if backend:
+            backend.stop()
+
+    report = build_report(stats, args.duration, settings)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({'tolerance': args.tolerance or DEFAULT_TOLERANCE, **report}, f, indent=2)
+            f.write('\n')
+        print(f"💾 Baseline written to {args.baseline}")
+        return
+    if args.no_gate:
+        return
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    else:
+        print(f"⚠️ No baseline at {args.baseline}; checking absolute limits only")
+
+    problems = find_regressions(report, baseline, args.tolerance or baseline.get('tolerance', DEFAULT_TOLERANCE))
+    if problems:
+        for problem in problems:
+            print(f"❌ {problem}")
+        sys.exit(1)
+    print("✅ Within capacity limits")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Monitoring Pipeline Benchmark
+Runs daily_monitoring_cycle fully offline against recorded fixtures: RSS feeds,
+DAO website HTML, articles and the Snapshot GraphQL response are served from
+benchmarks/fixtures by a local aiohttp server that also mounts the mock Anthropic
+API, and Twitter/Telegram are replaced by in-process stub clients.
+
+Each scale runs in its own subprocess with a fresh temporary database, so peak
+RSS and the stored cycle traces belong to that run alone. Per-stage latency comes
+from the cycle trace spans (see cycle_trace.py). Results are compared with
+benchmarks/baseline.json and the script exits with status 1 when throughput or
+peak memory regressed past the tolerance. Baselines are machine-specific:
+refresh them with --update-baseline on the machine that runs the gate.
+
+Usage:
+    python benchmarks/pipeline_benchmark.py                      # 10, 100 and 1000 items vs baseline
+    python benchmarks/pipeline_benchmark.py --scales 10 100 --json
+    python benchmarks/pipeline_benchmark.py --update-baseline
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from string import Template
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+DEFAULT_SCALES = (10, 100, 1000)
+
+# Every fixture feed carries 5 relevant entries; one DAO site (3 articles, 2 reports) is added per 100 items
+ITEMS_PER_FEED = 5
+ITEMS_PER_SITE = 100
+
+# Processed items pushed through image rendering and the stub social clients
+PUBLISH_SAMPLE = 10
+
+# Allowed relative regression before the gate fails
+DEFAULT_TOLERANCE = 0.25
+
+
+def create_fixture_app():
+    """Mock Anthropic app with the recorded feed, site, article and Snapshot routes added"""
+    from aiohttp import web
+    from mock_anthropic import create_app
+
+    def fixture(name: str) -> str:
+        with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+            return f.read()
+
+    feed_template = Template(fixture('feed.xml'))
+    site_template = Template(fixture('dao_site.html'))
+    article_template = Template(fixture('article.html'))
+    snapshot_body = fixture('snapshot_proposals.json')
+
+    def base_url(request: 'web.Request') -> str:
+        return f"{request.scheme}://{request.host}"
+
+    async def feed(request: 'web.Request'):
+        body = feed_template.substitute(base=base_url(request), feed=request.match_info['feed'])
+        return web.Response(text=body, content_type='application/rss+xml')
+
+    async def site(request: 'web.Request'):
+        return web.Response(text=site_template.substitute(site=request.match_info['site']), content_type='text/html')
+
+    async def article(request: 'web.Request'):
+        title = f"{request.match_info['source']} article {request.match_info['number']}"
+        return web.Response(text=article_template.substitute(title=title), content_type='text/html')
+
+    async def snapshot(request: 'web.Request'):
+        await request.read()
+        return web.Response(text=snapshot_body, content_type='application/json')
+
+    app = create_app()
+    app.router.add_get('/feeds/{feed}.xml', feed)
+    app.router.add_get('/sites/{site}', site)
+    app.router.add_get('/articles/{source}/{number}', article)
+    app.router.add_post('/graphql', snapshot)
+    return app
+
+
+class FixtureServer:
+    """Serves the fixture app from a background event loop thread"""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.runner = None
+        self.base_url: Optional[str] = None
+
+    def start(self) -> str:
+        from aiohttp import web
+
+        async def serve():
+            self.runner = web.AppRunner(create_fixture_app(), access_log=None)
+            await self.runner.setup()
+            site = web.TCPSite(self.runner, '127.0.0.1', 0)
+            await site.start()
+            host, port = self.runner.addresses[0][:2]
+            return f"http://{host}:{port}"
+
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+        self.base_url = asyncio.run_coroutine_threadsafe(serve(), self.loop).result(timeout=30)
+        return self.base_url
+
+    def stop(self):
+        if self.runner is not None:
+            asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result(timeout=30)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+class _StubResponse:
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+
+class StubTwitterClient:
+    """tweepy.Client stand-in accepting create_tweet calls"""
+
+    def __init__(self):
+        self.tweets = 0
+
+    def create_tweet(self, text: str, **kwargs):
+        self.tweets += 1
+        return _StubResponse(data={'id': str(10 ** 18 + self.tweets), 'text': text})
+
+
+class StubTelegramBot:
+    """telegram.Bot stand-in with the coroutine send methods the monitor uses"""
+
+    def __init__(self):
+        self.messages = 0
+
+    async def send_photo(self, chat_id, photo, caption: str = '', **kwargs):
+        photo.read()
+        self.messages += 1
+        return _StubResponse(message_id=self.messages)
+
+    async def send_message(self, chat_id, text: str, **kwargs):
+        self.messages += 1
+        return _StubResponse(message_id=self.messages)
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(math.ceil(fraction * len(ordered))) - 1)]
+
+
+def _collect_spans(node: Dict, durations: Dict[str, List[float]]):
+    """Span durations by stage; fetches are split by source type and posts by platform"""
+    attrs = node.get('attrs', {})
+    name = node['name']
+    if name == 'fetch':
+        name = f"fetch.{attrs.get('source_type', 'unknown')}"
+    elif name == 'post':
+        name = f"post.{attrs.get('platform', 'unknown')}"
+    if node.get('duration') is not None:
+        durations.setdefault(name, []).append(node['duration'])
+    for child in node.get('children', []):
+        _collect_spans(child, durations)
+
+
+def stage_latencies(traces: List[Dict]) -> Dict[str, Dict]:
+    durations: Dict[str, List[float]] = {}
+    for trace in traces:
+        for child in trace['root'].get('children', []):
+            _collect_spans(child, durations)
+    return {
+        name: {'count': len(values), 'p50_ms': round(_percentile(values, 0.5) * 1000, 2),
+               'p95_ms': round(_percentile(values, 0.95) * 1000, 2), 'total_s': round(sum(values), 3)}
+        for name, values in sorted(durations.items())
+    }
+
+
+def run_scale(scale: int, base_url: str) -> Dict:
+    """Benchmark one scale in this process; expects the environment set up by benchmark_scale"""
+    import logging
+    import resource
+    from cycle_trace import CycleTraceLog, cycle_trace
+    from content_model import ContentItem
+    from dao_monitoring_llm import DAOMonitoringLLM
+    from metrics_registry import STEP_ITEMS
+    from social_summaries import parse_summaries
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    monitor = DAOMonitoringLLM()
+    feeds = max(1, math.ceil(scale / ITEMS_PER_FEED))
+    sites = max(1, scale // ITEMS_PER_SITE)
+    monitor.analytical_sources = [f"{base_url}/feeds/{k}.xml" for k in range(feeds)]
+    monitor.dao_sources['dao_websites'] = [f"{base_url}/sites/{k}" for k in range(sites)]
+    monitor.dao_sources['snapshot'] = f"{base_url}/graphql"
+    monitor.twitter_api = StubTwitterClient()
+    monitor.telegram_bot = StubTelegramBot()
+
+    async def publish_sample():
+        rows = await monitor.storage.recent_content(PUBLISH_SAMPLE)
+        with cycle_trace('publish_sample', items=len(rows)):
+            for row in rows:
+                item = ContentItem(source='benchmark', title=row['title'])
+                item.summary = row['summary']
+                images = monitor.generate_social_images(item)
+                await monitor.post_to_social_media(item, parse_summaries(item.summary), images)
+                for path in images.values():
+                    os.remove(path)
+
+    started = time.perf_counter()
+    asyncio.run(monitor.daily_monitoring_cycle(post_content=False))
+    cycle_seconds = time.perf_counter() - started
+    asyncio.run(publish_sample())
+
+    collected = sum(STEP_ITEMS.value(step=step)
+                    for step in ('monitor_dao_proposals', 'monitor_dao_websites', 'monitor_news_feeds'))
+    processed = STEP_ITEMS.value(step='process_and_summarize')
+    return {
+        'scale': scale,
+        'collected': int(collected),
+        'processed': int(processed),
+        'posts': monitor.twitter_api.tweets + monitor.telegram_bot.messages,
+        'cycle_seconds': round(cycle_seconds, 3),
+        'items_per_second': round(collected / cycle_seconds, 2),
+        # ru_maxrss is in kilobytes on Linux
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'stages': stage_latencies(CycleTraceLog().recent(2)),
+    }
+
+
+def benchmark_scale(scale: int, base_url: str) -> Dict:
+    """Run one scale in a fresh subprocess with a temporary database"""
+    workdir = tempfile.mkdtemp(prefix='pipeline_benchmark_')
+    env = {k: v for k, v in os.environ.items()
+           if not k.startswith(('TWITTER_', 'TELEGRAM_', 'DATABASE_URL', 'STORAGE_BACKEND'))}
+    env.update({
+        'DATABASE_PATH': os.path.join(workdir, 'benchmark.db'),
+        'ANTHROPIC_BASE_URL': base_url,
+        'ANTHROPIC_API_KEY': 'benchmark',
+        'TELEGRAM_CHAT_ID': 'benchmark',
+        # Keep every span of large cycles and skip the slow-cycle dump
+        'CYCLE_TRACE_MAX_SPANS': '1000000',
+        'CYCLE_BUDGET_SECONDS': '1000000',
+    })
+    try:
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--run-scale', str(scale), '--base-url', base_url],
+            cwd=workdir, env=env, capture_output=True, text=True
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(f"scale {scale} failed:\n{completed.stderr[-4000:]}")
+        return json.loads(completed.stdout.strip().splitlines()[-1])
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def find_regressions(results: List[Dict], baseline: Dict, tolerance: float) -> List[str]:
+    """Scales that collected fewer items or lost throughput or memory by more than `tolerance`"""
+    regressions = []
+    for result in results:
+        expected = baseline.get('scales', {}).get(str(result['scale']))
+        if result['processed'] == 0:
+            regressions.append(f"{result['scale']} items: nothing was processed")
+        if not expected:
+            continue
+        if result['collected'] < expected.get('collected', 0):
+            regressions.append(f"{result['scale']} items: collected {result['collected']} "
+                               f"vs baseline {expected['collected']}")
+        if result['items_per_second'] < expected['items_per_second'] * (1 - tolerance):
+            regressions.append(f"{result['scale']} items: {result['items_per_second']} items/s "
+                               f"vs baseline {expected['items_per_second']}")
+        if result['peak_rss_mb'] > expected['peak_rss_mb'] * (1 + tolerance):
+            regressions.append(f"{result['scale']} items: peak RSS {result['peak_rss_mb']} MB "
+                               f"vs baseline {expected['peak_rss_mb']} MB")
+    return regressions
+
+
+def print_report(result: Dict):
+    print(f"📊 {result['scale']} items: {result['collected']} collected, {result['processed']} processed, "
+          f"{result['posts']} stub posts in {result['cycle_seconds']}s "
+          f"({result['items_per_second']} items/s), peak RSS {result['peak_rss_mb']} MB")
+    for name, stats in result['stages'].items():
+        print(f"   {name:<24} n={stats['count']:<5} p50 {stats['p50_ms']:>8.2f}ms  p95 {stats['p95_ms']:>8.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark of the DAO monitoring pipeline")
+    parser.add_argument('--scales', type=int, nargs='+', default=list(DEFAULT_SCALES))
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--tolerance', type=float, default=None,
+                        help=f"allowed relative regression (default: baseline's or {DEFAULT_TOLERANCE})")
+    parser.add_argument('--update-baseline', action='store_true', help="store these results as the new baseline")
+    parser.add_argument('--json', action='store_true', help="print the raw results as JSON")
+    parser.add_argument('--run-scale', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--base-url', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_scale is not None:
+        print(json.dumps(run_scale(args.run_scale, args.base_url)))
+        return
+
+    server = FixtureServer()
+    base_url = server.start()
+    try:
+        results = []
+        for scale in args.scales:
+            result = benchmark_scale(scale, base_url)
+            results.append(result)
+            if not args.json:
+                print_report(result)
+    finally:
+        server.stop()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+    if args.update_baseline:
+        baseline = {
+            'tolerance': args.tolerance or DEFAULT_TOLERANCE,
+            'scales': {str(r['scale']): {'collected': r['collected'], 'items_per_second': r['items_per_second'],
+                                         'peak_rss_mb': r['peak_rss_mb']}
+                       for r in results},
+        }
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2)
+            f.write('\n')
+        print(f"💾 Baseline written to {args.baseline}")
+        return
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    else:
+        print(f"⚠️ No baseline at {args.baseline}; run with --update-baseline to create one")
+
+    regressions = find_regressions(results, baseline, args.tolerance or baseline.get('tolerance', DEFAULT_TOLERANCE))
+    if regressions:
+        for regression in regressions:
+            print(f"❌ Regression: {regression}")
+        sys.exit(1)
+    print("✅ No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Content Pipeline Model
+Slotted item types passed through collection, scoring, summarization and posting.
+Derived values (fingerprints, normalized title) are computed once per item and cached.
+"""
+
+import calendar
+import hashlib
+import re
+from datetime import datetime, timezone
+from typing import Optional
+
+
+class ContentItem:
+    """One piece of collected content (article, report, news entry, educational or manual post)"""
+
+    __slots__ = (
+        'source', 'title', 'url', 'type', 'snippet', 'published', 'summary', 'content_id',
+        'theme', 'fallback', 'manual', '_fingerprint', '_content_key', '_normalized_title'
+    )
+
+    def __init__(self, source: str, title: str, url: str = '', type: str = 'article', snippet: str = '',
+                 published: Optional[datetime] = None, theme: Optional[str] = None,
+                 fallback: bool = False, manual: bool = False):
+        self.source = source
+        self.title = title
+        self.url = url
+        self.type = type
+        self.snippet = snippet  # Source text the summary is written from
+        self.published = published
+        self.theme = theme
+        self.fallback = fallback
+        self.manual = manual
+
+        # Filled in by process_and_summarize
+        self.summary: Optional[str] = None
+        self.content_id: Optional[int] = None
+
+        self._fingerprint: Optional[str] = None
+        self._content_key: Optional[str] = None
+        self._normalized_title: Optional[str] = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.type!r}, {self.title[:60]!r}, {self.url!r})"
+
+    @property
+    def fingerprint(self) -> str:
+        """Duplicate-detection hash stored as monitored_content.content_hash"""
+        if self._fingerprint is None:
+            self._fingerprint = hashlib.md5(self.title.encode()).hexdigest()
+        return self._fingerprint
+
+    @property
+    def content_key(self) -> str:
+        """Identity used by viral scoring: the URL when there is one, else the title"""
+        if self._content_key is None:
+            self._content_key = hashlib.md5((self.url or self.title).encode()).hexdigest()
+        return self._content_key
+
+    @property
+    def normalized_title(self) -> str:
+        if self._normalized_title is None:
+            self._normalized_title = re.sub(r'\s+', ' ', self.title).strip().lower()
+        return self._normalized_title
+
+
+class Proposal(ContentItem):
+    """A DAO governance proposal; the description is kept as the item's snippet"""
+
+    __slots__ = ('dao_name', 'proposal_id', 'status', 'votes_total', 'start_date', 'end_date')
+
+    def __init__(self, source: str, dao_name: str, proposal_id: str, title: str, url: str,
+                 status: str, description: str = '', votes_total: Optional[int] = None,
+                 start_date: Optional[datetime] = None, end_date: Optional[datetime] = None):
+        super().__init__(source, title, url, type='proposal', snippet=description, published=start_date)
+        self.dao_name = dao_name
+        self.proposal_id = proposal_id
+        self.status = status
+        self.votes_total = votes_total
+        self.start_date = start_date
+        self.end_date = end_date
+
+    @property
+    def description(self) -> str:
+        return self.snippet
+
+
+def from_struct_time(value) -> Optional[datetime]:
+    """Feed timestamps (UTC time.struct_time) as aware datetimes"""
+    if value is None:
+        return None
+    try:
+        return datetime.fromtimestamp(calendar.timegm(value), tz=timezone.utc)
+    except (TypeError, ValueError, OverflowError):
+        return None
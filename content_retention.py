@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Content Retention
+Moves monitored_content rows older than CONTENT_RETENTION_DAYS into compressed
+JSONL archive segments, keeps their hashes for duplicate detection and (on SQLite)
+returns the freed pages with incremental VACUUM so the hot database stays small
+
+Usage:
+    python content_retention.py        # archive expired content once
+"""
+
+import asyncio
+import gzip
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+import logging
+
+from db_migrations import connect
+from storage_backends import SQLiteStorage, Storage, get_storage
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+CONTENT_RETENTION_DAYS = int(os.getenv("CONTENT_RETENTION_DAYS", "30"))
+CONTENT_ARCHIVE_DIR = os.getenv("CONTENT_ARCHIVE_DIR", "content_archive")
+
+# The leader worker runs the job once a day
+RETENTION_INTERVAL_SECONDS = 86400
+
+# Rows written per archive segment
+ARCHIVE_BATCH_SIZE = 5000
+
+# Free pages returned to the filesystem per incremental_vacuum step
+VACUUM_PAGES_PER_STEP = 1000
+
+
+def _open_segment(path: Path, mode: str):
+    if path.name.endswith('.zst'):
+        if mode == 'wb':
+            return zstandard.ZstdCompressor(level=10).stream_writer(open(path, 'wb'), closefd=True)
+        return zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+    return gzip.open(path, mode, compresslevel=9) if mode == 'wb' else gzip.open(path, mode)
+
+
+def read_segment(path: Path) -> Iterator[Dict]:
+    """Yield the archived rows stored in one segment"""
+    with _open_segment(Path(path), 'rb') as stream:
+        buffer = b''
+        while True:
+            chunk = stream.read(1 << 16)
+            if not chunk:
+                break
+            buffer += chunk
+            *lines, buffer = buffer.split(b'\n')
+            for line in lines:
+                if line:
+                    yield json.loads(line)
+        if buffer.strip():
+            yield json.loads(buffer)
+
+
+class ContentArchiver:
+    """Archives expired monitored_content rows and compacts the database
+
+    Content is read and deleted through the storage backend, so with Postgres the
+    archived hashes land in its archived_content table. Posting slots always live in
+    the SQLite file, which is also the only database compacted here (Postgres
+    reclaims space with its own autovacuum).
+    """
+
+    def __init__(self, db_path: Optional[str] = None, archive_dir: str = CONTENT_ARCHIVE_DIR,
+                 retention_days: int = CONTENT_RETENTION_DAYS, storage: Optional[Storage] = None):
+        # Used from the event loop and from the compaction thread, never both at once
+        self.conn = connect(db_path, check_same_thread=False)
+        self._owns_storage = storage is None
+        self.storage = storage or SQLiteStorage(db_path)
+        self.archive_dir = Path(archive_dir)
+        self.retention_days = retention_days
+        self.extension = '.jsonl.zst' if zstandard else '.jsonl.gz'
+
+    async def close(self):
+        self.conn.close()
+        if self._owns_storage:
+            await self.storage.close()
+
+    async def run(self) -> Dict:
+        """Archive everything past retention, then vacuum; returns run statistics"""
+        cutoff = datetime.now() - timedelta(days=self.retention_days)
+        scheduled = self._scheduled_content_ids()
+        archived, segments = 0, []
+
+        while True:
+            rows = await self.storage.expired_content(cutoff, ARCHIVE_BATCH_SIZE, scheduled)
+            if not rows:
+                break
+            # Writing and fsyncing a segment blocks; keep it off the event loop
+            segment = await asyncio.to_thread(self._write_segment, rows)
+            # A crash before this point only means the rows are archived again by the next run
+            await self.storage.archive_content(rows, segment.name)
+            archived += len(rows)
+            segments.append(segment.name)
+
+        freed_pages = 0
+        if archived and self.storage.name == 'sqlite':
+            # Compaction holds the write lock; run it in a thread with the archiver's own connection
+            freed_pages = await asyncio.to_thread(self.compact)
+        if archived:
+            logger.info(f"Archived {archived} content rows older than {self.retention_days} days "
+                        f"into {len(segments)} segments, freed {freed_pages} pages")
+
+        return {'archived': archived, 'segments': segments, 'freed_pages': freed_pages}
+
+    def _scheduled_content_ids(self) -> List[int]:
+        """Content a pending posting slot still needs"""
+        return [row[0] for row in self.conn.execute(
+            "SELECT DISTINCT content_id FROM posting_schedule WHERE status = 'pending' AND content_id IS NOT NULL"
+        )]
+
+    def _write_segment(self, rows: List[Dict]) -> Path:
+        """Write rows to a new segment; it only becomes visible once fully on disk"""
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        name = f"monitored_content-{datetime.now():%Y%m%d-%H%M%S}-{rows[0]['id']}-{rows[-1]['id']}"
+        path = self.archive_dir / f"{name}{self.extension}"
+        partial = path.with_name(path.name + '.partial')
+
+        with _open_segment(partial, 'wb') as stream:
+            for row in rows:
+                stream.write(json.dumps(row, default=str).encode() + b'\n')
+
+        with open(partial, 'rb') as written:
+            os.fsync(written.fileno())
+        os.replace(partial, path)
+        return path
+
+    def compact(self) -> int:
+        """Return free pages to the filesystem and truncate the WAL; returns pages freed"""
+        # Databases created before auto_vacuum was enabled need one full VACUUM to switch modes
+        if self.conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            logger.info("Enabling incremental auto_vacuum (one-time full VACUUM)")
+            self.conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            before = self.conn.execute("PRAGMA page_count").fetchone()[0]
+            self.conn.execute("VACUUM")
+            return before - self.conn.execute("PRAGMA page_count").fetchone()[0]
+
+        # Release free pages in steps so API readers are not blocked for the whole pass
+        before = self.conn.execute("PRAGMA page_count").fetchone()[0]
+        while self.conn.execute("PRAGMA freelist_count").fetchone()[0]:
+            self.conn.execute(f"PRAGMA incremental_vacuum({VACUUM_PAGES_PER_STEP})").fetchall()
+            self.conn.commit()
+        freed = before - self.conn.execute("PRAGMA page_count").fetchone()[0]
+
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return freed
+
+
+async def run_retention(storage: Optional[Storage] = None) -> Dict:
+    """One archival pass against the configured storage backend"""
+    archiver = ContentArchiver(storage=storage or get_storage())
+    try:
+        return await archiver.run()
+    finally:
+        await archiver.close()
+
+
+async def _main() -> Dict:
+    storage = get_storage()
+    try:
+        return await run_retention(storage)
+    finally:
+        await storage.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    stats = asyncio.run(_main())
+    print(f"🗄️ Archived {stats['archived']} rows into {len(stats['segments'])} segments, "
+          f"freed {stats['freed_pages']} pages")
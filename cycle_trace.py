@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Monitoring Cycle Traces
+Lightweight span tracing for daily_monitoring_cycle. Each cycle records a tree of
+timed spans (source fetch, parse, dedup, LLM, render, post) kept in a small ring
+buffer in the shared database, so the API can serve the last cycles' traces even
+though the monitor runs in another process. Cycles that go over their budget are
+dumped to the log at WARNING level and kept longer than ordinary ones.
+
+Spans opened outside a traced cycle are no-ops, so instrumented helpers cost
+almost nothing when called from the API or the posting scheduler.
+
+Usage:
+    python cycle_trace.py [--slow] [--limit 5]     # print recent cycle traces
+"""
+
+import argparse
+import json
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+import logging
+
+from db_migrations import connect
+
+logger = logging.getLogger(__name__)
+
+# Cycles whose busy time (excluding deliberate waits) exceeds this are dumped
+CYCLE_BUDGET_SECONDS = float(os.getenv("CYCLE_BUDGET_SECONDS", "300"))
+
+# Traces kept in the ring buffer; as many over-budget traces are kept on top
+CYCLE_TRACE_KEEP = int(os.getenv("CYCLE_TRACE_KEEP", "20"))
+
+# Spans beyond this are dropped (and counted) so one huge cycle cannot bloat the buffer
+MAX_SPANS_PER_TRACE = int(os.getenv("CYCLE_TRACE_MAX_SPANS", "2000"))
+
+_current_span: ContextVar[Optional['Span']] = ContextVar('cycle_span', default=None)
+
+
+class Span:
+    """One timed step of a cycle"""
+
+    __slots__ = ('name', 'attrs', 'wait', 'started', 'duration', 'error', 'children', 'trace')
+
+    def __init__(self, name: str, attrs: Dict, trace: 'CycleTrace', wait: bool = False):
+        self.name = name
+        self.attrs = attrs
+        self.wait = wait
+        self.started = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.error: Optional[str] = None
+        self.children: List['Span'] = []
+        self.trace = trace
+
+    def finish(self):
+        self.duration = time.perf_counter() - self.started
+
+    def wait_seconds(self) -> float:
+        """Time spent in deliberate waits (e.g. the delay between posts) within this span"""
+        if self.wait:
+            return self.duration or 0.0
+        return sum(child.wait_seconds() for child in self.children)
+
+    def to_dict(self) -> Dict:
+        node = {'name': self.name, 'offset': round(self.started - self.trace.root.started, 4),
+                'duration': round(self.duration, 4) if self.duration is not None else None}
+        if self.attrs:
+            node['attrs'] = self.attrs
+        if self.wait:
+            node['wait'] = True
+        if self.error:
+            node['error'] = self.error
+        if self.children:
+            node['children'] = [child.to_dict() for child in self.children]
+        return node
+
+
+class CycleTrace:
+    """Span tree of one cycle"""
+
+    def __init__(self, name: str, attrs: Dict):
+        self.started_at = time.time()
+        self.span_count = 1
+        self.dropped_spans = 0
+        self.root = Span(name, attrs, self)
+
+    def to_dict(self) -> Dict:
+        return {'started_at': self.started_at, 'dropped_spans': self.dropped_spans, 'root': self.root.to_dict()}
+
+
+def _describe(error: BaseException) -> str:
+    return f"{type(error).__name__}: {error}"[:300]
+
+
+@contextmanager
+def span(name: str, wait: bool = False, **attrs) -> Iterator[Optional[Span]]:
+    """Time a step as a child of the current span; a no-op outside a traced cycle"""
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+
+    trace = parent.trace
+    if trace.span_count >= MAX_SPANS_PER_TRACE:
+        trace.dropped_spans += 1
+        yield None
+        return
+
+    trace.span_count += 1
+    current = Span(name, attrs, trace, wait)
+    parent.children.append(current)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except Exception as e:
+        current.error = _describe(e)
+        raise
+    finally:
+        current.finish()
+        _current_span.reset(token)
+
+
+def trace_error(error: BaseException):
+    """Record an exception that is handled (and only logged) on the current span"""
+    current = _current_span.get()
+    if current is not None and current.error is None:
+        current.error = _describe(error)
+
+
+@contextmanager
+def cycle_trace(name: str, budget: float = CYCLE_BUDGET_SECONDS, **attrs) -> Iterator[Span]:
+    """Trace a whole cycle; stores it on exit and dumps it when it went over `budget` seconds"""
+    trace = CycleTrace(name, attrs)
+    token = _current_span.set(trace.root)
+    try:
+        yield trace.root
+    except Exception as e:
+        trace.root.error = _describe(e)
+        raise
+    finally:
+        trace.root.finish()
+        _current_span.reset(token)
+        _finish_trace(trace, budget)
+
+
+def format_trace(node: Dict, depth: int = 0) -> List[str]:
+    """Indented one-line-per-span rendering of a stored span tree"""
+    attrs = ' '.join(f"{key}={value}" for key, value in node.get('attrs', {}).items())
+    duration = f"{node['duration'] * 1000:.0f}ms" if node.get('duration') is not None else "open"
+    line = f"{'  ' * depth}{node['name']} {duration}"
+    if attrs:
+        line += f" [{attrs}]"
+    if node.get('error'):
+        line += f" ERROR {node['error']}"
+    lines = [line]
+    for child in node.get('children', []):
+        lines.extend(format_trace(child, depth + 1))
+    return lines
+
+
+def _finish_trace(trace: CycleTrace, budget: float):
+    busy = trace.root.duration - trace.root.wait_seconds()
+    over_budget = busy > budget
+    payload = trace.to_dict()
+
+    if over_budget:
+        logger.warning(f"{trace.root.name} took {busy:.1f}s busy (budget {budget:.0f}s), trace:\n"
+                       + '\n'.join(format_trace(payload['root'])))
+
+    try:
+        CycleTraceLog().record(trace.root.name, trace.started_at, trace.root.duration, busy, over_budget, payload)
+    except Exception as e:
+        logger.error(f"Error storing cycle trace: {e}")
+
+
+class CycleTraceLog:
+    """Ring buffer of recent cycle traces in the shared database"""
+
+    def __init__(self, db_path: Optional[str] = None, keep: int = CYCLE_TRACE_KEEP):
+        self.db_path = db_path
+        self.keep = keep
+
+    def record(self, name: str, started_at: float, duration: float, busy: float, over_budget: bool,
+               payload: Dict) -> int:
+        conn = connect(self.db_path)
+        try:
+            with conn:
+                cursor = conn.execute('''
+                    INSERT INTO cycle_traces (name, started_at, duration, busy_seconds, over_budget, trace)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', (name, started_at, duration, busy, int(over_budget), json.dumps(payload, default=str)))
+                # Keep the newest traces plus the newest over-budget ones
+                conn.execute('''
+                    DELETE FROM cycle_traces
+                    WHERE id NOT IN (SELECT id FROM cycle_traces ORDER BY id DESC LIMIT ?)
+                      AND id NOT IN (SELECT id FROM cycle_traces WHERE over_budget = 1 ORDER BY id DESC LIMIT ?)
+                ''', (self.keep, self.keep))
+                return cursor.lastrowid
+        finally:
+            conn.close()
+
+    def recent(self, limit: int = 10, slow_only: bool = False) -> List[Dict]:
+        """Newest traces first, with their span trees"""
+        conn = connect(self.db_path)
+        try:
+            rows = conn.execute(f'''
+                SELECT id, name, started_at, duration, busy_seconds, over_budget, trace FROM cycle_traces
+                {"WHERE over_budget = 1" if slow_only else ""}
+                ORDER BY id DESC LIMIT ?
+            ''', (limit,)).fetchall()
+        finally:
+            conn.close()
+
+        return [
+            {'id': row[0], 'name': row[1], 'started_at': row[2], 'duration': row[3],
+             'busy_seconds': row[4], 'over_budget': bool(row[5]), **json.loads(row[6])}
+            for row in rows
+        ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show recent monitoring cycle traces")
+    parser.add_argument('--limit', type=int, default=5)
+    parser.add_argument('--slow', action='store_true', help="only cycles that went over budget")
+    args = parser.parse_args()
+    for entry in CycleTraceLog().recent(args.limit, args.slow):
+        flag = " ⚠️ over budget" if entry['over_budget'] else ""
+        print(f"#{entry['id']} {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(entry['started_at']))} "
+              f"{entry['busy_seconds']:.1f}s busy{flag}")
+        print('\n'.join(format_trace(entry['root'], 1)))
@@ -5,45 +5,221 @@ Custom AI agent for monitoring DAO ecosystem and generating social media content
 """
 
 import asyncio
-import aiohttp
-import requests
-from bs4 import BeautifulSoup
-import feedparser
-import anthropic
-from PIL import Image, ImageDraw, ImageFont
-import tweepy
-import telegram
-# LinkedIn API removed for deployment simplicity
-import schedule
+import importlib
 import time
 import os
 import json
-import sqlite3
 from datetime import datetime, timedelta
-import hashlib
-from typing import List, Dict, Any
+from functools import cached_property
+from typing import List, Dict, Any, Callable, Awaitable, Optional, TYPE_CHECKING
 import logging
 
+from content_model import ContentItem, Proposal, from_struct_time
+from db_migrations import connect
+from post_validator import repair_post, validate_post
+from social_summaries import MAX_FIELD_RETRIES, PLATFORM_LIMITS, dump_summaries, parse_summaries, preview, summary_problem
+from storage_backends import get_storage
+from viral_alerts import ViralScorer
+from llm_gateway import get_gateway
+from metrics_registry import POSTS, REGISTRY, fetch_failed, fetch_timer, timed
+from cycle_trace import cycle_trace, span, trace_error
+
+# Heavy third-party clients (tweepy, telegram, PIL, feedparser, bs4,
+# schedule) and the engagement ingestor are imported where they are used so
+# importing this module stays cheap
+if TYPE_CHECKING:
+    import aiohttp
+    from bs4 import BeautifulSoup
+    from engagement_ingest import EngagementIngestor
+# LinkedIn API removed for deployment simplicity
+
+# Modules preload_dependencies() imports ahead of the first monitoring cycle
+HEAVY_DEPENDENCIES = [
+    'aiohttp', 'requests', 'bs4', 'feedparser',
+    'PIL.Image', 'tweepy', 'telegram'
+]
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# External service endpoints; set them to mock_services.py for load and soak tests
+SNAPSHOT_GRAPHQL_URL = os.getenv("SNAPSHOT_GRAPHQL_URL", "https://hub.snapshot.org/graphql")
+TWITTER_API_HOST = "https://api.twitter.com"
+TWITTER_API_BASE_URL = os.getenv("TWITTER_API_BASE_URL", "").rstrip('/')
+TELEGRAM_API_BASE_URL = os.getenv("TELEGRAM_API_BASE_URL", "").rstrip('/')
+
+# Model writing the per-platform summaries
+SUMMARY_MODEL = "claude-3-5-sonnet-20241022"
+
+# Static instructions for every summary; with the worked example below they form the
+# system prompt (SUMMARY_SYSTEM_PROMPT), kept apart from the per-item source content
+SUMMARY_INSTRUCTIONS = """
+You are an expert treasury analyst creating original analytical memos for @Treasure_Corp, positioning it as THE trusted source for treasury analysis breakdowns.
+
+ANALYTICAL FRAMEWORK:
+- Act as a senior treasury analyst, not a content curator
+- Provide original insights, not just quotes
+- Focus on treasury management implications
+- Use data-driven analysis with specific metrics when available
+- Create thought leadership content that positions @Treasure_Corp as the expert voice
+
+CONTENT STYLE (Based on modeltrain.txt feedback):
+- Lead with analytical insight or data point
+- Provide original commentary on treasury implications
+- Reference specific metrics, percentages, or financial data
+- End with forward-looking treasury strategy insight
+- Use @Treasure_Corp handle (not "Treasure.Corp")
+- KEEP LANGUAGE ACCESSIBLE: Avoid overly technical finance jargon
+- Use standard DeFi/Web3/DAO terminology that broad audience understands
+- Focus on practical DAO treasury takeaways, not complex financial theory
+
+SUCCESSFUL EXAMPLE PATTERN:
+"📊 [DATA/METRIC] analysis shows [SPECIFIC FINDING]. Treasury implications: [ORIGINAL INSIGHT]. This suggests DAOs should [ACTIONABLE STRATEGY]. @Treasure_Corp tracks similar patterns across [SCOPE]. Source: [URL] #TreasuryAnalysis #DAO"
+
+TONE EXAMPLE (Good balance - analytical but accessible):
+"📊 40% of major DAOs now diversify treasuries beyond native tokens. Smart move: reduces volatility risk by 60%. This trend shows DAOs maturing from speculation to preservation. @Treasure_Corp data confirms diversified treasuries perform better long-term."
+
+For each source you are given, create original analyst-style content (DO NOT just quote):
+
+"twitter" (280 chars max):
+- Start with 📊/💰/🧠 + specific data point or metric
+- Provide YOUR original analysis of treasury implications
+- Add strategic insight for DAO treasury managers
+- Use @Treasure_Corp naturally in analytical context
+- End with source URL and 2-3 focused hashtags: #TreasuryAnalysis #DAO #DeFi
+
+"telegram" (500 chars max):
+- Extended treasury analysis memo format
+- Include specific metrics and implications
+- Provide actionable treasury management insights
+- Position @Treasure_Corp as analytical authority
+- Include source for credibility
+
+Respond with only a JSON object: {"twitter": "...", "telegram": "..."}
+""".strip()
+
+# A complete source -> reply pair, so the expected JSON shape is shown rather than described
+SUMMARY_WORKED_EXAMPLE = """
+WORKED EXAMPLE
+
+Source Content to Analyze:
+Title: Arbitrum DAO approves 35M ARB treasury diversification into stablecoins
+Content: The Arbitrum DAO passed a proposal moving 35 million ARB from the treasury into a basket of stablecoins and tokenized treasury bills, citing the need to fund two years of grants without selling into thin markets.
+Source URL: https://forum.arbitrum.foundation/t/treasury-diversification
+
+Reply:
+{"twitter": "📊 Arbitrum moves 35M ARB into stablecoins and tokenized T-bills. Treasury implication: two years of grants no longer depend on ARB price. DAOs funding long programs should lock runway in stable assets first. https://forum.arbitrum.foundation/t/treasury-diversification #TreasuryAnalysis #DAO", "telegram": "💰 Treasury memo: Arbitrum DAO approved moving 35M ARB into stablecoins and tokenized treasury bills to cover two years of grants. Why it matters: grant budgets denominated in a volatile native token shrink exactly when markets fall. Takeaway for DAO treasurers: match runway to commitments in stable assets, and diversify gradually to avoid selling into thin liquidity. @Treasure_Corp tracks these moves across major DAOs. Source: https://forum.arbitrum.foundation/t/treasury-diversification"}
+""".strip()
+
+# Weekly educational themes based on treasurecorp.py
+FALLBACK_DAY_THEMES = {
+    0: "treasury_education",      # Monday
+    1: "community_questions",     # Tuesday  
+    2: "industry_insights",       # Wednesday
+    3: "dao_best_practices",      # Thursday
+    4: "data_driven_insights",    # Friday
+    5: "governance_patterns",     # Saturday
+    6: "treasury_trends"          # Sunday
+}
+
+
+# Educational content templates based on high-performing patterns
+FALLBACK_TEMPLATES = {
+    "treasury_education": [
+        "📊 Treasury diversification insight: 67% of successful DAOs maintain 30-40% stablecoin reserves for operational stability while keeping growth tokens for upside potential.",
+        "💰 DAO treasury best practice: Set clear allocation thresholds - operating expenses should typically represent 12-18 months of runway based on current burn rate.",
+        "🧠 Data shows DAOs with real-time treasury dashboards have 45% better governance participation rates compared to those with monthly reporting."
+    ],
+    "community_questions": [
+        "Question for DAO treasurers: What's your biggest challenge - multi-chain asset tracking, governance approval delays, or diversification strategy?",
+        "How does your DAO handle treasury decisions? Weekly reviews, quarterly rebalancing, or only during major market events?",
+        "Curious: What percentage of your DAO's treasury is allocated to operational expenses vs long-term protocol development?"
+    ],
+    "industry_insights": [
+        "🔍 Industry trend: 78% of DAOs now use multi-sig wallets with 3-5 signers, but only 34% have automated reporting systems for transparency.",
+        "📈 DAO treasury evolution: Moving from single-token holdings to diversified portfolios with stablecoins, blue-chips, and protocol tokens.",
+        "⚡ Governance insight: DAOs with data-driven treasury metrics see 2.3x higher community engagement than those without regular reporting."
+    ],
+    "dao_best_practices": [
+        "🏛️ DAO Best Practice: Implement treasury allocation limits - no single asset should exceed 60% of total holdings except during specific growth phases.",
+        "💡 Governance efficiency tip: Create approval tiers based on spend amounts - <$10K (working group), $10K-100K (council), >$100K (full community vote).",
+        "📋 Treasury transparency standard: Monthly on-chain reporting, quarterly strategy reviews, and annual allocation assessments build community trust."
+    ],
+    "data_driven_insights": [
+        "📊 Treasury data reveals successful DAOs maintain 6-12 month operational runway in stablecoins while dedicating 20-30% to growth investments.",
+        "🧠 Analysis shows DAOs with weekly treasury reviews have 35% faster decision-making compared to monthly review cycles.",
+        "💰 Data insight: Protocol tokens in DAO treasuries outperform broad market by 23% when paired with active governance participation."
+    ],
+    "governance_patterns": [
+        "🔄 Governance pattern: Most efficient DAOs use delegate voting for routine decisions while reserving direct votes for major treasury allocations.",
+        "📊 Participation data shows DAOs with clear proposal templates see 40% higher voting rates than those with open-format submissions.",
+        "⚡ Decision velocity: DAOs using snapshot voting for signaling + on-chain execution reduce proposal cycle time by 60%."
+    ],
+    "treasury_trends": [
+        "📈 Treasury trend: Real-world asset tokenization is gaining traction with 23% of large DAOs exploring RWA allocations in 2024.",
+        "🔍 Emerging pattern: Cross-DAO collaboration funds are becoming popular for shared infrastructure and public goods funding.",
+        "💡 Innovation spotlight: Automated treasury rebalancing based on predefined triggers is being tested by forward-thinking DAOs."
+    ]
+}
+
+
+# Sent as the system prompt of every summary call. At ~900 tokens it is below the
+# 1024-token caching minimum for Sonnet, so it is not marked for prompt caching;
+# padding it with sample posts would only add input tokens and invite the model
+# to reuse their figures
+SUMMARY_SYSTEM_PROMPT = "\n\n".join([SUMMARY_INSTRUCTIONS, SUMMARY_WORKED_EXAMPLE])
+
+
+def educational_item(theme: str, day: datetime, text: str, variant: Optional[int] = None) -> ContentItem:
+    """Educational fallback item for `theme` on `day`; variants get their own title and link"""
+    title = f'{theme.replace("_", " ").title()} - {day.strftime("%Y-%m-%d")}'
+    anchor = f'{theme}-{day.strftime("%Y%m%d")}'
+    if variant:
+        title += f' #{variant}'
+        anchor += f'-{variant}'
+    return ContentItem(
+        source='TreasureCorp Educational Content',
+        title=title,
+        url=f'https://treasure-corp.com/insights#{anchor}',  # Your insights page
+        type='educational',
+        snippet=text,
+        published=day,
+        theme=theme,
+        fallback=True
+    )
+
+
+def _redirect_twitter_client(client, base_url: str):
+    """Send a tweepy Client's requests to `base_url`; tweepy hard-codes api.twitter.com"""
+    from requests.adapters import HTTPAdapter
+
+    class RedirectAdapter(HTTPAdapter):
+        def send(self, request, **kwargs):
+            request.url = base_url + request.url[len(TWITTER_API_HOST):]
+            return super().send(request, **kwargs)
+
+    client.session.mount(TWITTER_API_HOST, RedirectAdapter())
+    logger.info(f"Twitter API requests go to {base_url}")
+
+
 class DAOMonitoringLLM:
     def __init__(self):
-        # API clients
-        self.claude_client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
-        
-        # Social media clients
-        self.twitter_api = self._setup_twitter()
-        self.telegram_bot = self._setup_telegram()
+        # API and social media clients are built on first use (see the cached properties below)
         # LinkedIn API removed for deployment simplicity
         
         # Database setup
         self._setup_database()
         
+        # Async callbacks receiving (topic, payload) as the pipeline produces data
+        self.event_listeners: List[Callable[[str, Dict], Awaitable[None]]] = []
+        
+        # Incremental viral scoring over every collected item
+        self.viral_scorer = ViralScorer(self.db_connection)
+        
         # DAO sources configuration
         self.dao_sources = {
-            'snapshot': 'https://hub.snapshot.org/graphql',
+            'snapshot': SNAPSHOT_GRAPHQL_URL,
             'commonwealth': 'https://commonwealth.im/api',
             'governance_forums': [
                 'https://gov.uniswap.org',
@@ -93,48 +269,58 @@ class DAOMonitoringLLM:
         }
 
     def _setup_database(self):
-        """Initialize SQLite database for tracking content and avoiding duplicates"""
-        self.db_connection = sqlite3.connect('dao_monitoring.db', check_same_thread=False)
-        cursor = self.db_connection.cursor()
-        
-        # Create tables
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS monitored_content (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                source TEXT,
-                title TEXT,
-                url TEXT UNIQUE,
-                content_hash TEXT,
-                discovered_at TIMESTAMP,
-                processed_at TIMESTAMP,
-                summary TEXT,
-                posted_twitter BOOLEAN DEFAULT 0,
-                posted_linkedin BOOLEAN DEFAULT 0,
-                posted_telegram BOOLEAN DEFAULT 0
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS dao_proposals (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                dao_name TEXT,
-                proposal_id TEXT,
-                title TEXT,
-                description TEXT,
-                status TEXT,
-                votes_for INTEGER,
-                votes_against INTEGER,
-                end_date TIMESTAMP,
-                url TEXT UNIQUE,
-                discovered_at TIMESTAMP
-            )
-        ''')
+        """Open the content repository and the local SQLite database for scheduling and analytics"""
+        self.storage = get_storage()
+        self.db_connection = connect(check_same_thread=False)
+
+    def add_event_listener(self, listener: Callable[[str, Dict], Awaitable[None]]):
+        """Register an async callback for pipeline events (content, proposals, posting)"""
+        self.event_listeners.append(listener)
+
+    async def _emit_event(self, topic: str, payload: Dict):
+        """Notify event listeners without letting a failing listener break the cycle"""
+        for listener in self.event_listeners:
+            try:
+                await listener(topic, payload)
+            except Exception as e:
+                logger.error(f"Event listener failed for {topic}: {e}")
+
+    @cached_property
+    def twitter_api(self):
+        """Twitter client, created on first use (None when unavailable)"""
+        return self._setup_twitter()
+
+    @cached_property
+    def telegram_bot(self):
+        """Telegram bot, created on first use (None when not configured)"""
+        return self._setup_telegram()
+
+    @cached_property
+    def engagement_ingestor(self) -> 'EngagementIngestor':
+        """Incremental engagement store fed from the Twitter API"""
+        from engagement_ingest import EngagementIngestor
+        return EngagementIngestor(self.twitter_api, self.db_connection)
+
+    def preload_dependencies(self):
+        """Import heavy dependencies and build clients ahead of the first cycle.
+
+        Blocking; the monitor worker runs it in a thread so the event loop keeps serving.
+        """
+        started = time.perf_counter()
+        for module_name in HEAVY_DEPENDENCIES:
+            try:
+                importlib.import_module(module_name)
+            except ImportError as e:
+                logger.error(f"Could not preload {module_name}: {e}")
         
-        self.db_connection.commit()
+        # Touch the lazily built social clients so their setup cost is paid here too
+        _ = (self.twitter_api, self.telegram_bot)
+        logger.info(f"Monitor dependencies loaded in {(time.perf_counter() - started) * 1000:.0f} ms")
 
     def _setup_twitter(self):
         """Setup Twitter API v2"""
         try:
+            import tweepy
             client = tweepy.Client(
                 bearer_token=os.getenv("TWITTER_BEARER_TOKEN"),
                 consumer_key=os.getenv("TWITTER_CONSUMER_KEY"),
@@ -143,6 +329,8 @@ class DAOMonitoringLLM:
                 access_token_secret=os.getenv("TWITTER_ACCESS_TOKEN_SECRET"),
                 wait_on_rate_limit=True
             )
+            if TWITTER_API_BASE_URL:
+                _redirect_twitter_client(client, TWITTER_API_BASE_URL)
             return client
         except Exception as e:
             logger.error(f"Twitter setup failed: {e}")
@@ -151,8 +339,14 @@ class DAOMonitoringLLM:
     def _setup_telegram(self):
         """Setup Telegram bot"""
         try:
+            import telegram
             bot_token = os.getenv("TELEGRAM_BOT_TOKEN")
-            return telegram.Bot(token=bot_token) if bot_token else None
+            if not bot_token:
+                return None
+            if TELEGRAM_API_BASE_URL:
+                return telegram.Bot(token=bot_token, base_url=f"{TELEGRAM_API_BASE_URL}/bot",
+                                    base_file_url=f"{TELEGRAM_API_BASE_URL}/file/bot")
+            return telegram.Bot(token=bot_token)
         except Exception as e:
             logger.error(f"Telegram setup failed: {e}")
             return None
@@ -167,8 +361,10 @@ class DAOMonitoringLLM:
             logger.error(f"LinkedIn setup failed: {e}")
             return None
 
-    async def monitor_dao_proposals(self) -> List[Dict]:
+    @timed('monitor_dao_proposals')
+    async def monitor_dao_proposals(self) -> List[Proposal]:
         """Monitor DAO governance proposals from various platforms"""
+        import aiohttp
         proposals = []
         
         async with aiohttp.ClientSession() as session:
@@ -184,9 +380,29 @@ class DAOMonitoringLLM:
             except Exception as e:
                 logger.error(f"Error fetching Commonwealth data: {e}")
 
+        # Push only proposals we have not seen before
+        for proposal in await self._store_new_proposals(proposals):
+            await self._emit_event('proposals', {
+                'dao_name': proposal.dao_name,
+                'proposal_id': proposal.proposal_id,
+                'title': proposal.title,
+                'status': proposal.status,
+                'votes_total': proposal.votes_total or 0,
+                'end_date': proposal.end_date.isoformat() if proposal.end_date else None,
+                'url': proposal.url
+            })
+
         return proposals
 
-    async def _fetch_snapshot_proposals(self, session: aiohttp.ClientSession) -> List[Dict]:
+    async def _store_new_proposals(self, proposals: List[Proposal]) -> List[Proposal]:
+        """Upsert proposals into dao_proposals and return the ones that were not stored yet"""
+        try:
+            return await self.storage.upsert_proposals(proposals)
+        except Exception as e:
+            logger.error(f"Error storing proposals: {e}")
+            return []
+
+    async def _fetch_snapshot_proposals(self, session: 'aiohttp.ClientSession') -> List[Proposal]:
         """Fetch active proposals from popular Snapshot spaces"""
         proposals = []
         
@@ -226,50 +442,62 @@ class DAOMonitoringLLM:
         }
         ''' % str(popular_spaces).replace("'", '"')
 
+        snapshot_url = self.dao_sources['snapshot']
         try:
-            async with session.post(
-                'https://hub.snapshot.org/graphql',
-                json={'query': query},
-                headers={'Content-Type': 'application/json'}
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    for proposal in data.get('data', {}).get('proposals', []):
-                        proposals.append({
-                            'source': 'snapshot',
-                            'dao_name': proposal['space']['name'],
-                            'proposal_id': proposal['id'],
-                            'title': proposal['title'],
-                            'description': proposal['body'][:500] if proposal['body'] else '',
-                            'status': proposal['state'],
-                            'votes_total': proposal['votes'],
-                            'end_date': datetime.fromtimestamp(proposal['end']) if proposal['end'] else None,
-                            'url': f"https://snapshot.org/#/{proposal['space']['id']}/proposal/{proposal['id']}"
-                        })
-                else:
-                    logger.error(f"Snapshot API returned status {response.status}")
+            with fetch_timer('snapshot', snapshot_url):
+                async with session.post(
+                    snapshot_url,
+                    json={'query': query},
+                    headers={'Content-Type': 'application/json'}
+                ) as response:
+                    data = await response.json() if response.status == 200 else None
+            if data is not None:
+                for proposal in data.get('data', {}).get('proposals', []):
+                    proposals.append(Proposal(
+                        source='snapshot',
+                        dao_name=proposal['space']['name'],
+                        proposal_id=proposal['id'],
+                        title=proposal['title'],
+                        description=proposal['body'][:500] if proposal['body'] else '',
+                        status=proposal['state'],
+                        votes_total=proposal['votes'],
+                        start_date=datetime.fromtimestamp(proposal['start']) if proposal['start'] else None,
+                        end_date=datetime.fromtimestamp(proposal['end']) if proposal['end'] else None,
+                        url=f"https://snapshot.org/#/{proposal['space']['id']}/proposal/{proposal['id']}"
+                    ))
+            else:
+                fetch_failed('snapshot', snapshot_url)
+                logger.error(f"Snapshot API returned status {response.status}")
         except Exception as e:
             logger.error(f"Error fetching Snapshot proposals: {e}")
 
         return proposals
 
-    async def _fetch_commonwealth_proposals(self, session: aiohttp.ClientSession) -> List[Dict]:
+    async def _fetch_commonwealth_proposals(self, session: 'aiohttp.ClientSession') -> List[Proposal]:
         """Fetch proposals from Commonwealth"""
         proposals = []
         # Implementation would depend on Commonwealth API structure
         # This is a placeholder for the actual implementation
         return proposals
 
-    async def monitor_dao_websites(self) -> List[Dict]:
+    @timed('monitor_dao_websites')
+    async def monitor_dao_websites(self) -> List[ContentItem]:
         """Scrape DAO websites for news, updates, and reports"""
+        import aiohttp
+        from bs4 import BeautifulSoup
         content = []
         
         async with aiohttp.ClientSession() as session:
             for website_url in self.dao_sources['dao_websites']:
                 try:
-                    async with session.get(website_url) as response:
-                        if response.status == 200:
-                            html = await response.text()
+                    with fetch_timer('website', website_url):
+                        async with session.get(website_url) as response:
+                            html = await response.text() if response.status == 200 else None
+                    if html is None:
+                        fetch_failed('website', website_url)
+                        logger.warning(f"{website_url} returned status {response.status}")
+                    else:
+                        with span('parse', source=website_url):
                             soup = BeautifulSoup(html, 'html.parser')
                             
                             # Extract recent news/blog posts
@@ -285,7 +513,7 @@ class DAOMonitoringLLM:
 
         return content
 
-    async def _extract_articles(self, soup: BeautifulSoup, base_url: str) -> List[Dict]:
+    async def _extract_articles(self, soup: 'BeautifulSoup', base_url: str) -> List[ContentItem]:
         """Extract article information from website"""
         articles = []
         
@@ -304,17 +532,17 @@ class DAOMonitoringLLM:
                 link_elem = element.find('a')
                 
                 if title_elem and link_elem:
-                    articles.append({
-                        'source': base_url,
-                        'title': title_elem.get_text().strip(),
-                        'url': self._resolve_url(base_url, link_elem.get('href')),
-                        'snippet': element.get_text()[:200].strip(),
-                        'type': 'article'
-                    })
+                    articles.append(ContentItem(
+                        source=base_url,
+                        title=title_elem.get_text().strip(),
+                        url=self._resolve_url(base_url, link_elem.get('href')),
+                        snippet=element.get_text()[:200].strip(),
+                        type='article'
+                    ))
         
         return articles
 
-    async def _find_reports(self, soup: BeautifulSoup, base_url: str) -> List[Dict]:
+    async def _find_reports(self, soup: 'BeautifulSoup', base_url: str) -> List[ContentItem]:
         """Find downloadable reports on the website"""
         reports = []
         
@@ -322,12 +550,12 @@ class DAOMonitoringLLM:
         pdf_links = soup.find_all('a', href=lambda x: x and x.endswith('.pdf'))
         
         for link in pdf_links[:3]:  # Limit to 3 reports
-            reports.append({
-                'source': base_url,
-                'title': link.get_text().strip() or 'Report',
-                'url': self._resolve_url(base_url, link.get('href')),
-                'type': 'report'
-            })
+            reports.append(ContentItem(
+                source=base_url,
+                title=link.get_text().strip() or 'Report',
+                url=self._resolve_url(base_url, link.get('href')),
+                type='report'
+            ))
         
         return reports
 
@@ -336,25 +564,31 @@ class DAOMonitoringLLM:
         from urllib.parse import urljoin
         return urljoin(base_url, relative_url)
 
-    async def monitor_news_feeds(self) -> List[Dict]:
+    @timed('monitor_news_feeds')
+    async def monitor_news_feeds(self) -> List[ContentItem]:
         """Monitor RSS feeds for DAO-related news"""
+        import feedparser
         news_items = []
         
         for feed_url in self.analytical_sources:
             try:
-                feed = feedparser.parse(feed_url)
+                with fetch_timer('feed', feed_url):
+                    feed = feedparser.parse(feed_url)
+                # feedparser reports network and parse failures in `bozo` instead of raising
+                if feed.bozo and not feed.entries:
+                    fetch_failed('feed', feed_url)
                 
                 for entry in feed.entries[:5]:  # Last 5 entries per feed
                     # Filter for DAO-related content
                     if self._is_dao_relevant(entry.title + " " + entry.get('summary', '')):
-                        news_items.append({
-                            'source': feed_url,
-                            'title': entry.title,
-                            'url': entry.link,
-                            'summary': entry.get('summary', '')[:300],
-                            'published': entry.get('published_parsed'),
-                            'type': 'news'
-                        })
+                        news_items.append(ContentItem(
+                            source=feed_url,
+                            title=entry.title,
+                            url=entry.link,
+                            snippet=entry.get('summary', '')[:300],
+                            published=from_struct_time(entry.get('published_parsed')),
+                            type='news'
+                        ))
                         
             except Exception as e:
                 logger.error(f"Error parsing feed {feed_url}: {e}")
@@ -372,124 +606,147 @@ class DAOMonitoringLLM:
         text_lower = text.lower()
         return any(keyword in text_lower for keyword in dao_keywords)
 
-    async def process_and_summarize(self, content_items: List[Dict]) -> List[Dict]:
-        """Process content items and generate summaries using LLM"""
+    @timed('process_and_summarize')
+    async def process_and_summarize(self, content_items: List[ContentItem]) -> List[ContentItem]:
+        """Summarize new content items with the LLM and store them; returns the stored items"""
         processed_items = []
         
         for item in content_items:
-            try:
-                # Check if already processed
-                content_hash = hashlib.md5(item['title'].encode()).hexdigest()
-                cursor = self.db_connection.cursor()
-                cursor.execute("SELECT id FROM monitored_content WHERE content_hash = ?", (content_hash,))
-                
-                if cursor.fetchone():
-                    continue  # Skip already processed content
+            with span('item', title=item.title[:80], type=item.type):
+                try:
+                    # Check if already processed
+                    with span('dedup'):
+                        exists = await self.storage.content_exists(item.fingerprint)
+                    if exists:
+                        continue  # Skip already processed content
                 
-                # Generate summary
-                summary = await self._generate_summary(item)
+                    # Generate summary
+                    summary = await self._generate_summary(item)
                 
-                if summary:
-                    processed_item = {
-                        **item,
-                        'summary': summary,
-                        'content_hash': content_hash
-                    }
-                    processed_items.append(processed_item)
+                    if summary:
+                        # Store in the content repository
+                        with span('store'):
+                            content_id = await self.storage.insert_content(
+                                item.source, item.title, item.url, item.fingerprint, summary
+                            )
+                        if content_id is None:
+                            continue  # Same URL stored under another title
                     
-                    # Store in database
-                    cursor.execute('''
-                        INSERT INTO monitored_content 
-                        (source, title, url, content_hash, discovered_at, summary)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    ''', (
-                        item['source'], item['title'], item['url'],
-                        content_hash, datetime.now(), summary
-                    ))
-                    self.db_connection.commit()
+                        item.summary = summary
+                        item.content_id = content_id
+                        processed_items.append(item)
                     
-            except Exception as e:
-                logger.error(f"Error processing item {item.get('title', 'Unknown')}: {e}")
+                        await self._emit_event('content', {
+                            'id': content_id,
+                            'title': item.title,
+                            'source': item.source,
+                            'url': item.url,
+                            'type': item.type,
+                            'summary': preview(summary, 200)
+                        })
+                    
+                except Exception as e:
+                    trace_error(e)
+                    logger.error(f"Error processing item {item.title}: {e}")
         
         return processed_items
 
-    async def _generate_summary(self, item: Dict) -> str:
+    @timed('generate_summary')
+    async def _generate_summary(self, item: ContentItem) -> str:
         """Generate a concise summary using Claude"""
+        import requests
+        from urllib.parse import urlparse
+        from bs4 import BeautifulSoup
         try:
             # Fetch full content if it's a URL
-            content_text = item.get('summary', item.get('snippet', ''))
+            content_text = item.snippet
             
-            if item.get('url') and item.get('type') != 'report':
+            # Reports are binary and fallback items carry their own text
+            if item.url and item.type != 'report' and not item.fallback:
                 try:
-                    response = requests.get(item['url'], timeout=10)
-                    if response.status_code == 200:
-                        soup = BeautifulSoup(response.content, 'html.parser')
-                        content_text = soup.get_text()[:2000]  # Limit content length
+                    host = urlparse(item.url).netloc
+                    with fetch_timer('article', host):
+                        response = requests.get(item.url, timeout=10)
+                    if response.status_code != 200:
+                        fetch_failed('article', host)
+                    else:
+                        with span('parse', source=host):
+                            soup = BeautifulSoup(response.content, 'html.parser')
+                            content_text = soup.get_text()[:2000]  # Limit content length
                 except:
                     pass  # Use existing content if fetch fails
 
-            prompt = f"""
-            You are an expert treasury analyst creating original analytical memos for @Treasure_Corp, positioning it as THE trusted source for treasury analysis breakdowns.
-
-            ANALYTICAL FRAMEWORK:
-            - Act as a senior treasury analyst, not a content curator
-            - Provide original insights, not just quotes
-            - Focus on treasury management implications
-            - Use data-driven analysis with specific metrics when available
-            - Create thought leadership content that positions @Treasure_Corp as the expert voice
-
-            CONTENT STYLE (Based on modeltrain.txt feedback):
-            - Lead with analytical insight or data point
-            - Provide original commentary on treasury implications  
-            - Reference specific metrics, percentages, or financial data
-            - End with forward-looking treasury strategy insight
-            - Use @Treasure_Corp handle (not "Treasure.Corp")
-            - KEEP LANGUAGE ACCESSIBLE: Avoid overly technical finance jargon
-            - Use standard DeFi/Web3/DAO terminology that broad audience understands
-            - Focus on practical DAO treasury takeaways, not complex financial theory
-
-            SUCCESSFUL EXAMPLE PATTERN:
-            "📊 [DATA/METRIC] analysis shows [SPECIFIC FINDING]. Treasury implications: [ORIGINAL INSIGHT]. This suggests DAOs should [ACTIONABLE STRATEGY]. @Treasure_Corp tracks similar patterns across [SCOPE]. Source: [URL] #TreasuryAnalysis #DAO"
-            
-            TONE EXAMPLE (Good balance - analytical but accessible):
-            "📊 40% of major DAOs now diversify treasuries beyond native tokens. Smart move: reduces volatility risk by 60%. This trend shows DAOs maturing from speculation to preservation. @Treasure_Corp data confirms diversified treasuries perform better long-term."
+            prompt = self._summary_prompt(item, content_text)
 
-            Source Content to Analyze:
-            Title: {item['title']}
-            Content: {content_text[:800]}
-            Source URL: {item.get('url', 'N/A')}
+            # Prefilling "{" makes the reply continue as the JSON object
+            reply = await self._ask_claude(prompt, max_tokens=600, prefill="{", system=SUMMARY_SYSTEM_PROMPT,
+                                           caller="summary")
+            summaries = parse_summaries("{" + reply)
             
-            Create original analyst-style content (DO NOT just quote):
+            # Re-ask only for fields that are missing or over their limit
+            for platform in PLATFORM_LIMITS:
+                summaries[platform] = await self._repair_summary_field(item, platform, summaries.get(platform))
             
-            1. Twitter (280 chars max):
-            - Start with 📊/💰/🧠 + specific data point or metric
-            - Provide YOUR original analysis of treasury implications
-            - Add strategic insight for DAO treasury managers
-            - Use @Treasure_Corp naturally in analytical context
-            - End with source URL and 2-3 focused hashtags: #TreasuryAnalysis #DAO #DeFi
-            
-            2. Telegram (500 chars max):
-            - Extended treasury analysis memo format
-            - Include specific metrics and implications
-            - Provide actionable treasury management insights
-            - Position @Treasure_Corp as analytical authority
-            - Include source for credibility
-            """
-
-            response = self.claude_client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=600,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            
-            return response.content[0].text
+            summaries = {platform: text for platform, text in summaries.items() if text}
+            return dump_summaries(summaries) if summaries else None
             
         except Exception as e:
             logger.error(f"Error generating summary: {e}")
             return None
 
-    def generate_social_images(self, content: Dict) -> Dict[str, str]:
+    def _summary_prompt(self, item: ContentItem, content_text: str) -> str:
+        """Per-item part of the summary prompt (the instructions are in SUMMARY_SYSTEM_PROMPT)"""
+        return f"""
+        Source Content to Analyze:
+        Title: {item.title}
+        Content: {content_text[:800]}
+        Source URL: {item.url or 'N/A'}
+        
+        Create original analyst-style content (DO NOT just quote) and respond with only the JSON object.
+        """
+
+    async def _ask_claude(self, prompt: str, max_tokens: int, prefill: str = "", system: Optional[str] = None,
+                          caller: str = "monitor") -> str:
+        with span('llm', caller=caller):
+            return await get_gateway().complete(prompt, model=SUMMARY_MODEL, max_tokens=max_tokens, prefill=prefill,
+                                                system=system, caller=caller)
+
+    async def _repair_summary_field(self, item: ContentItem, platform: str, text: Optional[str]) -> Optional[str]:
+        """Return a postable text for `platform`, re-asking for just that field; None if it stays invalid"""
+        limit = PLATFORM_LIMITS[platform]
+        
+        for attempt in range(1, MAX_FIELD_RETRIES + 1):
+            # Trim, hashtag budget and formatting fixes are local; only re-ask when they are not enough
+            if text:
+                text = repair_post(text, platform)
+            problem = summary_problem(platform, text)
+            if problem is None:
+                return text
+            logger.info(f"{platform} summary for {item.title!r} {problem}, asking again ({attempt}/{MAX_FIELD_RETRIES})")
+            
+            if text:
+                prompt = (f"This {platform} post for @Treasure_Corp {problem}. Rewrite it in at most {limit} "
+                          f"characters, keeping the key metric, the treasury insight, the source URL and "
+                          f"the hashtags.\n\nPost:\n{text}\n\nRespond with only the rewritten post.")
+            else:
+                prompt = (f"Write a {platform} post of at most {limit} characters for @Treasure_Corp analysing "
+                          f"the treasury implications of: {item.title}\nSource: {item.url or 'N/A'}\n"
+                          f"Start with 📊/💰/🧠 and a concrete data point and end with the source URL and "
+                          f"2-3 hashtags.\n\nRespond with only the post.")
+            text = await self._ask_claude(prompt, max_tokens=300, caller="summary_repair")
+        
+        if text:
+            text = repair_post(text, platform)
+        problem = summary_problem(platform, text)
+        if problem is None:
+            return text
+        logger.warning(f"Dropping {platform} summary for {item.title!r}: {problem}")
+        return None
+
+    @timed('generate_social_images')
+    def generate_social_images(self, content: ContentItem) -> Dict[str, str]:
         """Generate platform-specific images for social media posts"""
+        from PIL import Image, ImageDraw, ImageFont
         image_paths = {}
         
         try:
@@ -518,7 +775,7 @@ class DAOMonitoringLLM:
                 draw.text((50, 120), "DAO Intelligence", fill='#ffffff', font=subtitle_font)
                 
                 # Add content title (wrapped)
-                title = content['title'][:80] + "..." if len(content['title']) > 80 else content['title']
+                title = content.title[:80] + "..." if len(content.title) > 80 else content.title
                 draw.text((50, 200), title, fill='#ffffff', font=subtitle_font)
                 
                 # Add platform-specific elements
@@ -540,17 +797,29 @@ class DAOMonitoringLLM:
             
         return image_paths
 
-    async def post_to_social_media(self, content: Dict, summaries: Dict, images: Dict):
-        """Post content to all configured social media platforms"""
+    @timed('post_to_social_media')
+    async def post_to_social_media(self, content: ContentItem, summaries: Dict, images: Dict) -> Dict[str, Dict]:
+        """Post content to all configured social media platforms and return per-platform results"""
+        results = {}
         
         # Post to Twitter
         if self.twitter_api and 'twitter' in summaries:
             try:
+                # Manual posts and older stored summaries never went through generation checks
+                tweet = repair_post(summaries['twitter'])
+                problems = validate_post(tweet)
+                if problems:
+                    raise ValueError(f"tweet rejected locally: {'; '.join(problems)}")
+                
                 # Twitter API v2 doesn't support media uploads directly
                 # For now, just post text content
-                self.twitter_api.create_tweet(text=summaries['twitter'])
-                logger.info(f"Posted to Twitter: {content['title']}")
+                with span('post', platform='twitter'):
+                    response = self.twitter_api.create_tweet(text=tweet)
+                results['twitter'] = {'success': True, 'post_id': str(response.data['id']) if response.data else None}
+                logger.info(f"Posted to Twitter: {content.title}")
             except Exception as e:
+                trace_error(e)
+                results['twitter'] = {'success': False, 'error': str(e)}
                 logger.error(f"Twitter posting failed: {e}")
         
         # LinkedIn posting removed for deployment simplification
@@ -560,54 +829,54 @@ class DAOMonitoringLLM:
             try:
                 chat_id = os.getenv("TELEGRAM_CHAT_ID")
                 if chat_id:
-                    if 'telegram' in images:
-                        self.telegram_bot.send_photo(
-                            chat_id=chat_id,
-                            photo=open(images['telegram'], 'rb'),
-                            caption=summaries['telegram']
-                        )
-                    else:
-                        self.telegram_bot.send_message(
-                            chat_id=chat_id,
-                            text=summaries['telegram']
-                        )
-                logger.info(f"Posted to Telegram: {content['title']}")
+                    # python-telegram-bot 20.x exposes coroutine methods
+                    with span('post', platform='telegram'):
+                        if 'telegram' in images:
+                            with open(images['telegram'], 'rb') as photo:
+                                message = await self.telegram_bot.send_photo(
+                                    chat_id=chat_id,
+                                    photo=photo,
+                                    caption=summaries['telegram']
+                                )
+                        else:
+                            message = await self.telegram_bot.send_message(
+                                chat_id=chat_id,
+                                text=summaries['telegram']
+                            )
+                    results['telegram'] = {'success': True, 'post_id': str(message.message_id)}
+                logger.info(f"Posted to Telegram: {content.title}")
             except Exception as e:
+                trace_error(e)
+                results['telegram'] = {'success': False, 'error': str(e)}
                 logger.error(f"Telegram posting failed: {e}")
+        
+        for platform, result in results.items():
+            POSTS.inc(platform=platform, result='success' if result['success'] else 'failure')
+            await self._emit_event('posting', {
+                'platform': platform,
+                'title': content.title,
+                'url': content.url,
+                **result
+            })
+        
+        return results
 
-    def analyze_tweet_engagement(self, limit: int = 20):
-        """Analyze recent tweets for engagement patterns"""
-        if not self.twitter_api:
-            logger.error("Twitter API not available for engagement analysis")
-            return None
-            
+    def analyze_tweet_engagement(self, limit: int = 20, refresh: bool = True):
+        """Analyze recent tweets for engagement patterns
+
+        Reads the local engagement store; the Twitter API is only hit when the
+        store is older than ENGAGEMENT_REFRESH_SECONDS, and then incrementally.
+        """
+        from engagement_ingest import latest_engagement
+        
         try:
-            # Get recent tweets with metrics
-            tweets = self.twitter_api.get_users_tweets(
-                id="1886316341293879296",  # @Treasure_Corp user ID
-                max_results=limit,
-                tweet_fields=['created_at', 'public_metrics', 'text'],
-                exclude=['retweets', 'replies']
-            )
+            if refresh and self.twitter_api and self.engagement_ingestor.is_stale():
+                self.engagement_ingestor.ingest()
             
-            engagement_data = []
-            if tweets.data:
-                for tweet in tweets.data:
-                    metrics = tweet.public_metrics
-                    engagement_rate = (metrics['like_count'] + metrics['retweet_count'] + metrics['reply_count']) / max(metrics['impression_count'], 1) * 100
-                    
-                    engagement_data.append({
-                        'text': tweet.text[:100] + '...',
-                        'created_at': tweet.created_at,
-                        'impressions': metrics['impression_count'],
-                        'likes': metrics['like_count'],
-                        'retweets': metrics['retweet_count'],
-                        'replies': metrics['reply_count'],
-                        'engagement_rate': round(engagement_rate, 2)
-                    })
-            
-            # Sort by engagement rate
-            engagement_data.sort(key=lambda x: x['engagement_rate'], reverse=True)
+            engagement_data = latest_engagement(self.db_connection, limit)
+            if not engagement_data and not self.twitter_api:
+                logger.error("Twitter API not available for engagement analysis")
+                return None
             
             logger.info(f"Analyzed {len(engagement_data)} recent tweets")
             return engagement_data
@@ -622,13 +891,13 @@ class DAOMonitoringLLM:
         
         try:
             # Create content item from URL
-            manual_item = {
-                'source': url,
-                'title': f"Manual {content_type.title()} Submission",
-                'url': url,
-                'type': content_type,
-                'manual': True
-            }
+            manual_item = ContentItem(
+                source=url,
+                title=f"Manual {content_type.title()} Submission",
+                url=url,
+                type=content_type,
+                manual=True
+            )
             
             # Process the single item
             processed_content = await self.process_and_summarize([manual_item])
@@ -637,7 +906,7 @@ class DAOMonitoringLLM:
                 item = processed_content[0]
                 
                 # Parse summaries
-                summaries = self._parse_summaries(item['summary'])
+                summaries = parse_summaries(item.summary)
                 
                 # Generate images
                 images = self.generate_social_images(item)
@@ -673,83 +942,68 @@ class DAOMonitoringLLM:
                 'message': f'Error processing source: {str(e)}'
             }
 
-    def generate_fallback_content(self):
+    def generate_fallback_content(self) -> ContentItem:
         """Generate educational content when no hot DAO news is available"""
-        from datetime import datetime
         import random
         
-        # Weekly themes based on treasurecorp.py
-        day_themes = {
-            0: "treasury_education",      # Monday
-            1: "community_questions",     # Tuesday  
-            2: "industry_insights",       # Wednesday
-            3: "dao_best_practices",      # Thursday
-            4: "data_driven_insights",    # Friday
-            5: "governance_patterns",     # Saturday
-            6: "treasury_trends"          # Sunday
-        }
-        
         today = datetime.now()
-        theme = day_themes.get(today.weekday(), "treasury_education")
-        
-        # Educational content templates based on high-performing patterns
-        templates = {
-            "treasury_education": [
-                "📊 Treasury diversification insight: 67% of successful DAOs maintain 30-40% stablecoin reserves for operational stability while keeping growth tokens for upside potential.",
-                "💰 DAO treasury best practice: Set clear allocation thresholds - operating expenses should typically represent 12-18 months of runway based on current burn rate.",
-                "🧠 Data shows DAOs with real-time treasury dashboards have 45% better governance participation rates compared to those with monthly reporting."
-            ],
-            "community_questions": [
-                "Question for DAO treasurers: What's your biggest challenge - multi-chain asset tracking, governance approval delays, or diversification strategy?",
-                "How does your DAO handle treasury decisions? Weekly reviews, quarterly rebalancing, or only during major market events?",
-                "Curious: What percentage of your DAO's treasury is allocated to operational expenses vs long-term protocol development?"
-            ],
-            "industry_insights": [
-                "🔍 Industry trend: 78% of DAOs now use multi-sig wallets with 3-5 signers, but only 34% have automated reporting systems for transparency.",
-                "📈 DAO treasury evolution: Moving from single-token holdings to diversified portfolios with stablecoins, blue-chips, and protocol tokens.",
-                "⚡ Governance insight: DAOs with data-driven treasury metrics see 2.3x higher community engagement than those without regular reporting."
-            ],
-            "dao_best_practices": [
-                "🏛️ DAO Best Practice: Implement treasury allocation limits - no single asset should exceed 60% of total holdings except during specific growth phases.",
-                "💡 Governance efficiency tip: Create approval tiers based on spend amounts - <$10K (working group), $10K-100K (council), >$100K (full community vote).",
-                "📋 Treasury transparency standard: Monthly on-chain reporting, quarterly strategy reviews, and annual allocation assessments build community trust."
-            ],
-            "data_driven_insights": [
-                "📊 Treasury data reveals successful DAOs maintain 6-12 month operational runway in stablecoins while dedicating 20-30% to growth investments.",
-                "🧠 Analysis shows DAOs with weekly treasury reviews have 35% faster decision-making compared to monthly review cycles.",
-                "💰 Data insight: Protocol tokens in DAO treasuries outperform broad market by 23% when paired with active governance participation."
-            ],
-            "governance_patterns": [
-                "🔄 Governance pattern: Most efficient DAOs use delegate voting for routine decisions while reserving direct votes for major treasury allocations.",
-                "📊 Participation data shows DAOs with clear proposal templates see 40% higher voting rates than those with open-format submissions.",
-                "⚡ Decision velocity: DAOs using snapshot voting for signaling + on-chain execution reduce proposal cycle time by 60%."
-            ],
-            "treasury_trends": [
-                "📈 Treasury trend: Real-world asset tokenization is gaining traction with 23% of large DAOs exploring RWA allocations in 2024.",
-                "🔍 Emerging pattern: Cross-DAO collaboration funds are becoming popular for shared infrastructure and public goods funding.",
-                "💡 Innovation spotlight: Automated treasury rebalancing based on predefined triggers is being tested by forward-thinking DAOs."
-            ]
-        }
-        
-        content_options = templates.get(theme, templates["treasury_education"])
-        selected_content = random.choice(content_options)
-        
-        # Create content item
-        fallback_item = {
-            'source': 'TreasureCorp Educational Content',
-            'title': f'{theme.replace("_", " ").title()} - {today.strftime("%Y-%m-%d")}',
-            'url': 'https://treasure-corp.com/insights',  # Your insights page
-            'type': 'educational',
-            'content': selected_content,
-            'theme': theme,
-            'fallback': True
-        }
+        theme = FALLBACK_DAY_THEMES.get(today.weekday(), "treasury_education")
+        content_options = FALLBACK_TEMPLATES.get(theme, FALLBACK_TEMPLATES["treasury_education"])
+        fallback_item = educational_item(theme, today, random.choice(content_options))
         
         logger.info(f"Generated fallback content for theme: {theme}")
         return fallback_item
 
-    async def daily_monitoring_cycle(self):
-        """Run the complete daily monitoring and posting cycle"""
+    def educational_backlog(self, days: int = 7) -> List[ContentItem]:
+        """Every educational template for the themes of the next `days` days (input for bulk batch generation)"""
+        items = []
+        midnight = datetime.combine(datetime.now().date(), datetime.min.time())
+        for offset in range(days):
+            day = midnight + timedelta(days=offset)
+            theme = FALLBACK_DAY_THEMES.get(day.weekday(), "treasury_education")
+            for variant, text in enumerate(FALLBACK_TEMPLATES.get(theme, FALLBACK_TEMPLATES["treasury_education"]), 1):
+                items.append(educational_item(theme, day, text, variant))
+        return items
+
+    async def score_viral_content(self, content_items: List[ContentItem]) -> List[Dict]:
+        """Feed items through the viral scorer and publish new alerts and ones whose score rose"""
+        alerts = []
+        for item in content_items:
+            try:
+                alert = self.viral_scorer.ingest(item)
+            except Exception as e:
+                logger.error(f"Error scoring {item.title}: {e}")
+                continue
+            
+            if alert:
+                alerts.append(alert)
+                await self._emit_event('viral', {
+                    'alert_id': alert['alert_id'],
+                    'content_key': alert['content_key'],
+                    'title': alert['title'],
+                    'url': alert['url'],
+                    'source': alert['source'],
+                    'viral_score': alert['viral_score'],
+                    'trending_hashtags': alert['trending_hashtags'],
+                    'recommended_action': alert['recommended_action'],
+                    'updated_at': alert['updated_at']
+                })
+        
+        if alerts:
+            logger.info(f"Raised {len(alerts)} viral alerts")
+        return alerts
+
+    async def daily_monitoring_cycle(self, post_content: bool = True):
+        """Run the complete daily monitoring and posting cycle
+
+        With post_content=False items are only collected and summarized; the
+        posting scheduler picks them up from monitored_content at their slot times.
+        Every run is traced (see cycle_trace.py).
+        """
+        with cycle_trace('daily_monitoring_cycle', post_content=post_content):
+            await self._monitoring_cycle(post_content)
+
+    async def _monitoring_cycle(self, post_content: bool):
         logger.info("Starting daily DAO monitoring cycle...")
         
         try:
@@ -770,6 +1024,10 @@ class DAOMonitoringLLM:
             
             logger.info(f"Collected {len(all_content)} content items")
             
+            # Score everything collected this cycle, including items seen before
+            with span('viral_scoring'):
+                await self.score_viral_content(all_content)
+            
             # Process and summarize
             processed_content = await self.process_and_summarize(all_content)
             logger.info(f"Processed {len(processed_content)} new items")
@@ -780,11 +1038,20 @@ class DAOMonitoringLLM:
                 fallback_content = self.generate_fallback_content()
                 processed_content = await self.process_and_summarize([fallback_content])
             
+            usage = get_gateway().usage.summary()
+            logger.info(f"LLM usage since start: {usage['requests']} requests, {usage['input_tokens']} uncached / "
+                        f"{usage['cache_read_input_tokens']} cached input tokens, "
+                        f"cache hit rate {usage['cache_hit_rate']:.0%}")
+            
+            if not post_content:
+                logger.info("Daily monitoring cycle completed (posting left to the scheduler)")
+                return
+            
             # Post to social media
             for item in processed_content[:2]:  # Limit to 2 posts per cycle to avoid spam
                 try:
                     # Parse summaries (assuming they're formatted properly)
-                    summaries = self._parse_summaries(item['summary'])
+                    summaries = parse_summaries(item.summary)
                     
                     # Generate images
                     images = self.generate_social_images(item)
@@ -800,46 +1067,22 @@ class DAOMonitoringLLM:
                             pass
                     
                     # Delay between posts to avoid rate limiting
-                    await asyncio.sleep(300)  # 5 minutes between posts
+                    with span('post_delay', wait=True):
+                        await asyncio.sleep(300)  # 5 minutes between posts
                     
                 except Exception as e:
+                    trace_error(e)
                     logger.error(f"Error posting content: {e}")
             
             logger.info("Daily monitoring cycle completed")
             
         except Exception as e:
+            trace_error(e)
             logger.error(f"Error in daily monitoring cycle: {e}")
 
-    def _parse_summaries(self, summary_text: str) -> Dict[str, str]:
-        """Parse the formatted summary text into platform-specific versions"""
-        summaries = {}
-        
-        # Simple parsing - in production, use more robust parsing
-        lines = summary_text.split('\n')
-        current_platform = None
-        current_text = []
-        
-        for line in lines:
-            line = line.strip()
-            if line.startswith('1. Twitter'):
-                current_platform = 'twitter'
-                current_text = []
-            elif line.startswith('2. Telegram'):
-                if current_platform:
-                    summaries[current_platform] = '\n'.join(current_text).strip()
-                current_platform = 'telegram'
-                current_text = []
-            elif current_platform and line:
-                current_text.append(line)
-        
-        # Add the last platform
-        if current_platform:
-            summaries[current_platform] = '\n'.join(current_text).strip()
-        
-        return summaries
-
     def start_scheduler(self):
         """Start the scheduling system"""
+        import schedule
         logger.info("Starting DAO Monitoring LLM scheduler...")
         
         # Schedule daily monitoring at 9 AM
@@ -867,8 +1110,8 @@ def main():
 
 # FastAPI server for handling manual submissions
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
-import uvicorn
 import threading
 
 app = FastAPI(title="TreasureCorp DAO Monitor API")
@@ -904,8 +1147,14 @@ async def get_status():
         "version": "1.0.0"
     }
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Monitor timers, counters and histograms in Prometheus text format"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
 def run_api_server():
     """Run the FastAPI server in a separate thread"""
+    import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8080)
 
 def start_system():
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Versioned schema migrations for dao_monitoring.db
+Every entry point opens the database through connect(), which brings the schema
+to the latest version once per process; PRAGMA user_version records progress.
+
+Usage:
+    python db_migrations.py            # migrate DATABASE_PATH and print the version
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Callable, List, Optional, Set, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+DATABASE_PATH = os.getenv("DATABASE_PATH", "dao_monitoring.db")
+
+_migrated_paths: Set[str] = set()
+_migrate_lock = threading.Lock()
+
+
+def _add_columns(cursor: sqlite3.Cursor, table: str, columns: List[Tuple[str, str]]):
+    """Add columns missing from tables created by older code paths"""
+    existing = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+    for column, definition in columns:
+        if column not in existing:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+def _001_core_tables(cursor: sqlite3.Cursor):
+    """One layout for the tables the monitor, setup script and deployer each used to create"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS monitored_content (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            source TEXT,
+            title TEXT,
+            url TEXT UNIQUE,
+            content_hash TEXT,
+            discovered_at TIMESTAMP,
+            processed_at TIMESTAMP,
+            summary TEXT,
+            posted_twitter BOOLEAN DEFAULT 0,
+            posted_linkedin BOOLEAN DEFAULT 0,
+            posted_telegram BOOLEAN DEFAULT 0
+        )
+    ''')
+    _add_columns(cursor, 'monitored_content', [
+        ('viral_score', 'INTEGER DEFAULT 0'),
+        ('engagement_score', 'INTEGER DEFAULT 0'),
+        ('retweets', 'INTEGER DEFAULT 0'),
+        ('likes', 'INTEGER DEFAULT 0'),
+        ('shares', 'INTEGER DEFAULT 0'),
+        ('engagement_twitter', 'INTEGER DEFAULT 0'),
+        ('engagement_linkedin', 'INTEGER DEFAULT 0'),
+        ('engagement_telegram', 'INTEGER DEFAULT 0')
+    ])
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS dao_proposals (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            dao_name TEXT,
+            proposal_id TEXT,
+            title TEXT,
+            description TEXT,
+            status TEXT,
+            votes_for INTEGER DEFAULT 0,
+            votes_against INTEGER DEFAULT 0,
+            end_date TIMESTAMP,
+            url TEXT UNIQUE,
+            discovered_at TIMESTAMP
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS growth_metrics (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date DATE NOT NULL,
+            platform TEXT NOT NULL,
+            followers INTEGER DEFAULT 0,
+            posts_count INTEGER DEFAULT 0,
+            engagement_rate REAL DEFAULT 0.0,
+            reach INTEGER DEFAULT 0,
+            impressions INTEGER DEFAULT 0
+        )
+    ''')
+    _add_columns(cursor, 'growth_metrics', [
+        ('following', 'INTEGER DEFAULT 0'),
+        ('likes_received', 'INTEGER DEFAULT 0'),
+        ('shares_received', 'INTEGER DEFAULT 0'),
+        ('comments_received', 'INTEGER DEFAULT 0')
+    ])
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS content_performance (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            content_id INTEGER,
+            platform TEXT,
+            post_id TEXT,
+            likes INTEGER DEFAULT 0,
+            shares INTEGER DEFAULT 0,
+            comments INTEGER DEFAULT 0,
+            reach INTEGER DEFAULT 0,
+            posted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (content_id) REFERENCES monitored_content (id)
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS growth_targets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            platform TEXT NOT NULL,
+            target_date DATE NOT NULL,
+            target_followers INTEGER NOT NULL,
+            current_followers INTEGER DEFAULT 0,
+            daily_target REAL NOT NULL,
+            progress_percentage REAL DEFAULT 0.0
+        )
+    ''')
+
+
+def _002_coordination(cursor: sqlite3.Cursor):
+    """Leader lease, event log and command queue shared by API and monitor workers"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS monitor_leases (
+            name TEXT PRIMARY KEY,
+            holder TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS monitor_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            topic TEXT NOT NULL,
+            message_type TEXT,
+            payload TEXT NOT NULL,
+            created_at REAL NOT NULL
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS monitor_commands (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            command TEXT NOT NULL,
+            payload TEXT,
+            status TEXT DEFAULT 'pending',
+            created_at REAL NOT NULL,
+            finished_at REAL
+        )
+    ''')
+
+
+def _003_viral_alerts(cursor: sqlite3.Cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS viral_alerts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            content_title TEXT NOT NULL,
+            viral_score INTEGER NOT NULL,
+            trending_hashtags TEXT,
+            recommended_action TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            acted_upon BOOLEAN DEFAULT 0,
+            result_engagement INTEGER DEFAULT 0
+        )
+    ''')
+    _add_columns(cursor, 'viral_alerts', [
+        ('content_key', 'TEXT'), ('url', 'TEXT'), ('source', 'TEXT'), ('updated_at', 'REAL')
+    ])
+
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_viral_alerts_content_key ON viral_alerts (content_key)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_viral_alerts_score ON viral_alerts (viral_score DESC)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_viral_alerts_updated_at ON viral_alerts (updated_at)")
+
+
+def _004_posting_schedule(cursor: sqlite3.Cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS posting_schedule (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            platform TEXT NOT NULL,
+            scheduled_time TIMESTAMP NOT NULL,
+            content_type TEXT,
+            content TEXT,
+            status TEXT DEFAULT 'pending',
+            posted_at TIMESTAMP,
+            engagement_score INTEGER DEFAULT 0
+        )
+    ''')
+    _add_columns(cursor, 'posting_schedule', [
+        ('priority', 'TEXT'), ('engagement_target', 'TEXT'), ('content_id', 'INTEGER'),
+        ('post_id', 'TEXT'), ('error', 'TEXT')
+    ])
+
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_posting_schedule_slot
+        ON posting_schedule (platform, scheduled_time)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_posting_schedule_status
+        ON posting_schedule (status, scheduled_time)
+    ''')
+
+
+def _005_engagement_store(cursor: sqlite3.Cursor):
+    """Time-series engagement snapshots and incremental ingest state"""
+    _add_columns(cursor, 'content_performance', [('captured_at', 'TIMESTAMP')])
+
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_content_performance_post
+        ON content_performance (platform, post_id, captured_at)
+    ''')
+
+    # Post text and publish time, stored once per post rather than per snapshot
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS social_posts (
+            platform TEXT NOT NULL,
+            post_id TEXT NOT NULL,
+            text TEXT,
+            created_at TIMESTAMP,
+            PRIMARY KEY (platform, post_id)
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS engagement_ingest_state (
+            platform TEXT PRIMARY KEY,
+            since_id TEXT,
+            last_run_at REAL
+        )
+    ''')
+
+
+def _006_hot_query_indexes(cursor: sqlite3.Cursor):
+    """Index the duplicate checks, recency listings and per-platform metric windows"""
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_monitored_content_hash ON monitored_content (content_hash)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_monitored_content_discovered ON monitored_content (discovered_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_dao_proposals_discovered ON dao_proposals (discovered_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_growth_metrics_platform_date ON growth_metrics (platform, date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_monitor_events_created ON monitor_events (created_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_monitor_commands_status ON monitor_commands (status, id)")
+
+
+def _007_content_archive(cursor: sqlite3.Cursor):
+    """Hashes of content moved to archive segments, still consulted for duplicate checks"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS archived_content (
+            content_hash TEXT PRIMARY KEY,
+            url TEXT,
+            archived_at TIMESTAMP,
+            segment TEXT
+        ) WITHOUT ROWID
+    ''')
+
+
+def _008_llm_calls(cursor: sqlite3.Cursor):
+    """Per-call LLM latency, token counts and cost estimates"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS llm_calls (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            created_at REAL NOT NULL,
+            caller TEXT NOT NULL,
+            model TEXT NOT NULL,
+            status TEXT NOT NULL,
+            http_status INTEGER,
+            latency_ms REAL,
+            input_tokens INTEGER DEFAULT 0,
+            output_tokens INTEGER DEFAULT 0,
+            cache_creation_input_tokens INTEGER DEFAULT 0,
+            cache_read_input_tokens INTEGER DEFAULT 0,
+            cost_usd REAL,
+            batch INTEGER DEFAULT 0
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_llm_calls_created ON llm_calls (created_at)")
+
+
+def _009_metrics_snapshots(cursor: sqlite3.Cursor):
+    """Latest metrics registry snapshot of each process, rendered by /metrics in the others"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS metrics_snapshots (
+            process TEXT PRIMARY KEY,
+            updated_at REAL NOT NULL,
+            payload TEXT NOT NULL
+        )
+    ''')
+
+
+def _010_cycle_traces(cursor: sqlite3.Cursor):
+    """Span trees of recent monitoring cycles"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS cycle_traces (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            started_at REAL NOT NULL,
+            duration REAL,
+            busy_seconds REAL,
+            over_budget INTEGER DEFAULT 0,
+            trace TEXT NOT NULL
+        )
+    ''')
+
+
+def _011_pushed_growth_metrics(cursor: sqlite3.Cursor):
+    """Growth metrics last pushed over /ws, the shared base every API worker diffs against"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS pushed_growth_metrics (
+            platform TEXT PRIMARY KEY,
+            snapshot TEXT NOT NULL,
+            updated_at REAL NOT NULL
+        )
+    ''')
+
+
+def _012_command_claims(cursor: sqlite3.Cursor):
+    """Which leader claimed a running command, and when, so a successor can requeue it"""
+    _add_columns(cursor, 'monitor_commands', [
+        ('holder', 'TEXT'), ('claimed_at', 'REAL'), ('attempts', 'INTEGER DEFAULT 0')
+    ])
+
+
+def _013_engagement_backfill(cursor: sqlite3.Cursor):
+    """Resume point of a timeline pass that had more new tweets than one ingest pages through"""
+    _add_columns(cursor, 'engagement_ingest_state', [('until_id', 'TEXT'), ('pending_newest_id', 'TEXT')])
+
+
+# (version, description, migration); append new migrations, never edit applied ones
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Cursor], None]]] = [
+    (1, 'core tables', _001_core_tables),
+    (2, 'monitor coordination', _002_coordination),
+    (3, 'viral alerts', _003_viral_alerts),
+    (4, 'posting schedule', _004_posting_schedule),
+    (5, 'engagement store', _005_engagement_store),
+    (6, 'hot query indexes', _006_hot_query_indexes),
+    (7, 'content archive', _007_content_archive),
+    (8, 'llm call metrics', _008_llm_calls),
+    (9, 'metrics snapshots', _009_metrics_snapshots),
+    (10, 'cycle traces', _010_cycle_traces),
+    (11, 'pushed growth metrics', _011_pushed_growth_metrics),
+    (12, 'command claims', _012_command_claims),
+    (13, 'engagement backfill', _013_engagement_backfill),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def _apply_pragmas(conn: sqlite3.Connection):
+    # WAL lets API workers read while the monitor writes; NORMAL is durable under WAL
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+
+
+def migrate(db_path: Optional[str] = None) -> int:
+    """Apply pending migrations and return the schema version"""
+    db_path = db_path or DATABASE_PATH
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    try:
+        # auto_vacuum can only be switched without a full VACUUM before the first table exists
+        if not conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchone():
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        _apply_pragmas(conn)
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= LATEST_VERSION:
+            return LATEST_VERSION
+
+        # Take the write lock first so concurrently starting workers migrate one at a time
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            cursor = conn.cursor()
+            for number, description, migration in MIGRATIONS:
+                if number > version:
+                    logger.info(f"Applying database migration {number}: {description}")
+                    migration(cursor)
+                    version = number
+            cursor.execute(f"PRAGMA user_version = {version}")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        return version
+    finally:
+        conn.close()
+
+
+def connect(db_path: Optional[str] = None, **kwargs) -> sqlite3.Connection:
+    """Open the monitoring database, migrating it first if this process has not yet"""
+    db_path = db_path or DATABASE_PATH
+    if db_path not in _migrated_paths:
+        with _migrate_lock:
+            if db_path not in _migrated_paths:
+                migrate(db_path)
+                _migrated_paths.add(db_path)
+
+    kwargs.setdefault('timeout', 30)
+    conn = sqlite3.connect(db_path, **kwargs)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    print(f"🗄️ {DATABASE_PATH} at schema version {migrate()}")
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Engagement Analytics
+Loads engagement history into columnar NumPy arrays and computes reports
+(percentiles, rolling rates, hour-of-day and content-type breakdowns, outliers)
+without per-post Python loops
+"""
+
+import sqlite3
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+class EngagementFrame:
+    """Latest metrics per post, one NumPy array per column"""
+
+    def __init__(self, post_ids: np.ndarray, platforms: np.ndarray, texts: np.ndarray,
+                 content_types: np.ndarray, created_at: np.ndarray, likes: np.ndarray,
+                 shares: np.ndarray, comments: np.ndarray, reach: np.ndarray):
+        self.post_ids = post_ids
+        self.platforms = platforms
+        self.texts = texts
+        self.content_types = content_types
+        self.created_at = created_at  # datetime64[s], UTC
+        self.likes = likes
+        self.shares = shares
+        self.comments = comments
+        self.reach = reach
+
+        self.interactions = likes + shares + comments
+        self.engagement_rate = self.interactions / np.maximum(reach, 1) * 100
+
+    def __len__(self):
+        return len(self.post_ids)
+
+    @classmethod
+    def from_db(cls, conn: sqlite3.Connection, platform: Optional[str] = None) -> 'EngagementFrame':
+        """Load the newest content_performance snapshot of every post"""
+        rows = conn.execute('''
+            SELECT cp.post_id, cp.platform, COALESCE(sp.text, ''), COALESCE(ps.content_type, 'unknown'),
+                   COALESCE(sp.created_at, cp.posted_at), cp.likes, cp.shares, cp.comments, cp.reach
+            FROM (
+                SELECT MAX(id) AS id FROM content_performance
+                WHERE (? IS NULL OR platform = ?)
+                GROUP BY platform, post_id
+            ) latest
+            JOIN content_performance cp ON cp.id = latest.id
+            LEFT JOIN social_posts sp ON sp.platform = cp.platform AND sp.post_id = cp.post_id
+            LEFT JOIN posting_schedule ps ON ps.platform = cp.platform AND ps.post_id = cp.post_id
+        ''', (platform, platform)).fetchall()
+
+        if not rows:
+            empty_int = np.zeros(0, dtype=np.int64)
+            return cls(np.array([], dtype=object), np.array([], dtype=object), np.array([], dtype=object),
+                       np.array([], dtype=object), np.array([], dtype='datetime64[s]'),
+                       empty_int, empty_int, empty_int, empty_int)
+
+        post_ids, platforms, texts, content_types, created_at, likes, shares, comments, reach = zip(*rows)
+
+        # Timestamps are stored as ISO strings; the first 19 chars parse as naive UTC seconds
+        created = np.array([(value or '1970-01-01T00:00:00')[:19].replace(' ', 'T') for value in created_at],
+                           dtype='datetime64[s]')
+
+        return cls(
+            np.array(post_ids, dtype=object), np.array(platforms, dtype=object),
+            np.array(texts, dtype=object), np.array(content_types, dtype=object), created,
+            np.array(likes, dtype=np.int64), np.array(shares, dtype=np.int64),
+            np.array(comments, dtype=np.int64), np.array(reach, dtype=np.int64)
+        )
+
+    def average_rate(self) -> float:
+        return float(self.engagement_rate.mean()) if len(self) else 0.0
+
+    def percentiles(self, quantiles=(50, 75, 90, 95, 99)) -> Dict[int, float]:
+        if not len(self):
+            return {q: 0.0 for q in quantiles}
+        values = np.percentile(self.engagement_rate, quantiles)
+        return {q: round(float(v), 2) for q, v in zip(quantiles, values)}
+
+    def outliers(self, factor: float = 1.5) -> np.ndarray:
+        """Indices of posts above factor x the average rate, best first"""
+        if not len(self):
+            return np.zeros(0, dtype=np.int64)
+        indices = np.flatnonzero(self.engagement_rate > self.average_rate() * factor)
+        return indices[np.argsort(-self.engagement_rate[indices])]
+
+    def top(self, n: int = 10) -> np.ndarray:
+        """Indices of the n highest engagement rates, best first"""
+        n = min(n, len(self))
+        if n == 0:
+            return np.zeros(0, dtype=np.int64)
+        indices = np.argpartition(-self.engagement_rate, n - 1)[:n]
+        return indices[np.argsort(-self.engagement_rate[indices])]
+
+    def hour_of_day(self) -> Dict[int, Dict]:
+        """Posts and average rate per UTC publish hour"""
+        hours = (self.created_at.astype(np.int64) // 3600) % 24
+        counts = np.bincount(hours, minlength=24)
+        totals = np.bincount(hours, weights=self.engagement_rate, minlength=24)
+        averages = np.divide(totals, counts, out=np.zeros(24), where=counts > 0)
+        return {
+            hour: {'posts': int(counts[hour]), 'avg_rate': round(float(averages[hour]), 2)}
+            for hour in range(24) if counts[hour]
+        }
+
+    def by_content_type(self) -> Dict[str, Dict]:
+        """Posts and average rate per scheduled content type"""
+        if not len(self):
+            return {}
+        types, inverse = np.unique(self.content_types.astype(str), return_inverse=True)
+        counts = np.bincount(inverse)
+        averages = np.bincount(inverse, weights=self.engagement_rate) / counts
+        return {
+            str(content_type): {'posts': int(count), 'avg_rate': round(float(avg), 2)}
+            for content_type, count, avg in zip(types, counts, averages)
+        }
+
+    def rolling_rate(self, window_days: int = 7) -> List[Dict]:
+        """Daily engagement rate over a trailing window (total interactions / total reach)"""
+        if not len(self):
+            return []
+        days = self.created_at.astype('datetime64[D]').astype(np.int64)
+        first_day = days.min()
+        offsets = days - first_day
+        span = int(offsets.max()) + 1
+
+        interactions = np.bincount(offsets, weights=self.interactions, minlength=span)
+        reach = np.bincount(offsets, weights=self.reach, minlength=span)
+
+        # Windowed sums from cumulative sums: sum[i-w+1..i] = cum[i] - cum[i-w]
+        cum_interactions = np.concatenate(([0.0], np.cumsum(interactions)))
+        cum_reach = np.concatenate(([0.0], np.cumsum(reach)))
+        end = np.arange(1, span + 1)
+        start = np.maximum(end - window_days, 0)
+        window_interactions = cum_interactions[end] - cum_interactions[start]
+        window_reach = cum_reach[end] - cum_reach[start]
+        rates = window_interactions / np.maximum(window_reach, 1) * 100
+
+        dates = (np.arange(span) + first_day).astype('datetime64[D]')
+        return [{'date': str(date), 'rate': round(float(rate), 2)} for date, rate in zip(dates, rates)]
+
+    def post(self, index: int) -> Dict:
+        return {
+            'post_id': self.post_ids[index],
+            'platform': self.platforms[index],
+            'text': self.texts[index],
+            'content_type': self.content_types[index],
+            'created_at': str(self.created_at[index]),
+            'likes': int(self.likes[index]),
+            'retweets': int(self.shares[index]),
+            'replies': int(self.comments[index]),
+            'impressions': int(self.reach[index]),
+            'engagement_rate': round(float(self.engagement_rate[index]), 2)
+        }
+
+    def report(self, outlier_factor: float = 1.5, window_days: int = 7) -> Dict:
+        """Full engagement report"""
+        outliers = self.outliers(outlier_factor)
+        return {
+            'total_posts': len(self),
+            'average_rate': round(self.average_rate(), 2),
+            'percentiles': self.percentiles(),
+            'high_performers': [self.post(i) for i in outliers],
+            'hour_of_day': self.hour_of_day(),
+            'content_types': self.by_content_type(),
+            'rolling_rate': self.rolling_rate(window_days)
+        }
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Engagement Ingestion
+Pulls only new tweets (since_id) plus metric refreshes for a sliding window of
+recent tweets, and stores every reading in content_performance as a time series
+
+since_id only advances once a pass has paged all the way back to it; when there
+are more new tweets than MAX_TIMELINE_PAGES, the next run resumes below the
+oldest tweet fetched (until_id), so no tweet in between is skipped.
+"""
+
+import os
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# @Treasure_Corp user ID
+TWITTER_USER_ID = os.getenv("TWITTER_USER_ID", "1886316341293879296")
+
+# Tweets younger than this keep getting fresh metric snapshots
+REFRESH_WINDOW_HOURS = int(os.getenv("ENGAGEMENT_WINDOW_HOURS", "72"))
+
+# Minimum seconds between API pulls; analytics read the local store in between
+ENGAGEMENT_REFRESH_SECONDS = int(os.getenv("ENGAGEMENT_REFRESH_SECONDS", "900"))
+
+# Page limits of the Twitter API v2 endpoints used here
+MAX_TIMELINE_PAGES = 5
+LOOKUP_BATCH_SIZE = 100
+
+TWEET_FIELDS = ['created_at', 'public_metrics', 'text']
+
+
+class EngagementIngestor:
+    """Incremental Twitter engagement ingestion into the local database"""
+
+    def __init__(self, twitter_api, conn: sqlite3.Connection, user_id: str = TWITTER_USER_ID):
+        self.twitter_api = twitter_api
+        self.conn = conn
+        self.user_id = user_id
+
+    def last_run_at(self) -> float:
+        row = self.conn.execute(
+            "SELECT last_run_at FROM engagement_ingest_state WHERE platform = 'twitter'"
+        ).fetchone()
+        return row[0] if row and row[0] else 0.0
+
+    def is_stale(self) -> bool:
+        return time.time() - self.last_run_at() >= ENGAGEMENT_REFRESH_SECONDS
+
+    def ingest(self) -> int:
+        """Fetch new tweets and refresh the recent window; returns snapshots stored
+
+        Each timeline page is stored together with the pass state in one transaction,
+        so an interrupted run resumes below the last page it stored.
+        """
+        since_id, until_id, pass_newest_id = self._state()
+        stored = 0
+        fresh_ids = set()
+
+        for tweets, meta, exhausted in self._new_tweet_pages(since_id, until_id):
+            # The newest tweet of the whole pass is its first page's newest, seen by the run that started it
+            pass_newest_id = pass_newest_id or meta.get('newest_id')
+            if exhausted or not since_id:
+                # Caught up with since_id (the first run only ever reads one page)
+                state = (pass_newest_id or since_id, None, None)
+            else:
+                until_id = meta.get('oldest_id') or until_id
+                state = (since_id, until_id, pass_newest_id)
+
+            with self.conn:
+                self._store_posts(tweets)
+                stored += self._store_snapshots(tweets)
+                self._save_state(*state)
+            fresh_ids.update(str(tweet.id) for tweet in tweets)
+
+        refreshed = 0
+        for tweets in self._window_metric_batches(exclude=fresh_ids):
+            with self.conn:
+                stored += self._store_snapshots(tweets)
+            refreshed += len(tweets)
+
+        backlog = "" if state[1] is None else f" (older tweets pending below {state[1]})"
+        logger.info(f"Engagement ingest: {len(fresh_ids)} new tweets, {refreshed} refreshed{backlog}")
+        return stored
+
+    def _state(self) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """(since_id, until_id, pending_newest_id) of the current timeline pass"""
+        row = self.conn.execute(
+            "SELECT since_id, until_id, pending_newest_id FROM engagement_ingest_state WHERE platform = 'twitter'"
+        ).fetchone()
+        return tuple(row) if row else (None, None, None)
+
+    def _save_state(self, since_id: Optional[str], until_id: Optional[str], pending_newest_id: Optional[str]):
+        self.conn.execute('''
+            INSERT INTO engagement_ingest_state (platform, since_id, until_id, pending_newest_id, last_run_at)
+            VALUES ('twitter', ?, ?, ?, ?)
+            ON CONFLICT(platform) DO UPDATE SET
+                since_id = excluded.since_id, until_id = excluded.until_id,
+                pending_newest_id = excluded.pending_newest_id, last_run_at = excluded.last_run_at
+        ''', (since_id, until_id, pending_newest_id, time.time()))
+
+    def _new_tweet_pages(self, since_id: Optional[str], until_id: Optional[str]) -> Iterator[Tuple[List, Dict, bool]]:
+        """Timeline pages between since_id and until_id, newest first (first run: the latest page only)
+
+        Yields (tweets, meta, exhausted); exhausted is True on the page that reaches since_id.
+        When the page limit is hit first, no page is marked exhausted.
+        """
+        pagination_token = None
+
+        for _ in range(MAX_TIMELINE_PAGES if since_id else 1):
+            response = self.twitter_api.get_users_tweets(
+                id=self.user_id,
+                since_id=since_id,
+                until_id=until_id,
+                max_results=100,
+                pagination_token=pagination_token,
+                tweet_fields=TWEET_FIELDS,
+                exclude=['retweets', 'replies']
+            )
+            meta = response.meta or {}
+            pagination_token = meta.get('next_token')
+            yield list(response.data or []), meta, not pagination_token
+            if not pagination_token:
+                return
+
+    def _window_metric_batches(self, exclude: set) -> Iterator[List]:
+        """Current metrics for stored tweets still inside the refresh window, one lookup batch at a time"""
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=REFRESH_WINDOW_HOURS)
+        rows = self.conn.execute(
+            "SELECT post_id FROM social_posts WHERE platform = 'twitter' AND created_at >= ?",
+            (cutoff.isoformat(),)
+        ).fetchall()
+        post_ids = [row[0] for row in rows if row[0] not in exclude]
+
+        for start in range(0, len(post_ids), LOOKUP_BATCH_SIZE):
+            response = self.twitter_api.get_tweets(
+                ids=post_ids[start:start + LOOKUP_BATCH_SIZE],
+                tweet_fields=TWEET_FIELDS
+            )
+            yield list(response.data or [])
+
+    def _store_posts(self, tweets: List):
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO social_posts (platform, post_id, text, created_at) VALUES ('twitter', ?, ?, ?)",
+            [(str(tweet.id), tweet.text, tweet.created_at.isoformat() if tweet.created_at else None) for tweet in tweets]
+        )
+
+    def _store_snapshots(self, tweets: List) -> int:
+        """Append one content_performance row per tweet and update scheduled-slot engagement; the caller commits"""
+        captured_at = datetime.now(timezone.utc).isoformat()
+        scheduled = dict(self.conn.execute(
+            "SELECT post_id, content_id FROM posting_schedule WHERE platform = 'twitter' AND post_id IS NOT NULL"
+        ).fetchall())
+        rows = []
+
+        for tweet in tweets:
+            metrics = tweet.public_metrics or {}
+            post_id = str(tweet.id)
+
+            rows.append((
+                scheduled.get(post_id), post_id,
+                metrics.get('like_count', 0), metrics.get('retweet_count', 0),
+                metrics.get('reply_count', 0), metrics.get('impression_count', 0),
+                tweet.created_at.isoformat() if tweet.created_at else None, captured_at
+            ))
+
+            if post_id in scheduled:
+                record_engagement(self.conn, 'twitter', post_id,
+                                  metrics.get('like_count', 0) + metrics.get('retweet_count', 0) + metrics.get('reply_count', 0))
+
+        self.conn.executemany('''
+            INSERT INTO content_performance
+            (content_id, platform, post_id, likes, shares, comments, reach, posted_at, captured_at)
+            VALUES (?, 'twitter', ?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
+        return len(rows)
+
+
+def record_engagement(conn: sqlite3.Connection, platform: str, post_id: str, engagement_score: int):
+    """Store measured engagement against the posting slot that produced `post_id`; the caller commits"""
+    conn.execute(
+        "UPDATE posting_schedule SET engagement_score = ? WHERE platform = ? AND post_id = ?",
+        (engagement_score, platform, post_id)
+    )
+
+
+def latest_engagement(conn: sqlite3.Connection, limit: int = 20, platform: str = 'twitter') -> List[Dict]:
+    """Most recent posts with their latest metrics, best engagement rate first"""
+    rows = conn.execute('''
+        SELECT sp.text, sp.created_at, cp.reach, cp.likes, cp.shares, cp.comments
+        FROM (
+            SELECT post_id, MAX(id) AS id FROM content_performance
+            WHERE platform = ? GROUP BY post_id
+        ) latest
+        JOIN content_performance cp ON cp.id = latest.id
+        JOIN social_posts sp ON sp.platform = cp.platform AND sp.post_id = cp.post_id
+        ORDER BY sp.created_at DESC
+        LIMIT ?
+    ''', (platform, limit)).fetchall()
+
+    engagement_data = []
+    for text, created_at, impressions, likes, retweets, replies in rows:
+        engagement_rate = (likes + retweets + replies) / max(impressions, 1) * 100
+        engagement_data.append({
+            'text': (text or '')[:100] + '...',
+            'created_at': datetime.fromisoformat(created_at) if created_at else None,
+            'impressions': impressions,
+            'likes': likes,
+            'retweets': retweets,
+            'replies': replies,
+            'engagement_rate': round(engagement_rate, 2)
+        })
+
+    engagement_data.sort(key=lambda x: x['engagement_rate'], reverse=True)
+    return engagement_data
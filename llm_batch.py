@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Message Batches
+Offline bulk generation through the Anthropic Message Batches API. Hundreds of
+prompts go out as one asynchronous job (at half the per-token price), the job
+is polled until it ends, and the outputs are written into the content backlog
+(monitored_content) with the day they are meant for, so the posting scheduler
+releases them one day at a time.
+
+Usage:
+    python llm_batch.py educational [--days 7]
+    python llm_batch.py marketing --generator professional [--weeks 4]
+
+Against the local stub (see mock_anthropic.py):
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8787 LLM_BATCH_POLL_SECONDS=1 python llm_batch.py educational
+"""
+
+import argparse
+import asyncio
+import hashlib
+import importlib
+import json
+import os
+import re
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import logging
+
+from llm_gateway import ANTHROPIC_API_URL, LLMGateway, get_gateway, message_params, reply_text
+from post_batch import post_system_prompt
+from post_validator import repair_post, validate_post
+from social_summaries import dump_summaries, parse_summaries, repair_summaries
+from storage_backends import get_storage
+
+logger = logging.getLogger(__name__)
+
+LLM_BATCH_POLL_SECONDS = float(os.getenv("LLM_BATCH_POLL_SECONDS", "60"))
+
+# Requests the API accepts in one batch
+MAX_BATCH_REQUESTS = 100000
+
+# Marketing generators available to the marketing job: name -> (module in Marketing/, class)
+MARKETING_GENERATORS = {
+    'twitter': ('dao_api_twitter', 'TwitterPostGenerator'),
+    'engagement': ('engagement', 'RefinedTweetGenerator'),
+    'professional': ('professional', 'ProfessionalTweetGenerator'),
+    'successful': ('successful', 'EngagementOptimizedGenerator'),
+}
+
+
+async def submit_batch(requests: List[Dict], gateway: Optional[LLMGateway] = None) -> Dict:
+    """Create a batch from {'custom_id', 'params'} requests; returns the batch object"""
+    gateway = gateway or get_gateway()
+    batch = await gateway.request("POST", "/v1/messages/batches", {"requests": requests})
+    logger.info(f"Submitted message batch {batch['id']} with {len(requests)} requests")
+    return batch
+
+
+async def wait_for_batch(batch_id: str, poll_seconds: float = LLM_BATCH_POLL_SECONDS,
+                         gateway: Optional[LLMGateway] = None) -> Dict:
+    """Poll until the batch has ended; returns the final batch object"""
+    gateway = gateway or get_gateway()
+    while True:
+        batch = await gateway.request("GET", f"/v1/messages/batches/{batch_id}")
+        if batch['processing_status'] == 'ended':
+            return batch
+        logger.info(f"Batch {batch_id} {batch['processing_status']}: {batch.get('request_counts')}")
+        await asyncio.sleep(poll_seconds)
+
+
+async def batch_results(batch: Dict, gateway: Optional[LLMGateway] = None,
+                        caller: str = "batch") -> Dict[str, Optional[str]]:
+    """custom_id -> reply text, None for requests that errored, were canceled or expired"""
+    gateway = gateway or get_gateway()
+    body = await gateway.request("GET", batch['results_url'], as_json=False)
+
+    results = {}
+    for line in body.splitlines():
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        result = entry['result']
+        if result['type'] == 'succeeded':
+            gateway.usage.record(result['message'])
+            gateway.metrics.record(caller, result['message'].get('model') or 'unknown', None,
+                                   result['message'].get('usage'), batch=True)
+            results[entry['custom_id']] = reply_text(result['message'])
+        else:
+            logger.warning(f"Batch request {entry['custom_id']} {result['type']}: {result.get('error')}")
+            gateway.metrics.record(caller, 'unknown', None, status=result['type'], batch=True)
+            results[entry['custom_id']] = None
+    return results
+
+
+async def run_batch(requests: List[Dict], gateway: Optional[LLMGateway] = None,
+                    poll_seconds: float = LLM_BATCH_POLL_SECONDS, caller: str = "batch") -> Dict[str, Optional[str]]:
+    """Submit, wait for and collect `requests`, split into as many batches as the API limit needs"""
+    results = {}
+    for start in range(0, len(requests), MAX_BATCH_REQUESTS):
+        batch = await submit_batch(requests[start:start + MAX_BATCH_REQUESTS], gateway)
+        batch = await wait_for_batch(batch['id'], poll_seconds, gateway)
+        results.update(await batch_results(batch, gateway, caller))
+    return results
+
+
+async def generate_educational_backlog(days: int = 7) -> int:
+    """Summarize every educational template for the next `days` days in one batch; returns rows stored"""
+    from dao_monitoring_llm import SUMMARY_MODEL, SUMMARY_SYSTEM_PROMPT, DAOMonitoringLLM
+    monitor = DAOMonitoringLLM()
+    storage = get_storage()
+
+    items = [item for item in monitor.educational_backlog(days) if not await storage.content_exists(item.fingerprint)]
+    if not items:
+        logger.info("Educational backlog already generated")
+        return 0
+
+    # Prefilling "{" makes each reply continue as the JSON object
+    replies = await run_batch([
+        {'custom_id': item.fingerprint,
+         'params': message_params(monitor._summary_prompt(item, item.snippet), SUMMARY_MODEL, 600,
+                                  prefill="{", system=SUMMARY_SYSTEM_PROMPT)}
+        for item in items
+    ], caller="batch.educational")
+
+    stored = 0
+    for item in items:
+        reply = replies.get(item.fingerprint)
+        # No per-field re-asks offline: fields the local repair cannot fix are dropped
+        summaries = repair_summaries(parse_summaries("{" + reply)) if reply else {}
+        if not summaries:
+            logger.warning(f"No usable summary for {item.title!r}")
+            continue
+        if await storage.insert_content(item.source, item.title, item.url, item.fingerprint,
+                                        dump_summaries(summaries), discovered_at=item.published):
+            stored += 1
+    return stored
+
+
+def load_marketing_generator(name: str):
+    """Instantiate one of the Marketing/ post generators"""
+    module_name, class_name = MARKETING_GENERATORS[name]
+    marketing_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Marketing')
+    if marketing_dir not in sys.path:
+        sys.path.insert(0, marketing_dir)
+    return getattr(importlib.import_module(module_name), class_name)(os.getenv("ANTHROPIC_API_KEY"))
+
+
+async def generate_marketing_backlog(name: str, weeks: int = 1) -> int:
+    """Generate `weeks` of a Marketing generator's daily themes in one batch; returns rows stored"""
+    generator = load_marketing_generator(name)
+    if get_gateway().base_url != ANTHROPIC_API_URL:
+        # Replies from a stub (mock_anthropic.py) must not land in the real duplicate history
+        generator.post_history_file = os.path.join(tempfile.mkdtemp(), "post_history.json")
+    storage = get_storage()
+    midnight = datetime.combine(datetime.now().date(), datetime.min.time())
+
+    slots = []
+    for offset in range(weeks * len(generator.weekly_themes)):
+        day = midnight + timedelta(days=offset)
+        theme = generator.weekly_themes[offset % len(generator.weekly_themes)]
+        title = f"{theme} - {day:%Y-%m-%d}"
+        if not await storage.content_exists(hashlib.md5(title.encode()).hexdigest()):
+            slots.append((f"{name}-{day:%Y%m%d}", day, theme, title))
+
+    replies = await run_batch([
+        {'custom_id': custom_id,
+         'params': message_params(generator.build_prompt(theme), generator.model, 300,
+                                  system=post_system_prompt(generator))}
+        for custom_id, _, theme, _ in slots
+    ], caller=f"batch.{type(generator).__name__}")
+
+    stored = 0
+    for custom_id, day, theme, title in slots:
+        post = repair_post(replies[custom_id].strip()) if replies.get(custom_id) else None
+        # Dropped posts are simply missing from the backlog; the next run regenerates those days
+        if not post or validate_post(post) or generator.is_duplicate(post):
+            logger.warning(f"Dropped batch post for {title!r}")
+            continue
+        generator.add_to_history(post)
+        anchor = re.sub(r'[^a-z0-9]+', '-', theme.lower()).strip('-')
+        if await storage.insert_content(f"TreasureCorp Marketing ({name})", title,
+                                        f"https://treasure-corp.com/insights#{anchor}-{day:%Y%m%d}",
+                                        hashlib.md5(title.encode()).hexdigest(),
+                                        dump_summaries({'twitter': post}), discovered_at=day):
+            stored += 1
+    return stored
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Bulk content generation through the Message Batches API")
+    jobs = parser.add_subparsers(dest='job', required=True)
+    educational = jobs.add_parser('educational', help="educational fallback backlog")
+    educational.add_argument('--days', type=int, default=7)
+    marketing = jobs.add_parser('marketing', help="Marketing generator weekly themes")
+    marketing.add_argument('--generator', choices=sorted(MARKETING_GENERATORS), required=True)
+    marketing.add_argument('--weeks', type=int, default=1)
+    args = parser.parse_args()
+
+    try:
+        if args.job == 'educational':
+            stored = await generate_educational_backlog(args.days)
+        else:
+            stored = await generate_marketing_backlog(args.generator, args.weeks)
+        print(f"📦 Stored {stored} batch-generated posts in the content backlog")
+        print(f"📈 Token usage: {get_gateway().usage.summary()}")
+    finally:
+        await get_gateway().close()
+        await get_storage().close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    asyncio.run(main())
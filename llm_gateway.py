@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+LLM Gateway
+Single path to the Anthropic Messages API for the monitor, the marketing agent
+and the Marketing generators: pooled keep-alive HTTP connections, retries with
+jittered exponential backoff and a cap on concurrent requests
+
+Configuration:
+    ANTHROPIC_API_KEY
+    ANTHROPIC_BASE_URL=https://api.anthropic.com
+    LLM_MAX_CONCURRENCY=8      (in-flight requests per event loop)
+    LLM_MAX_RETRIES=4
+    LLM_TIMEOUT_SECONDS=60
+    LLM_METRICS_ENABLED=true   (per-call metrics in llm_calls, see llm_metrics.py)
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
+import logging
+
+from llm_metrics import LLMMetricsRecorder, get_metrics_recorder
+
+# aiohttp is imported on first request so importing the gateway stays cheap
+if TYPE_CHECKING:
+    import aiohttp
+
+logger = logging.getLogger(__name__)
+
+ANTHROPIC_API_URL = "https://api.anthropic.com"
+ANTHROPIC_BASE_URL = os.getenv("ANTHROPIC_BASE_URL", ANTHROPIC_API_URL).rstrip('/')
+ANTHROPIC_VERSION = "2023-06-01"
+DEFAULT_MODEL = "claude-3-5-sonnet-20241022"
+
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+
+# Keep-alive connections held open per event loop
+LLM_POOL_SIZE = 16
+
+# Statuses worth retrying: timeouts, conflicts, rate limits, server errors and overload (529)
+RETRYABLE_STATUSES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+# Backoff before retry n is uniform in [0, min(cap, base * 2**n)] seconds
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_CAP_SECONDS = 30.0
+
+
+class LLMError(Exception):
+    """Raised when a request fails for good (non-retryable status or retries exhausted)"""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+def message_params(prompt: str, model: str = DEFAULT_MODEL, max_tokens: int = 1000, prefill: str = "",
+                   system: Optional[Union[str, List[Dict]]] = None, **params) -> Dict:
+    """Messages API request body for a single user prompt"""
+    messages = [{"role": "user", "content": prompt}]
+    if prefill:
+        messages.append({"role": "assistant", "content": prefill})
+
+    body = {"model": model, "max_tokens": max_tokens, "messages": messages, **params}
+    if system:
+        body["system"] = system
+    return body
+
+
+def reply_text(message: Dict) -> str:
+    """Text of a Messages API response"""
+    if not message.get("content"):
+        raise LLMError("Empty response from API")
+    return message["content"][0]["text"]
+
+
+class UsageStats:
+    """Token counters across the responses a gateway has seen"""
+
+    FIELDS = ('input_tokens', 'output_tokens', 'cache_creation_input_tokens', 'cache_read_input_tokens')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.totals = dict.fromkeys(self.FIELDS, 0)
+
+    def record(self, message: Dict):
+        usage = message.get("usage") or {}
+        with self._lock:
+            self.requests += 1
+            for field in self.FIELDS:
+                self.totals[field] += usage.get(field) or 0
+
+    def cache_hit_rate(self) -> float:
+        """Share of prompt tokens served from the prompt cache"""
+        prompt_tokens = (self.totals['input_tokens'] + self.totals['cache_creation_input_tokens']
+                         + self.totals['cache_read_input_tokens'])
+        return self.totals['cache_read_input_tokens'] / prompt_tokens if prompt_tokens else 0.0
+
+    def summary(self) -> Dict:
+        with self._lock:
+            return {'requests': self.requests, **self.totals, 'cache_hit_rate': round(self.cache_hit_rate(), 3)}
+
+
+class LLMGateway:
+    """Pooled Anthropic Messages API client
+
+    An aiohttp session belongs to the event loop that created it, so one session
+    (and one concurrency semaphore) is kept per running loop. Synchronous callers
+    share a background loop through the *_sync methods.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, base_url: str = ANTHROPIC_BASE_URL,
+                 max_concurrency: int = LLM_MAX_CONCURRENCY, max_retries: int = LLM_MAX_RETRIES,
+                 timeout: float = LLM_TIMEOUT_SECONDS):
+        self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self._sessions: Dict[asyncio.AbstractEventLoop, Tuple['aiohttp.ClientSession', asyncio.Semaphore]] = {}
+        self._sync_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.usage = UsageStats()
+        self.metrics: LLMMetricsRecorder = get_metrics_recorder()
+        self._sync_lock = threading.Lock()
+
+    def _session(self) -> Tuple['aiohttp.ClientSession', asyncio.Semaphore]:
+        import aiohttp
+        loop = asyncio.get_running_loop()
+        entry = self._sessions.get(loop)
+        if entry is None or entry[0].closed:
+            # Forget sessions of loops that have finished
+            self._sessions = {other: e for other, e in self._sessions.items() if not other.is_closed()}
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=LLM_POOL_SIZE, keepalive_timeout=60, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={
+                    "x-api-key": self.api_key or "",
+                    "anthropic-version": ANTHROPIC_VERSION,
+                    "content-type": "application/json",
+                },
+            )
+            entry = (session, asyncio.Semaphore(self.max_concurrency))
+            self._sessions[loop] = entry
+        return entry
+
+    async def request(self, method: str, path: str, body: Optional[Dict] = None, as_json: bool = True):
+        """Call an API path (or absolute URL) with retries; returns the decoded JSON, or text when as_json=False"""
+        import aiohttp
+        session, semaphore = self._session()
+        url = path if path.startswith('http') else f"{self.base_url}{path}"
+
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                async with semaphore:
+                    async with session.request(method, url, json=body) as response:
+                        if response.status == 200:
+                            return await response.json(content_type=None) if as_json else await response.text()
+                        error = await response.text()
+                        if response.status not in RETRYABLE_STATUSES:
+                            raise LLMError(f"Anthropic API error {response.status}: {error[:500]}", response.status)
+                        retry_after = response.headers.get("retry-after")
+                        failure = LLMError(f"Anthropic API error {response.status}: {error[:200]}", response.status)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                failure = LLMError(f"Anthropic API request failed: {e!r}")
+
+            if attempt == self.max_retries:
+                raise failure
+            delay = self._backoff(attempt, retry_after)
+            logger.warning(f"{failure}; retrying in {delay:.1f}s ({attempt + 1}/{self.max_retries})")
+            await asyncio.sleep(delay)
+
+    async def _send_message(self, body: Dict, caller: str) -> Dict:
+        """POST /v1/messages, recording usage, latency and cost under `caller`"""
+        started = time.perf_counter()
+        try:
+            message = await self.request("POST", "/v1/messages", body)
+        except LLMError as e:
+            self.metrics.record(caller, body["model"], time.perf_counter() - started,
+                                status='error', http_status=e.status)
+            raise
+        self.metrics.record(caller, body["model"], time.perf_counter() - started, message.get("usage"))
+        self.usage.record(message)
+        return message
+
+    async def create_message(self, messages: List[Dict], model: str = DEFAULT_MODEL, max_tokens: int = 1000,
+                             system: Optional[Union[str, List[Dict]]] = None, caller: str = "unknown",
+                             **params) -> Dict:
+        """POST /v1/messages and return the response body"""
+        body = {"model": model, "max_tokens": max_tokens, "messages": messages, **params}
+        if system:
+            body["system"] = system
+        return await self._send_message(body, caller)
+
+    @staticmethod
+    def _backoff(attempt: int, retry_after: Optional[str]) -> float:
+        """Full-jitter exponential backoff, never shorter than the server's retry-after"""
+        delay = random.uniform(0, min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+        try:
+            return max(delay, float(retry_after)) if retry_after else delay
+        except ValueError:
+            return delay
+
+    async def complete(self, prompt: str, model: str = DEFAULT_MODEL, max_tokens: int = 1000,
+                       prefill: str = "", system: Optional[Union[str, List[Dict]]] = None, caller: str = "unknown",
+                       **params) -> str:
+        """Text of the reply to a single user prompt (continuing `prefill` when given)
+
+        `caller` names the feature making the call in the llm_calls metrics.
+        """
+        message = await self._send_message(message_params(prompt, model, max_tokens, prefill, system, **params), caller)
+        return reply_text(message)
+
+    def _run_sync(self, coroutine):
+        with self._sync_lock:
+            if self._sync_loop is None:
+                self._sync_loop = asyncio.new_event_loop()
+                threading.Thread(target=self._sync_loop.run_forever, name="llm-gateway", daemon=True).start()
+        return asyncio.run_coroutine_threadsafe(coroutine, self._sync_loop).result()
+
+    def create_message_sync(self, messages: List[Dict], **kwargs) -> Dict:
+        return self._run_sync(self.create_message(messages, **kwargs))
+
+    def complete_sync(self, prompt: str, **kwargs) -> str:
+        """Blocking complete() for scripts; requests still share the gateway's pooled session"""
+        return self._run_sync(self.complete(prompt, **kwargs))
+
+    async def close(self):
+        """Close the session of the running loop"""
+        entry = self._sessions.pop(asyncio.get_running_loop(), None)
+        if entry is not None:
+            await entry[0].close()
+
+
+_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway(api_key: Optional[str] = None) -> LLMGateway:
+    """Process-wide gateway; `api_key` (e.g. typed in by a script) is used when the environment has none"""
+    global _gateway
+    if _gateway is None:
+        with _gateway_lock:
+            if _gateway is None:
+                _gateway = LLMGateway()
+    if api_key and not _gateway.api_key:
+        _gateway.api_key = api_key
+    return _gateway
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    reply = get_gateway().complete_sync("Reply with one short sentence about DAO treasuries.", max_tokens=100)
+    print(f"🤖 {reply}")
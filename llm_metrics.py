@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+LLM Call Metrics
+Per-call latency, token counts and estimated cost for every request the LLM
+gateway makes, tagged with the calling feature and the model. Calls are
+buffered in memory and written to the llm_calls table in batches; the mobile
+backend serves the aggregated view at /api/llm/metrics.
+
+Usage:
+    python llm_metrics.py [--days 7]     # print spend and latency by caller and model
+"""
+
+import argparse
+import atexit
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from db_migrations import connect
+
+logger = logging.getLogger(__name__)
+
+LLM_METRICS_ENABLED = os.getenv("LLM_METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Buffered calls are written once this many are pending or the oldest is this old
+METRICS_FLUSH_ROWS = 20
+METRICS_FLUSH_SECONDS = 30.0
+
+# USD per million (input, output) tokens by model family; cache writes cost 1.25x input, reads 0.1x
+MODEL_PRICES = {
+    'claude-3-opus': (15.0, 75.0),
+    'claude-3-7-sonnet': (3.0, 15.0),
+    'claude-3-5-sonnet': (3.0, 15.0),
+    'claude-3-sonnet': (3.0, 15.0),
+    'claude-3-5-haiku': (0.8, 4.0),
+    'claude-3-haiku': (0.25, 1.25),
+}
+CACHE_WRITE_MULTIPLIER = 1.25
+CACHE_READ_MULTIPLIER = 0.1
+
+# Message Batches are billed at half price
+BATCH_DISCOUNT = 0.5
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS = (0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0)
+LATENCY_LABELS = [f"le_{bound:g}s" for bound in LATENCY_BUCKETS] + [f"gt_{LATENCY_BUCKETS[-1]:g}s"]
+
+TOKEN_FIELDS = ('input_tokens', 'output_tokens', 'cache_creation_input_tokens', 'cache_read_input_tokens')
+
+
+def model_prices(model: str) -> Optional[Tuple[float, float]]:
+    """(input, output) USD per million tokens for `model`, None for models without a known price"""
+    family = max((name for name in MODEL_PRICES if model.startswith(name)), key=len, default=None)
+    return MODEL_PRICES[family] if family else None
+
+
+def estimate_cost(model: str, usage: Dict, batch: bool = False) -> Optional[float]:
+    """Estimated USD cost of one response's usage"""
+    prices = model_prices(model)
+    if prices is None:
+        return None
+    input_price, output_price = prices
+    cost = ((usage.get('input_tokens') or 0) * input_price
+            + (usage.get('cache_creation_input_tokens') or 0) * input_price * CACHE_WRITE_MULTIPLIER
+            + (usage.get('cache_read_input_tokens') or 0) * input_price * CACHE_READ_MULTIPLIER
+            + (usage.get('output_tokens') or 0) * output_price) / 1_000_000
+    return cost * BATCH_DISCOUNT if batch else cost
+
+
+def _percentile(values: List[float], quantile: float) -> Optional[float]:
+    """Nearest-rank percentile of sorted `values`"""
+    if not values:
+        return None
+    return values[min(len(values) - 1, max(0, int(round(quantile / 100 * len(values))) - 1))]
+
+
+class LLMMetricsRecorder:
+    """Buffers call records and writes them to llm_calls in batches"""
+
+    def __init__(self, db_path: Optional[str] = None, enabled: bool = LLM_METRICS_ENABLED):
+        self.db_path = db_path
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._pending: List[Tuple] = []
+        self._oldest: Optional[float] = None
+
+    def record(self, caller: str, model: str, latency: Optional[float], usage: Optional[Dict] = None,
+               status: str = 'ok', http_status: Optional[int] = None, batch: bool = False):
+        """Record one call; latency in seconds (None for batch results), usage from the response"""
+        if not self.enabled:
+            return
+        usage = usage or {}
+        now = time.time()
+        row = (now, caller, model, status, http_status,
+               round(latency * 1000, 1) if latency is not None else None,
+               *(usage.get(field) or 0 for field in TOKEN_FIELDS),
+               estimate_cost(model, usage, batch), int(batch))
+
+        with self._lock:
+            self._pending.append(row)
+            if self._oldest is None:
+                self._oldest = now
+            due = len(self._pending) >= METRICS_FLUSH_ROWS or now - self._oldest >= METRICS_FLUSH_SECONDS
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Write pending records; failures are logged and the records dropped"""
+        with self._lock:
+            rows, self._pending, self._oldest = self._pending, [], None
+        if not rows:
+            return
+        try:
+            conn = connect(self.db_path)
+            try:
+                with conn:
+                    conn.executemany('''
+                        INSERT INTO llm_calls
+                        (created_at, caller, model, status, http_status, latency_ms, input_tokens, output_tokens,
+                         cache_creation_input_tokens, cache_read_input_tokens, cost_usd, batch)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ''', rows)
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.error(f"Error writing {len(rows)} LLM call metrics: {e}")
+
+
+_recorder: Optional[LLMMetricsRecorder] = None
+_recorder_lock = threading.Lock()
+
+
+def get_metrics_recorder() -> LLMMetricsRecorder:
+    """Process-wide recorder, flushed at exit"""
+    global _recorder
+    if _recorder is None:
+        with _recorder_lock:
+            if _recorder is None:
+                _recorder = LLMMetricsRecorder()
+                atexit.register(_recorder.flush)
+    return _recorder
+
+
+def llm_metrics_summary(days: int = 7, db_path: Optional[str] = None) -> Dict:
+    """Calls, tokens, cost and latency over the last `days` days, by caller and model"""
+    get_metrics_recorder().flush()
+    since = time.time() - days * 86400
+    conn = connect(db_path)
+    try:
+        rows = conn.execute('''
+            SELECT caller, model, status, latency_ms, input_tokens, output_tokens,
+                   cache_creation_input_tokens, cache_read_input_tokens, cost_usd
+            FROM llm_calls WHERE created_at >= ?
+        ''', (since,)).fetchall()
+    finally:
+        conn.close()
+
+    groups: Dict[Tuple[str, str], Dict] = defaultdict(lambda: {
+        'calls': 0, 'errors': 0, **dict.fromkeys(TOKEN_FIELDS, 0), 'cost_usd': 0.0, 'latencies': []
+    })
+    for caller, model, status, latency_ms, *tokens, cost in rows:
+        group = groups[(caller, model)]
+        group['calls'] += 1
+        group['errors'] += status != 'ok'
+        for field, count in zip(TOKEN_FIELDS, tokens):
+            group[field] += count
+        group['cost_usd'] += cost or 0.0
+        if latency_ms is not None:
+            group['latencies'].append(latency_ms / 1000)
+
+    breakdown = []
+    for (caller, model), group in groups.items():
+        latencies = sorted(group.pop('latencies'))
+        histogram = dict.fromkeys(LATENCY_LABELS, 0)
+        for latency in latencies:
+            histogram[LATENCY_LABELS[bisect_left(LATENCY_BUCKETS, latency)]] += 1
+        breakdown.append({
+            'caller': caller,
+            'model': model,
+            **group,
+            'cost_usd': round(group['cost_usd'], 4),
+            'latency_p50': _percentile(latencies, 50),
+            'latency_p95': _percentile(latencies, 95),
+            'latency_max': latencies[-1] if latencies else None,
+            'latency_histogram': histogram,
+        })
+    breakdown.sort(key=lambda group: group['cost_usd'], reverse=True)
+
+    return {
+        'days': days,
+        'calls': sum(group['calls'] for group in breakdown),
+        'cost_usd': round(sum(group['cost_usd'] for group in breakdown), 4),
+        'by_caller': breakdown,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LLM spend and latency by caller and model")
+    parser.add_argument('--days', type=int, default=7)
+    args = parser.parse_args()
+    summary = llm_metrics_summary(args.days)
+    print(f"💸 {summary['calls']} LLM calls, ~${summary['cost_usd']:.2f} over {args.days} days")
+    print(json.dumps(summary['by_caller'], indent=2))
@@ -4,7 +4,6 @@ TreasureCorp Marketing AI Agent
 Powered by Anthropic Claude API
 """
 
-import anthropic
 import tweepy
 import requests
 import schedule
@@ -13,12 +12,12 @@ import os
 from datetime import datetime
 import json
 
+from llm_gateway import get_gateway
+
 class TreasureCorpMarketingAgent:
     def __init__(self):
-        # API Keys (set as environment variables)
-        self.claude_client = anthropic.Anthropic(
-            api_key=os.getenv("ANTHROPIC_API_KEY")
-        )
+        # Claude requests go through the shared gateway (ANTHROPIC_API_KEY from the environment)
+        self.llm = get_gateway()
         
         # Twitter API (optional)
         self.twitter_api = self.setup_twitter()
@@ -104,17 +103,13 @@ class TreasureCorpMarketingAgent:
         }
         
         try:
-            response = self.claude_client.messages.create(
+            return self.llm.complete_sync(
+                prompts[content_type],
                 model="claude-3-haiku-20240307",
                 max_tokens=500,
-                messages=[{
-                    "role": "user",
-                    "content": prompts[content_type]
-                }]
+                caller=f"marketing_agent.{content_type}"
             )
             
-            return response.content[0].text
-            
         except Exception as e:
             print(f"Error generating content: {e}")
             return None
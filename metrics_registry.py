@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Process Metrics Registry
+Low-overhead counters and histograms for the monitor's hot paths, rendered in
+the Prometheus text exposition format at /metrics on both FastAPI apps.
+
+The monitor usually runs in its own worker process, so MonitorService publishes
+a snapshot of its registry to the shared database; /metrics renders the local
+registry plus the snapshots of other processes, each under a `process` label.
+"""
+
+import functools
+import inspect
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import logging
+
+from cycle_trace import span
+from db_migrations import connect
+
+logger = logging.getLogger(__name__)
+
+PROCESS_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+# Snapshots of processes that stopped publishing are dropped after this long
+METRICS_SNAPSHOT_MAX_AGE_SECONDS = 86400
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _label_text(names: Tuple[str, ...], values: LabelValues, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Counter:
+    """Monotonic count per label combination"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = tuple(str(labels[name]) for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(str(labels[name]) for name in self.labels), 0)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {'kind': self.kind, 'help': self.help, 'labels': list(self.labels),
+                    'samples': [[list(key), value] for key, value in self._values.items()]}
+
+
+class Histogram:
+    """Bucketed observations (cumulative on render) plus sum and count per label combination"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[LabelValues, List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str):
+        key = tuple(str(labels[name]) for name in self.labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                # [per-bucket counts (last is +Inf), sum]
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: str) -> int:
+        entry = self._values.get(tuple(str(labels[name]) for name in self.labels))
+        return sum(entry[0]) if entry else 0
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {'kind': self.kind, 'help': self.help, 'labels': list(self.labels),
+                    'buckets': list(self.buckets),
+                    'samples': [[list(key), [list(counts), total]] for key, (counts, total) in self._values.items()]}
+
+
+def _render_metric(name: str, snapshots: List[Tuple[Optional[str], Dict]]) -> List[str]:
+    """Exposition lines for one metric across processes; `process` is None for the local registry"""
+    first = snapshots[0][1]
+    lines = [f"# HELP {name} {first['help']}", f"# TYPE {name} {first['kind']}"]
+    for process, snapshot in snapshots:
+        names = tuple(snapshot['labels'])
+        extra = f'process="{_escape(process)}"' if process else ''
+        for values, sample in snapshot['samples']:
+            values = tuple(values)
+            if snapshot['kind'] == 'counter':
+                lines.append(f"{name}{_label_text(names, values, extra)} {sample:g}")
+                continue
+            counts, total = sample
+            cumulative = 0
+            for bound, count in zip([f"{b:g}" for b in snapshot['buckets']] + ['+Inf'], counts):
+                cumulative += count
+                bucket_labels = ','.join(filter(None, [extra, f'le="{bound}"']))
+                lines.append(f"{name}_bucket{_label_text(names, values, bucket_labels)} {cumulative}")
+            lines.append(f"{name}_sum{_label_text(names, values, extra)} {total:.6f}")
+            lines.append(f"{name}_count{_label_text(names, values, extra)} {cumulative}")
+    return lines
+
+
+class MetricsRegistry:
+    """Named metrics of this process"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help: str, labels: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labels, buckets))
+
+    def snapshot(self) -> Dict[str, Dict]:
+        return {name: metric.snapshot() for name, metric in list(self._metrics.items())}
+
+    def publish(self, db_path: Optional[str] = None):
+        """Store this process's snapshot for /metrics in other processes"""
+        conn = connect(db_path)
+        try:
+            with conn:
+                conn.execute('''
+                    INSERT INTO metrics_snapshots (process, updated_at, payload) VALUES (?, ?, ?)
+                    ON CONFLICT(process) DO UPDATE SET updated_at = excluded.updated_at, payload = excluded.payload
+                ''', (PROCESS_ID, time.time(), json.dumps(self.snapshot())))
+                conn.execute("DELETE FROM metrics_snapshots WHERE updated_at < ?",
+                             (time.time() - METRICS_SNAPSHOT_MAX_AGE_SECONDS,))
+        finally:
+            conn.close()
+
+    def render(self, db_path: Optional[str] = None) -> str:
+        """Text exposition of the local registry and the snapshots other processes published"""
+        by_metric: Dict[str, List[Tuple[Optional[str], Dict]]] = {}
+        for name, snapshot in self.snapshot().items():
+            by_metric.setdefault(name, []).append((None, snapshot))
+
+        try:
+            conn = connect(db_path)
+            try:
+                rows = conn.execute(
+                    "SELECT process, payload FROM metrics_snapshots WHERE process != ? AND updated_at >= ?",
+                    (PROCESS_ID, time.time() - METRICS_SNAPSHOT_MAX_AGE_SECONDS)
+                ).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.error(f"Error reading published metrics: {e}")
+            rows = []
+
+        for process, payload in rows:
+            for name, snapshot in json.loads(payload).items():
+                by_metric.setdefault(name, []).append((process, snapshot))
+
+        lines = []
+        for name in sorted(by_metric):
+            lines.extend(_render_metric(name, by_metric[name]))
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+# Duration, failures and output size of the monitor's hot-path steps
+STEP_SECONDS = REGISTRY.histogram('treasurecorp_monitor_step_seconds', 'Duration of monitor steps', ('step',))
+STEP_ERRORS = REGISTRY.counter('treasurecorp_monitor_step_errors_total', 'Monitor steps that raised', ('step',))
+STEP_ITEMS = REGISTRY.counter('treasurecorp_monitor_step_items_total', 'Items returned by monitor steps', ('step',))
+
+# Per-source fetches; error rate is fetch errors over the fetch histogram's count
+FETCH_SECONDS = REGISTRY.histogram('treasurecorp_source_fetch_seconds', 'Latency of source fetches',
+                                   ('source_type', 'source'), (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0))
+FETCH_ERRORS = REGISTRY.counter('treasurecorp_source_fetch_errors_total', 'Source fetches that failed',
+                                ('source_type', 'source'))
+
+POSTS = REGISTRY.counter('treasurecorp_posts_total', 'Social media post attempts', ('platform', 'result'))
+
+
+def timed(step: str) -> Callable:
+    """Decorator recording a (sync or async) step's duration, exceptions and returned item count
+
+    The step is also a span of the current cycle trace.
+    """
+    def record(started: float, result=None, failed: bool = False):
+        STEP_SECONDS.observe(time.perf_counter() - started, step=step)
+        if failed:
+            STEP_ERRORS.inc(step=step)
+        elif isinstance(result, (list, dict)):
+            STEP_ITEMS.inc(len(result), step=step)
+
+    def decorator(function: Callable) -> Callable:
+        if inspect.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def async_wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    with span(step):
+                        result = await function(*args, **kwargs)
+                except Exception:
+                    record(started, failed=True)
+                    raise
+                record(started, result)
+                return result
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                with span(step):
+                    result = function(*args, **kwargs)
+            except Exception:
+                record(started, failed=True)
+                raise
+            record(started, result)
+            return result
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def fetch_timer(source_type: str, source: str) -> Iterator[None]:
+    """Time one fetch from `source` (also a cycle trace span); an exception counts as a fetch error"""
+    started = time.perf_counter()
+    try:
+        with span('fetch', source_type=source_type, source=source):
+            yield
+    except Exception:
+        FETCH_ERRORS.inc(source_type=source_type, source=source)
+        raise
+    finally:
+        FETCH_SECONDS.observe(time.perf_counter() - started, source_type=source_type, source=source)
+
+
+def fetch_failed(source_type: str, source: str):
+    """Count a fetch that returned without raising but failed (e.g. a non-200 status)"""
+    FETCH_ERRORS.inc(source_type=source_type, source=source)
@@ -4,22 +4,36 @@ TreasureCorp Commander - Mobile App Backend API
 FastAPI backend that ties all components together
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, WebSocket, WebSocketDisconnect
+# Imported first so the boot clock covers every other import
+from startup_profile import check_startup_budget
+
+from fastapi import FastAPI, HTTPException, Depends, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set
 import asyncio
 import json
-import sqlite3
 from datetime import datetime, timedelta
 import logging
 import os
 from contextlib import asynccontextmanager
 
 # Import our existing modules
-from dao_monitoring_llm import DAOMonitoringLLM
 from aggressive_growth_config import AggressiveGrowthConfig
+from db_migrations import connect, migrate
+from storage_backends import get_storage
+from llm_gateway import get_gateway
+from llm_metrics import llm_metrics_summary
+from metrics_registry import REGISTRY
+from cycle_trace import CycleTraceLog
+from social_summaries import preview
+from monitor_coordination import MonitorEventLog, MonitorCommandQueue
+from monitor_worker import MonitorService
+from viral_alerts import ViralAlertBoard
+from posting_scheduler import load_day_slots
+from posting_time_optimizer import attach_optimizer
 from growth_strategy_config import GrowthStrategyConfig
 
 # Configure logging
@@ -27,23 +41,66 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Global instances
-dao_monitor = None
 growth_config = None
+monitor_events = None
+monitor_commands = None
+viral_board = None
 active_connections: List[WebSocket] = []
 
+# "embedded": API workers also compete for the monitor leader lease
+# "external": monitoring runs only in monitor_worker.py; API workers just read shared state
+MONITOR_MODE = os.getenv("MONITOR_MODE", "embedded")
+
+# How often each API worker checks the shared event log for monitor events
+EVENT_POLL_SECONDS = 0.5
+
+# WebSocket topics and the message type pushed for each monitor event
+WS_TOPICS = {
+    'content': 'new_content',
+    'proposals': 'new_proposal',
+    'posting': 'post_result',
+    'metrics': 'growth_update',
+    'monitoring': 'monitoring_complete',
+    'viral': 'viral_alert'
+}
+WS_HEARTBEAT_SECONDS = 30
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    global dao_monitor, growth_config
-    dao_monitor = DAOMonitoringLLM()
+    global growth_config, monitor_events, monitor_commands, viral_board
+    migrate()
     growth_config = AggressiveGrowthConfig()
+    monitor_events = MonitorEventLog()
+    monitor_commands = MonitorCommandQueue()
+    
+    # Top viral alerts live in memory; the relay keeps them current from monitor events
+    viral_board = ViralAlertBoard()
+    conn = get_db_connection()
+    try:
+        viral_board.load_recent(conn)
+    finally:
+        conn.close()
+    
+    # Refuse to serve from a second host sharing the Postgres database
+    await get_storage().open()
+    
+    # Every API worker relays monitor events to its own WebSocket clients
+    tasks = [asyncio.create_task(relay_monitor_events())]
     
-    # Start background monitoring
-    asyncio.create_task(background_monitoring())
+    # Start background monitoring (only the lease holder actually runs cycles)
+    if MONITOR_MODE == "embedded":
+        tasks.append(asyncio.create_task(background_monitoring()))
+    
+    check_startup_budget("TreasureCorp Commander API")
     
     yield
     
     # Shutdown
+    for task in tasks:
+        task.cancel()
+    await get_storage().close()
+    await get_gateway().close()
     logger.info("Shutting down TreasureCorp Commander API")
 
 app = FastAPI(
@@ -90,7 +147,7 @@ class PostRequest(BaseModel):
     schedule_time: Optional[datetime] = None
 
 class ViralAlert(BaseModel):
-    content_id: int
+    alert_id: int
     title: str
     viral_score: int
     trending_hashtags: List[str]
@@ -99,7 +156,7 @@ class ViralAlert(BaseModel):
 # Database helper
 def get_db_connection():
     """Get database connection"""
-    return sqlite3.connect('dao_monitoring.db')
+    return connect()
 
 # Authentication dependency
 async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
@@ -112,22 +169,57 @@ async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(secur
 # WebSocket connection manager
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        # Each connection maps to the set of topics it is subscribed to
+        self.active_connections: Dict[WebSocket, Set[str]] = {}
+        # monitor_events id of the last relayed event, identical on every API worker
+        self.sequence = 0
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        # New connections receive every topic until they narrow their subscription
+        self.active_connections[websocket] = set(WS_TOPICS)
         logger.info(f"WebSocket connected: {len(self.active_connections)} active connections")
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
-        logger.info(f"WebSocket disconnected: {len(self.active_connections)} active connections")
+        if self.active_connections.pop(websocket, None) is not None:
+            logger.info(f"WebSocket disconnected: {len(self.active_connections)} active connections")
+
+    def subscribe(self, websocket: WebSocket, topics: List[str]) -> Set[str]:
+        subscriptions = self.active_connections.setdefault(websocket, set())
+        subscriptions.update(topic for topic in topics if topic in WS_TOPICS)
+        return subscriptions
+
+    def unsubscribe(self, websocket: WebSocket, topics: List[str]) -> Set[str]:
+        subscriptions = self.active_connections.setdefault(websocket, set())
+        subscriptions.difference_update(topics)
+        return subscriptions
 
     async def send_personal_message(self, message: str, websocket: WebSocket):
         await websocket.send_text(message)
 
+    async def publish(self, event_id: int, topic: str, data: Dict[str, Any], message_type: Optional[str] = None):
+        """Push a logged monitor event to every connection subscribed to the topic"""
+        self.sequence = event_id
+        message = json.dumps({
+            "type": message_type or WS_TOPICS[topic],
+            "topic": topic,
+            "seq": self.sequence,
+            "timestamp": datetime.now().isoformat(),
+            "data": data
+        }, default=str)
+        
+        subscribers = [ws for ws, topics in self.active_connections.items() if topic in topics]
+        results = await asyncio.gather(
+            *(ws.send_text(message) for ws in subscribers),
+            return_exceptions=True
+        )
+        for websocket, result in zip(subscribers, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error publishing {topic} message: {result}")
+                self.disconnect(websocket)
+
     async def broadcast(self, message: str):
-        for connection in self.active_connections:
+        for connection in list(self.active_connections):
             try:
                 await connection.send_text(message)
             except Exception as e:
@@ -147,45 +239,42 @@ async def root():
         "timestamp": datetime.now().isoformat()
     }
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Monitor timers, counters and histograms in Prometheus text format (this process and the monitor worker)"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+async def collect_growth_metrics() -> List[GrowthMetrics]:
+    """Compute current growth metrics for every platform"""
+    storage = get_storage()
+    
+    # Get follower counts (mock data for demo)
+    platforms = ['twitter', 'linkedin', 'telegram']
+    metrics = []
+    
+    for platform in platforms:
+        followers, active_days, avg_engagement = await storage.growth_summary(platform, days=7)
+        
+        # Calculate target progress
+        target = growth_config.follower_targets.get(platform, 1000)
+        progress = (followers / target) * 100 if target > 0 else 0
+        
+        metrics.append(GrowthMetrics(
+            platform=platform,
+            followers=followers,
+            daily_growth=int(followers / max(active_days, 1)),
+            posts_count=growth_config.posting_strategies[platform]['posts_per_day'],
+            engagement_rate=avg_engagement or 0.0,
+            target_progress=min(progress, 100.0)
+        ))
+    
+    return metrics
+
 @app.get("/api/dashboard/metrics", response_model=List[GrowthMetrics])
 async def get_dashboard_metrics(credentials: HTTPAuthorizationCredentials = Depends(verify_token)):
     """Get real-time growth metrics for mobile dashboard"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Get follower counts (mock data for demo)
-        platforms = ['twitter', 'linkedin', 'telegram']
-        metrics = []
-        
-        for platform in platforms:
-            cursor.execute('''
-                SELECT 
-                    COALESCE(MAX(followers), 0) as followers,
-                    COUNT(DISTINCT DATE(date)) as active_days,
-                    COALESCE(AVG(engagement_rate), 0.0) as avg_engagement
-                FROM growth_metrics 
-                WHERE platform = ? AND date >= date('now', '-7 days')
-            ''', (platform,))
-            
-            result = cursor.fetchone()
-            followers = result[0] if result else 0
-            
-            # Calculate target progress
-            target = growth_config.follower_targets.get(platform, 1000)
-            progress = (followers / target) * 100 if target > 0 else 0
-            
-            metrics.append(GrowthMetrics(
-                platform=platform,
-                followers=followers,
-                daily_growth=int(followers / max(result[1], 1)) if result else 0,
-                posts_count=growth_config.posting_strategies[platform]['posts_per_day'],
-                engagement_rate=result[2] if result and result[2] else 0.0,
-                target_progress=min(progress, 100.0)
-            ))
-        
-        conn.close()
-        return metrics
+        return await collect_growth_metrics()
         
     except Exception as e:
         logger.error(f"Error fetching dashboard metrics: {e}")
@@ -199,36 +288,18 @@ async def get_recent_content(
 ):
     """Get recent content items for mobile app"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        query = '''
-            SELECT id, title, summary, 'multi' as platform, 
-                   CASE WHEN posted_twitter OR posted_linkedin OR posted_telegram 
-                        THEN 'posted' ELSE 'pending' END as status,
-                   engagement_score, discovered_at
-            FROM monitored_content 
-            ORDER BY discovered_at DESC 
-            LIMIT ?
-        '''
-        
-        cursor.execute(query, (limit,))
-        rows = cursor.fetchall()
-        
-        content_items = []
-        for row in rows:
-            content_items.append(ContentItem(
-                id=row[0],
-                title=row[1],
-                summary=row[2][:200] + "..." if len(row[2]) > 200 else row[2],
-                platform=row[3],
-                status=row[4],
-                engagement_score=row[5] or 0,
-                created_at=datetime.fromisoformat(row[6])
-            ))
-        
-        conn.close()
-        return content_items
+        return [
+            ContentItem(
+                id=row['id'],
+                title=row['title'],
+                summary=preview(row['summary'], 200),
+                platform='multi',
+                status=row['status'],
+                engagement_score=row['engagement_score'],
+                created_at=row['discovered_at']
+            )
+            for row in await get_storage().recent_content(limit)
+        ]
         
     except Exception as e:
         logger.error(f"Error fetching recent content: {e}")
@@ -237,21 +308,22 @@ async def get_recent_content(
 @app.post("/api/content/post")
 async def create_post(
     post_request: PostRequest,
-    background_tasks: BackgroundTasks,
     credentials: HTTPAuthorizationCredentials = Depends(verify_token)
 ):
     """Create and schedule a new post"""
     try:
-        # Add to background task queue
-        background_tasks.add_task(process_manual_post, post_request)
+        # Hand the post to the active monitor through the shared command queue
+        monitor_commands.enqueue('manual_post', {
+            "platform": post_request.platform,
+            "content": post_request.content,
+            "image_url": post_request.image_url
+        })
         
-        # Broadcast to connected mobile apps
-        await manager.broadcast(json.dumps({
-            "type": "post_created",
+        # Notify mobile apps on every API worker subscribed to posting updates
+        monitor_events.append('posting', {
             "platform": post_request.platform,
-            "content": post_request.content[:100] + "...",
-            "timestamp": datetime.now().isoformat()
-        }))
+            "content": post_request.content[:100] + "..."
+        }, message_type="post_created")
         
         return {
             "status": "success",
@@ -264,29 +336,23 @@ async def create_post(
         raise HTTPException(status_code=500, detail="Failed to create post")
 
 @app.get("/api/viral/alerts", response_model=List[ViralAlert])
-async def get_viral_alerts(credentials: HTTPAuthorizationCredentials = Depends(verify_token)):
+async def get_viral_alerts(
+    limit: int = 10,
+    credentials: HTTPAuthorizationCredentials = Depends(verify_token)
+):
     """Get trending content and viral opportunities"""
     try:
-        # Mock viral alerts - integrate with real trend analysis
-        alerts = [
+        return [
             ViralAlert(
-                content_id=1,
-                title="Major DAO Treasury Hack Detected",
-                viral_score=95,
-                trending_hashtags=["#DAOHack", "#TreasuryDrain", "#DeFiSecurity"],
-                recommended_action="Create breaking news thread immediately"
-            ),
-            ViralAlert(
-                content_id=2,
-                title="New Governance Proposal Going Viral",
-                viral_score=88,
-                trending_hashtags=["#DAOGovernance", "#Voting", "#Community"],
-                recommended_action="Share analysis and predictions"
+                alert_id=alert['alert_id'],
+                title=alert['title'],
+                viral_score=alert['viral_score'],
+                trending_hashtags=alert['trending_hashtags'],
+                recommended_action=alert['recommended_action']
             )
+            for alert in viral_board.top(min(max(limit, 1), 50))
         ]
         
-        return alerts
-        
     except Exception as e:
         logger.error(f"Error fetching viral alerts: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch viral alerts")
@@ -301,14 +367,34 @@ async def get_posting_schedule(
         target_date = datetime.fromisoformat(date) if date else datetime.now()
         day_of_week = target_date.weekday()
         
+        # Slots the posting scheduler has materialized are reported as stored, so
+        # slots that ran before the optimizer moved a time keep their outcome; fold
+        # any newly ingested engagement into the posting-time curves on the way
+        conn = get_db_connection()
+        try:
+            if growth_config.time_optimizer is None:
+                # Built on the first schedule request so numpy stays out of the cold start
+                attach_optimizer(growth_config, conn)
+            else:
+                growth_config.time_optimizer.refresh(conn)
+            materialized = load_day_slots(conn, target_date.date())
+        finally:
+            conn.close()
+        
         schedule = {}
         for platform in ['twitter', 'linkedin', 'telegram']:
+            if platform in materialized:
+                schedule[platform] = materialized[platform]
+                continue
             platform_schedule = growth_config.get_daily_aggressive_schedule(platform, day_of_week)
+            for slot in platform_schedule:
+                slot['status'] = 'unscheduled'
             schedule[platform] = platform_schedule
         
         return {
             "date": target_date.date().isoformat(),
             "total_posts": sum(len(s) for s in schedule.values()),
+            "optimizer_version": growth_config.time_optimizer.version,
             "schedule": schedule
         }
         
@@ -318,12 +404,11 @@ async def get_posting_schedule(
 
 @app.post("/api/monitoring/start")
 async def start_monitoring(
-    background_tasks: BackgroundTasks,
     credentials: HTTPAuthorizationCredentials = Depends(verify_token)
 ):
     """Start the monitoring process manually"""
     try:
-        background_tasks.add_task(dao_monitor.daily_monitoring_cycle)
+        monitor_commands.enqueue('run_cycle')
         
         return {
             "status": "success",
@@ -335,10 +420,24 @@ async def start_monitoring(
         logger.error(f"Error starting monitoring: {e}")
         raise HTTPException(status_code=500, detail="Failed to start monitoring")
 
+@app.get("/api/monitoring/traces")
+async def get_cycle_traces(
+    limit: int = 10,
+    slow_only: bool = False,
+    credentials: HTTPAuthorizationCredentials = Depends(verify_token)
+):
+    """Span trees of the most recent monitoring cycles (newest first)"""
+    try:
+        return CycleTraceLog().recent(min(max(limit, 1), 50), slow_only)
+        
+    except Exception as e:
+        logger.error(f"Error fetching cycle traces: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch cycle traces")
+
 @app.get("/api/analytics/competitors")
 async def get_competitor_analysis(credentials: HTTPAuthorizationCredentials = Depends(verify_token)):
     """Get competitor analysis data"""
-    competitors = growth_config.get_competitive_analysis_targets()
+    competitors = GrowthStrategyConfig().get_competitive_analysis_targets()
     
     # Mock competitor data - integrate with real social media APIs
     analysis = {
@@ -363,68 +462,146 @@ async def get_competitor_analysis(credentials: HTTPAuthorizationCredentials = De
     
     return analysis
 
+@app.get("/api/llm/metrics")
+async def get_llm_metrics(
+    days: int = 7,
+    credentials: HTTPAuthorizationCredentials = Depends(verify_token)
+):
+    """LLM calls, tokens, estimated cost and latency histograms by caller and model"""
+    try:
+        return llm_metrics_summary(min(max(days, 1), 90))
+        
+    except Exception as e:
+        logger.error(f"Error fetching LLM metrics: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch LLM metrics")
+
 # WebSocket endpoint for real-time updates
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
+    """Topic-subscription push channel.
+
+    Clients send {"action": "subscribe" | "unsubscribe", "topics": [...]} to choose
+    which of WS_TOPICS they receive; a heartbeat is sent whenever the channel is idle.
+    """
     await manager.connect(websocket)
     try:
+        await websocket.send_text(json.dumps({
+            "type": "welcome",
+            "topics": sorted(manager.active_connections[websocket]),
+            "available_topics": sorted(WS_TOPICS),
+            "seq": manager.sequence
+        }))
+        await send_metrics_snapshot(websocket)
+        
         while True:
-            # Keep connection alive and send periodic updates
-            await asyncio.sleep(30)
-            await websocket.send_text(json.dumps({
-                "type": "heartbeat",
-                "timestamp": datetime.now().isoformat(),
-                "active_connections": len(manager.active_connections)
-            }))
+            try:
+                raw_message = await asyncio.wait_for(websocket.receive_text(), timeout=WS_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                await websocket.send_text(json.dumps({
+                    "type": "heartbeat",
+                    "timestamp": datetime.now().isoformat(),
+                    "active_connections": len(manager.active_connections)
+                }))
+                continue
+            
+            await handle_client_message(websocket, raw_message)
     except WebSocketDisconnect:
+        pass
+    finally:
+        # Any failure, not just a clean disconnect, must drop the connection from every topic
         manager.disconnect(websocket)
 
-# Background tasks
-async def background_monitoring():
-    """Continuous background monitoring"""
+async def handle_client_message(websocket: WebSocket, raw_message: str):
+    """Apply a subscription change requested by a client"""
+    try:
+        message = json.loads(raw_message)
+        action = message.get("action")
+        topics = message.get("topics", [])
+    except (ValueError, AttributeError):
+        await websocket.send_text(json.dumps({"type": "error", "message": "Invalid JSON message"}))
+        return
+    
+    if action == "subscribe":
+        subscriptions = manager.subscribe(websocket, topics)
+        if 'metrics' in topics:
+            await send_metrics_snapshot(websocket)
+    elif action == "unsubscribe":
+        subscriptions = manager.unsubscribe(websocket, topics)
+    elif action == "ping":
+        await websocket.send_text(json.dumps({"type": "pong", "seq": manager.sequence}))
+        return
+    else:
+        await websocket.send_text(json.dumps({"type": "error", "message": f"Unknown action: {action}"}))
+        return
+    
+    await websocket.send_text(json.dumps({"type": "subscribed", "topics": sorted(subscriptions)}))
+
+async def send_metrics_snapshot(websocket: WebSocket):
+    """Send the full metrics state once so later growth_update diffs can be applied"""
+    if 'metrics' not in manager.active_connections.get(websocket, set()):
+        return
+    
+    try:
+        snapshot = {m.platform: m.model_dump() for m in await collect_growth_metrics()}
+    except Exception as e:
+        logger.error(f"Error building metrics snapshot: {e}")
+        return
+    
+    await websocket.send_text(json.dumps({
+        "type": "growth_update",
+        "topic": "metrics",
+        "seq": manager.sequence,
+        "timestamp": datetime.now().isoformat(),
+        "data": {"snapshot": True, "metrics": snapshot}
+    }))
+
+async def relay_monitor_events():
+    """Tail the shared event log and push new monitor events to subscribed clients"""
+    last_event_id = manager.sequence = monitor_events.latest_id()
+    
     while True:
         try:
-            logger.info("Running background monitoring cycle...")
-            await dao_monitor.daily_monitoring_cycle()
-            
-            # Broadcast update to mobile apps
-            await manager.broadcast(json.dumps({
-                "type": "monitoring_complete",
-                "timestamp": datetime.now().isoformat(),
-                "message": "New content discovered and processed"
-            }))
-            
-            # Wait 1 hour before next cycle (aggressive monitoring)
-            await asyncio.sleep(3600)
+            events = monitor_events.read_since(last_event_id)
+            for event_id, topic, message_type, payload in events:
+                last_event_id = event_id
+                if topic == 'viral':
+                    viral_board.upsert(payload)
+                if topic in WS_TOPICS:
+                    await manager.publish(event_id, topic, payload, message_type)
+                
+                # Cycles and posts are what move the growth metrics
+                if topic in ('monitoring', 'posting') and message_type != 'post_created':
+                    await publish_metric_deltas()
             
+            if not events:
+                await asyncio.sleep(EVENT_POLL_SECONDS)
+                
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
-            logger.error(f"Error in background monitoring: {e}")
-            await asyncio.sleep(300)  # Wait 5 minutes on error
+            logger.error(f"Error relaying monitor events: {e}")
+            await asyncio.sleep(5)
 
-async def process_manual_post(post_request: PostRequest):
-    """Process a manual post request"""
+async def publish_metric_deltas():
+    """Log the growth metric fields that changed since the last push; the relay delivers them"""
     try:
-        # Generate platform-specific content
-        summaries = {post_request.platform: post_request.content}
-        
-        # Create mock content item
-        content_item = {
-            'title': 'Manual Post',
-            'source': 'mobile_app',
-            'url': '',
-            'type': 'manual'
-        }
-        
-        # Generate images if needed
-        images = dao_monitor.generate_social_images(content_item)
-        
-        # Post to social media
-        await dao_monitor.post_to_social_media(content_item, summaries, images)
-        
-        logger.info(f"Manual post processed for {post_request.platform}")
-        
+        metrics = await collect_growth_metrics()
+        monitor_events.append_metric_deltas({metric.platform: metric.model_dump() for metric in metrics})
     except Exception as e:
-        logger.error(f"Error processing manual post: {e}")
+        logger.error(f"Error computing metric deltas: {e}")
+
+# Background tasks
+async def background_monitoring():
+    """Continuous background monitoring in embedded mode, guarded by the leader lease"""
+    service = MonitorService()
+    while True:
+        try:
+            await service.run()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error in background monitoring: {e}")
+            await asyncio.sleep(300)  # Wait 5 minutes on error
 
 # Error handlers
 @app.exception_handler(404)
@@ -39,7 +39,7 @@ interface GrowthMetric {
 }
 
 interface ViralAlert {
-  content_id: number;
+  alert_id: number;
   title: string;
   viral_score: number;
   trending_hashtags: string[];
@@ -101,16 +101,26 @@ const DashboardScreen: React.FC = () => {
     setRefreshing(false);
   };
 
-  const handleGrowthUpdate = (data: any) => {
-    console.log('Growth update received:', data);
-    loadDashboardData(); // Refresh metrics
+  const handleGrowthUpdate = (message: any) => {
+    // Server pushes a full snapshot on subscribe, then per-platform field diffs
+    const { snapshot, metrics: changes } = message.data;
+    setMetrics(prev => {
+      const byPlatform: Record<string, GrowthMetric> = snapshot
+        ? {}
+        : Object.fromEntries(prev.map(metric => [metric.platform, metric]));
+      Object.entries(changes as Record<string, Partial<GrowthMetric>>).forEach(([platform, fields]) => {
+        byPlatform[platform] = { ...byPlatform[platform], ...fields, platform } as GrowthMetric;
+      });
+      return Object.values(byPlatform);
+    });
   };
 
-  const handleViralAlert = (data: ViralAlert) => {
+  const handleViralAlert = (message: any) => {
+    const data: ViralAlert = message.data;
     console.log('Viral alert received:', data);
     
-    // Add to viral alerts
-    setViralAlerts(prev => [data, ...prev]);
+    // Add to viral alerts (re-scored items replace their earlier alert)
+    setViralAlerts(prev => [data, ...prev.filter(alert => alert.alert_id !== data.alert_id)]);
     
     // Show push notification style alert
     Alert.alert(
@@ -301,7 +311,7 @@ const DashboardScreen: React.FC = () => {
             <Title style={styles.cardTitle}>🚨 Viral Opportunities</Title>
             {viralAlerts.slice(0, 3).map((alert) => (
               <List.Item
-                key={alert.content_id}
+                key={alert.alert_id}
                 title={alert.title}
                 description={`Viral Score: ${alert.viral_score}/100`}
                 left={() => (
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Mock Anthropic API
+Local stand-in for the Messages and Message Batches endpoints so the LLM gateway
+and bulk generation can be exercised without an API key. Replies are made up
+deterministically from the prompt; prefilled "{" requests get a JSON summary.
+
+Usage:
+    python mock_anthropic.py [--port 8787] [--batch-seconds 5]
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8787 python llm_batch.py educational
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import time
+import uuid
+from typing import Dict
+
+from aiohttp import web
+
+_WORDS = (
+    "treasury runway stablecoin diversification governance delegate multisig liquidity yield "
+    "dashboard allocation reserves proposal quorum participation voters emissions grants "
+    "contributors rebalancing volatility analytics transparency reporting onchain protocol "
+    "incentives budget spending audit risk exposure benchmark metrics signals insight"
+).split()
+
+
+def _mock_text(prompt: str, words: int = 16) -> str:
+    """Varied but reproducible post text for `prompt`"""
+    rng = random.Random(hashlib.md5(prompt.encode()).hexdigest())
+    body = ' '.join(rng.sample(_WORDS, words)).capitalize()
+    return f"📊 {body}. @Treasure_Corp #DAO #Treasury"
+
+
+# Cached system prefixes seen so far; like the API, prefixes under the minimum are never cached
+_prompt_cache = set()
+PROMPT_CACHE_MIN_TOKENS = 1024
+
+
+def _system_usage(system) -> Dict:
+    """Usage fields for the system prompt, simulating prompt caching of cache_control blocks"""
+    if not system:
+        return {"input_tokens": 0, "cache_creation_input_tokens": 0, "cache_read_input_tokens": 0}
+    blocks = [{"type": "text", "text": system}] if isinstance(system, str) else system
+    tokens = sum(len(block["text"]) for block in blocks) // 4
+    if not any(block.get("cache_control") for block in blocks) or tokens < PROMPT_CACHE_MIN_TOKENS:
+        return {"input_tokens": tokens, "cache_creation_input_tokens": 0, "cache_read_input_tokens": 0}
+
+    key = hashlib.md5(json.dumps(blocks, sort_keys=True).encode()).hexdigest()
+    if key in _prompt_cache:
+        return {"input_tokens": 0, "cache_creation_input_tokens": 0, "cache_read_input_tokens": tokens}
+    _prompt_cache.add(key)
+    return {"input_tokens": 0, "cache_creation_input_tokens": tokens, "cache_read_input_tokens": 0}
+
+
+def mock_message(params: Dict) -> Dict:
+    """Messages API response for a request body"""
+    prompt = json.dumps(params.get("messages", []), sort_keys=True)
+    prefill = params["messages"][-1]["content"] if params["messages"][-1]["role"] == "assistant" else ""
+    if prefill == "{":
+        text = json.dumps({"twitter": _mock_text(prompt), "telegram": _mock_text(prompt + "telegram", 30)})[1:]
+    else:
+        text = _mock_text(prompt)
+    usage = _system_usage(params.get("system"))
+
+    return {
+        "id": f"msg_{uuid.uuid4().hex[:24]}",
+        "type": "message",
+        "role": "assistant",
+        "model": params.get("model"),
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn",
+        "usage": {**usage, "input_tokens": usage["input_tokens"] + len(prompt) // 4, "output_tokens": len(text) // 4},
+    }
+
+
+def create_app(batch_seconds: float = 5.0) -> web.Application:
+    """aiohttp app serving /v1/messages and /v1/messages/batches; batches end after `batch_seconds`"""
+    batches: Dict[str, Dict] = {}
+
+    def batch_view(request: web.Request, batch: Dict) -> Dict:
+        ended = time.time() - batch['created'] >= batch_seconds
+        count = len(batch['requests'])
+        return {
+            "id": batch['id'],
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {"processing": 0 if ended else count, "succeeded": count if ended else 0,
+                               "errored": 0, "canceled": 0, "expired": 0},
+            "results_url": f"{request.scheme}://{request.host}/v1/messages/batches/{batch['id']}/results" if ended else None,
+        }
+
+    async def messages(request: web.Request):
+        return web.json_response(mock_message(await request.json()))
+
+    async def create_batch(request: web.Request):
+        body = await request.json()
+        batch = {'id': f"msgbatch_{uuid.uuid4().hex[:24]}", 'created': time.time(), 'requests': body['requests']}
+        batches[batch['id']] = batch
+        return web.json_response(batch_view(request, batch))
+
+    async def get_batch(request: web.Request):
+        batch = batches.get(request.match_info['batch_id'])
+        if batch is None:
+            return web.json_response({"type": "error", "error": {"type": "not_found_error"}}, status=404)
+        return web.json_response(batch_view(request, batch))
+
+    async def batch_results(request: web.Request):
+        batch = batches.get(request.match_info['batch_id'])
+        if batch is None or batch_view(request, batch)['processing_status'] != 'ended':
+            return web.json_response({"type": "error", "error": {"type": "not_found_error"}}, status=404)
+        lines = [
+            json.dumps({"custom_id": entry['custom_id'],
+                        "result": {"type": "succeeded", "message": mock_message(entry['params'])}})
+            for entry in batch['requests']
+        ]
+        return web.Response(text='\n'.join(lines) + '\n', content_type='application/x-jsonl')
+
+    app = web.Application(client_max_size=256 * 1024 * 1024)
+    app.router.add_post('/v1/messages', messages)
+    app.router.add_post('/v1/messages/batches', create_batch)
+    app.router.add_get('/v1/messages/batches/{batch_id}', get_batch)
+    app.router.add_get('/v1/messages/batches/{batch_id}/results', batch_results)
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local mock of the Anthropic Messages and Batches API")
+    parser.add_argument('--port', type=int, default=8787)
+    parser.add_argument('--batch-seconds', type=float, default=5.0)
+    args = parser.parse_args()
+    print(f"🧪 Mock Anthropic API on http://127.0.0.1:{args.port} (batches end after {args.batch_seconds}s)")
+    web.run_app(create_app(args.batch_seconds), host='127.0.0.1', port=args.port, print=None)
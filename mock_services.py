@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Mock External Services
+One local server standing in for every external API the monitor talks to, so
+DAOMonitoringLLM and mobile_app_backend can be load- and soak-tested without
+real accounts:
+
+    Anthropic   /v1/messages, /v1/messages/batches (see mock_anthropic.py)
+    Twitter v2  POST /2/tweets, GET /2/tweets, GET /2/users/{id}/tweets, GET /2/users/me
+    Telegram    /bot{token}/getMe, /bot{token}/sendMessage, /bot{token}/sendPhoto
+    Snapshot    POST /graphql (proposals query)
+
+Latency, server errors and 429s are injected per service from the environment.
+Every setting can be given for all services (MOCK_<SETTING>) or overridden for
+one (MOCK_<SERVICE>_<SETTING>, e.g. MOCK_TWITTER_RATE_LIMIT_PER_MINUTE):
+
+    LATENCY_MS              added to every response (default 0)
+    JITTER_MS               uniform extra latency on top (default 0)
+    ERROR_RATE              fraction answered with the service's 5xx (default 0)
+    RATE_LIMIT_PER_MINUTE   fixed-window request limit, 429 beyond it (default 0: off)
+    THROTTLE_RATE           fraction answered with 429 regardless of the window (default 0)
+
+MOCK_SEED makes the injected failures reproducible. Counters per service are
+served at GET /mock/stats.
+
+Usage:
+    python mock_services.py [--port 8787] [--batch-seconds 5]
+    MOCK_LATENCY_MS=150 MOCK_ANTHROPIC_ERROR_RATE=0.05 MOCK_TWITTER_RATE_LIMIT_PER_MINUTE=50 python mock_services.py
+
+    # point the monitor at it
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8787 TWITTER_API_BASE_URL=http://127.0.0.1:8787 \\
+    TELEGRAM_API_BASE_URL=http://127.0.0.1:8787 SNAPSHOT_GRAPHQL_URL=http://127.0.0.1:8787/graphql \\
+    python monitor_worker.py
+"""
+
+import argparse
+import asyncio
+import hashlib
+import math
+import os
+import random
+import re
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from aiohttp import web
+
+from mock_anthropic import _mock_text, create_app as create_anthropic_app
+
+SERVICES = ('anthropic', 'twitter', 'telegram', 'snapshot')
+
+# Timeline the Twitter mock starts with, so engagement ingestion has something to read
+SEED_TWEETS = int(os.getenv("MOCK_TWITTER_SEED_TWEETS", "20"))
+MOCK_TWITTER_USER_ID = os.getenv("TWITTER_USER_ID", "1886316341293879296")
+TWEET_MAX_LENGTH = 280
+
+_PROPOSAL_TOPICS = (
+    "Treasury diversification into stablecoins", "Renew the grants council budget",
+    "Set a 24-month runway policy", "Rotate treasury multisig signers",
+    "Fund a delegate compensation pilot", "Deploy idle reserves into low-risk yield",
+)
+
+
+def _setting(service: str, name: str, default: float = 0.0) -> float:
+    value = os.getenv(f"MOCK_{service.upper()}_{name}", os.getenv(f"MOCK_{name}"))
+    return float(value) if value not in (None, '') else default
+
+
+class ServiceBehaviour:
+    """Injected latency, server errors and rate limiting of one mocked service"""
+
+    def __init__(self, service: str, rng: random.Random):
+        self.service = service
+        self.rng = rng
+        self.latency = _setting(service, 'LATENCY_MS') / 1000
+        self.jitter = _setting(service, 'JITTER_MS') / 1000
+        self.error_rate = _setting(service, 'ERROR_RATE')
+        self.rate_limit = int(_setting(service, 'RATE_LIMIT_PER_MINUTE'))
+        self.throttle_rate = _setting(service, 'THROTTLE_RATE')
+        self.window_started = time.time()
+        self.window_requests = 0
+        self.stats = {'requests': 0, 'errors': 0, 'throttled': 0}
+
+    def retry_after(self) -> int:
+        """Seconds until the current rate-limit window resets (1 for random throttling)"""
+        if not self.rate_limit or self.window_requests <= self.rate_limit:
+            return 1
+        return max(1, math.ceil(self.window_started + 60 - time.time()))
+
+    async def apply(self) -> Optional[str]:
+        """Wait out the configured latency; returns 'throttled', 'error' or None to serve normally"""
+        self.stats['requests'] += 1
+        delay = self.latency + (self.rng.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            await asyncio.sleep(delay)
+
+        now = time.time()
+        if now - self.window_started >= 60:
+            self.window_started = now
+            self.window_requests = 0
+        self.window_requests += 1
+
+        if (self.rate_limit and self.window_requests > self.rate_limit) or self.rng.random() < self.throttle_rate:
+            self.stats['throttled'] += 1
+            return 'throttled'
+        if self.rng.random() < self.error_rate:
+            self.stats['errors'] += 1
+            return 'error'
+        return None
+
+
+def _service_for(path: str) -> Optional[str]:
+    if path.startswith('/v1/'):
+        return 'anthropic'
+    if path.startswith('/2/'):
+        return 'twitter'
+    if path.startswith('/bot'):
+        return 'telegram'
+    if path == '/graphql':
+        return 'snapshot'
+    return None
+
+
+def _throttled_response(service: str, behaviour: ServiceBehaviour) -> web.Response:
+    """429 in the shape (body and headers) the real service uses"""
+    retry_after = behaviour.retry_after()
+    reset_at = int(time.time()) + retry_after
+    if service == 'anthropic':
+        return web.json_response(
+            {"type": "error", "error": {"type": "rate_limit_error",
+                                        "message": "Number of requests has exceeded your rate limit"}},
+            status=429, headers={
+                'retry-after': str(retry_after),
+                'anthropic-ratelimit-requests-limit': str(behaviour.rate_limit),
+                'anthropic-ratelimit-requests-remaining': '0',
+                'anthropic-ratelimit-requests-reset': datetime.fromtimestamp(reset_at, timezone.utc).isoformat(),
+            })
+    if service == 'twitter':
+        return web.json_response(
+            {"title": "Too Many Requests", "detail": "Too Many Requests", "type": "about:blank", "status": 429},
+            status=429, headers={'x-rate-limit-limit': str(behaviour.rate_limit),
+                                 'x-rate-limit-remaining': '0', 'x-rate-limit-reset': str(reset_at)})
+    if service == 'telegram':
+        return web.json_response(
+            {"ok": False, "error_code": 429, "description": f"Too Many Requests: retry after {retry_after}",
+             "parameters": {"retry_after": retry_after}}, status=429)
+    return web.json_response({"error": "too many requests"}, status=429, headers={'retry-after': str(retry_after)})
+
+
+def _error_response(service: str) -> web.Response:
+    """Transient server error in the shape the real service uses"""
+    if service == 'anthropic':
+        return web.json_response({"type": "error", "error": {"type": "overloaded_error", "message": "Overloaded"}},
+                                 status=529)
+    if service == 'twitter':
+        return web.json_response({"title": "Service Unavailable", "detail": "Service Unavailable",
+                                  "type": "about:blank", "status": 503}, status=503)
+    if service == 'telegram':
+        return web.json_response({"ok": False, "error_code": 502, "description": "Bad Gateway"}, status=502)
+    return web.Response(text="502 Bad Gateway", status=502)
+
+
+def _tweet_id(sequence: int) -> str:
+    # Snowflake-like ids that grow with time, as since_id paging expects
+    return str(1_900_000_000_000_000_000 + sequence)
+
+
+class TwitterState:
+    """In-memory timeline whose engagement grows every time it is read"""
+
+    def __init__(self, rng: random.Random, seed_tweets: int = SEED_TWEETS):
+        self.rng = rng
+        self.tweets: List[Dict] = []
+        now = time.time()
+        for n in range(seed_tweets):
+            self.add(_mock_text(f"seed tweet {n}"), created=now - (seed_tweets - n) * 3600)
+
+    def add(self, text: str, created: Optional[float] = None) -> Dict:
+        created_at = datetime.fromtimestamp(created or time.time(), timezone.utc)
+        tweet = {
+            'id': _tweet_id(len(self.tweets) + 1),
+            'text': text,
+            'created_at': created_at.strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+            'public_metrics': {'retweet_count': 0, 'reply_count': 0, 'like_count': 0,
+                               'quote_count': 0, 'bookmark_count': 0, 'impression_count': 0},
+        }
+        self.tweets.append(tweet)
+        return tweet
+
+    def view(self, tweet: Dict, fields: List[str]) -> Dict:
+        metrics = tweet['public_metrics']
+        metrics['impression_count'] += self.rng.randint(0, 40)
+        metrics['like_count'] += self.rng.randint(0, 3)
+        metrics['retweet_count'] += self.rng.randint(0, 1)
+        metrics['reply_count'] += self.rng.randint(0, 1)
+        view = {'id': tweet['id'], 'text': tweet['text'], 'edit_history_tweet_ids': [tweet['id']]}
+        for field in ('created_at', 'public_metrics'):
+            if field in fields:
+                view[field] = dict(tweet[field]) if field == 'public_metrics' else tweet[field]
+        return view
+
+
+def _snapshot_proposals(query: str) -> List[Dict]:
+    """Deterministic active proposals for the spaces named in a proposals query"""
+    spaces_match = re.search(r'space_in:\s*\[([^\]]*)\]', query)
+    spaces = re.findall(r'"([^"]+)"', spaces_match.group(1)) if spaces_match else []
+    first_match = re.search(r'first:\s*(\d+)', query)
+    first = int(first_match.group(1)) if first_match else 20
+    now = int(time.time())
+    proposals = []
+    for n in range(first):
+        space = spaces[n % len(spaces)] if spaces else 'treasurecorp.eth'
+        digest = hashlib.sha256(f"{space}:{n}".encode()).hexdigest()
+        topic = _PROPOSAL_TOPICS[int(digest[:4], 16) % len(_PROPOSAL_TOPICS)]
+        votes = int(digest[4:8], 16) % 900 + 50
+        proposals.append({
+            'id': f"0x{digest}",
+            'title': f"{topic} ({space.split('.')[0]} #{n + 1})",
+            'body': f"## Summary\n{topic}. {_mock_text(digest, 24)}",
+            'choices': ['For', 'Against', 'Abstain'],
+            'start': now - 86400, 'end': now + 5 * 86400, 'state': 'active',
+            'scores': [votes * 900.0, votes * 250.0, votes * 10.0], 'scores_total': votes * 1160.0,
+            'votes': votes, 'author': f"0x{digest[-40:]}",
+            'space': {'id': space, 'name': space.split('.')[0].replace('-', ' ').title()},
+        })
+    return proposals
+
+
+def create_app(batch_seconds: float = 5.0) -> web.Application:
+    """Anthropic mock extended with Twitter, Telegram and Snapshot routes and injected failures"""
+    seed = os.getenv("MOCK_SEED")
+    rng = random.Random(int(seed)) if seed else random.Random()
+    behaviours = {service: ServiceBehaviour(service, rng) for service in SERVICES}
+    twitter = TwitterState(rng)
+    telegram_messages = {'count': 0}
+
+    @web.middleware
+    async def inject_failures(request: web.Request, handler):
+        service = _service_for(request.path)
+        if service is None:
+            return await handler(request)
+        outcome = await behaviours[service].apply()
+        if outcome == 'throttled':
+            return _throttled_response(service, behaviours[service])
+        if outcome == 'error':
+            return _error_response(service)
+        return await handler(request)
+
+    # Twitter API v2
+    async def create_tweet(request: web.Request):
+        text = (await request.json()).get('text', '')
+        if len(text) > TWEET_MAX_LENGTH:
+            return web.json_response({"errors": [{"message": "Your Tweet text is too long."}],
+                                      "title": "Invalid Request", "status": 400,
+                                      "detail": "One or more parameters to your request was invalid."}, status=400)
+        tweet = twitter.add(text)
+        return web.json_response({"data": {"id": tweet['id'], "text": text, "edit_history_tweet_ids": [tweet['id']]}},
+                                 status=201)
+
+    async def get_tweets(request: web.Request):
+        ids = set(request.query.get('ids', '').split(','))
+        fields = request.query.get('tweet.fields', '').split(',')
+        return web.json_response({"data": [twitter.view(t, fields) for t in twitter.tweets if t['id'] in ids]})
+
+    async def get_users_tweets(request: web.Request):
+        fields = request.query.get('tweet.fields', '').split(',')
+        since_id = int(request.query.get('since_id', 0))
+        until_id = int(request.query['until_id']) if 'until_id' in request.query else None
+        max_results = min(100, max(5, int(request.query.get('max_results', 10))))
+        offset = int(request.query.get('pagination_token', 0))
+        timeline = [t for t in reversed(twitter.tweets)
+                    if int(t['id']) > since_id and (until_id is None or int(t['id']) < until_id)]
+        page = timeline[offset:offset + max_results]
+        meta = {"result_count": len(page)}
+        if page:
+            meta.update(newest_id=page[0]['id'], oldest_id=page[-1]['id'])
+        if offset + max_results < len(timeline):
+            meta['next_token'] = str(offset + max_results)
+        body = {"meta": meta}
+        if page:
+            body['data'] = [twitter.view(t, fields) for t in page]
+        return web.json_response(body)
+
+    async def get_me(request: web.Request):
+        return web.json_response({"data": {"id": MOCK_TWITTER_USER_ID, "name": "TreasureCorp",
+                                           "username": "Treasure_Corp"}})
+
+    # Telegram Bot API
+    async def telegram_method(request: web.Request):
+        method = request.match_info['method']
+        params = await request.json() if request.content_type == 'application/json' else await request.post()
+        if method == 'getMe':
+            return web.json_response({"ok": True, "result": {
+                "id": 7000000001, "is_bot": True, "first_name": "TreasureCorp Mock",
+                "username": "treasurecorp_mock_bot", "can_join_groups": True,
+                "can_read_all_group_messages": False, "supports_inline_queries": False}})
+        if method not in ('sendMessage', 'sendPhoto'):
+            return web.json_response({"ok": False, "error_code": 404, "description": "Not Found"}, status=404)
+
+        chat_id = str(params.get('chat_id', ''))
+        if not chat_id:
+            return web.json_response({"ok": False, "error_code": 400, "description": "Bad Request: chat not found"},
+                                     status=400)
+        telegram_messages['count'] += 1
+        chat = {"id": int(chat_id), "type": "private"} if chat_id.lstrip('-').isdigit() else \
+            {"id": -1001000000001, "type": "channel", "username": chat_id.lstrip('@')}
+        message = {"message_id": telegram_messages['count'], "date": int(time.time()), "chat": chat}
+        if method == 'sendPhoto':
+            photo = params.get('photo')
+            size = len(photo.file.read()) if hasattr(photo, 'file') else 0
+            file_id = hashlib.md5(f"photo{telegram_messages['count']}".encode()).hexdigest()
+            message['photo'] = [{"file_id": file_id, "file_unique_id": file_id[:16], "width": 800, "height": 600,
+                                 "file_size": size}]
+            message['caption'] = params.get('caption', '')
+        else:
+            message['text'] = params.get('text', '')
+        return web.json_response({"ok": True, "result": message})
+
+    # Snapshot GraphQL
+    async def snapshot_graphql(request: web.Request):
+        query = (await request.json()).get('query', '')
+        return web.json_response({"data": {"proposals": _snapshot_proposals(query)}})
+
+    async def stats(request: web.Request):
+        return web.json_response({
+            **{service: behaviour.stats for service, behaviour in behaviours.items()},
+            'tweets': len(twitter.tweets), 'telegram_messages': telegram_messages['count'],
+        })
+
+    app = create_anthropic_app(batch_seconds)
+    app.middlewares.append(inject_failures)
+    app.router.add_post('/2/tweets', create_tweet)
+    app.router.add_get('/2/tweets', get_tweets)
+    app.router.add_get('/2/users/me', get_me)
+    app.router.add_get('/2/users/{user_id}/tweets', get_users_tweets)
+    app.router.add_post('/bot{token}/{method}', telegram_method)
+    app.router.add_post('/graphql', snapshot_graphql)
+    app.router.add_get('/mock/stats', stats)
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local mocks of the Anthropic, Twitter, Telegram and Snapshot APIs")
+    parser.add_argument('--port', type=int, default=8787)
+    parser.add_argument('--batch-seconds', type=float, default=5.0)
+    args = parser.parse_args()
+    base = f"http://127.0.0.1:{args.port}"
+    print(f"🧪 Mock services on {base} (Anthropic, Twitter v2, Telegram, Snapshot at {base}/graphql)")
+    web.run_app(create_app(args.batch_seconds), host='127.0.0.1', port=args.port, print=None)
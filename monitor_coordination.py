@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Cross-process coordination for the DAO monitor
+Leader lease, event log and command queue stored in the shared SQLite database
+so any number of API workers can run next to exactly one active monitor
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+from db_migrations import connect
+
+logger = logging.getLogger(__name__)
+
+def _connect(db_path: Optional[str]) -> sqlite3.Connection:
+    """Open a connection that waits on other writers instead of failing"""
+    return connect(db_path, check_same_thread=False)
+
+
+class LeaderLease:
+    """Time-bounded leadership lock; only the holder may run monitoring cycles"""
+
+    def __init__(self, name: str = 'dao_monitor', db_path: Optional[str] = None, ttl_seconds: int = 120):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.holder_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.conn = _connect(db_path)
+
+    def try_acquire(self) -> bool:
+        """Acquire the lease, or renew it if we already hold it"""
+        now = time.time()
+        cursor = self.conn.cursor()
+
+        # Single upsert so two workers racing for an expired lease cannot both win
+        cursor.execute('''
+            INSERT INTO monitor_leases (name, holder, expires_at) VALUES (?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET holder = excluded.holder, expires_at = excluded.expires_at
+            WHERE monitor_leases.holder = excluded.holder OR monitor_leases.expires_at < ?
+        ''', (self.name, self.holder_id, now + self.ttl_seconds, now))
+        self.conn.commit()
+
+        return cursor.rowcount == 1
+
+    def release(self):
+        """Give up the lease so a standby worker can take over immediately"""
+        self.conn.execute(
+            "DELETE FROM monitor_leases WHERE name = ? AND holder = ?",
+            (self.name, self.holder_id)
+        )
+        self.conn.commit()
+
+    def current_holder(self) -> Optional[str]:
+        """Return the holder of an unexpired lease, if any"""
+        row = self.conn.execute(
+            "SELECT holder FROM monitor_leases WHERE name = ? AND expires_at >= ?",
+            (self.name, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+
+class MonitorEventLog:
+    """Append-only event log the monitor writes and every API worker tails"""
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.conn = _connect(db_path)
+
+    def append(self, topic: str, payload: Dict[str, Any], message_type: Optional[str] = None) -> int:
+        cursor = self.conn.cursor()
+        cursor.execute(
+            "INSERT INTO monitor_events (topic, message_type, payload, created_at) VALUES (?, ?, ?, ?)",
+            (topic, message_type, json.dumps(payload, default=str), time.time())
+        )
+        self.conn.commit()
+        return cursor.lastrowid
+
+    async def listener(self, topic: str, payload: Dict[str, Any]):
+        """Event listener signature accepted by DAOMonitoringLLM.add_event_listener"""
+        self.append(topic, payload)
+
+    def append_metric_deltas(self, metrics: Dict[str, Dict[str, Any]]) -> Optional[int]:
+        """Log the growth metric fields that changed since the last push, if any
+
+        The last pushed values are shared through pushed_growth_metrics and updated in
+        the same write transaction, so when several API workers react to one event only
+        the first logs the change and every worker relays that same delta.
+        """
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            previous = {
+                row[0]: json.loads(row[1])
+                for row in self.conn.execute("SELECT platform, snapshot FROM pushed_growth_metrics")
+            }
+
+            deltas = {}
+            for platform, current in metrics.items():
+                current = json.loads(json.dumps(current, default=str))
+                changed = {key: value for key, value in current.items()
+                           if previous.get(platform, {}).get(key) != value}
+                if changed:
+                    deltas[platform] = changed
+                    self.conn.execute('''
+                        INSERT INTO pushed_growth_metrics (platform, snapshot, updated_at) VALUES (?, ?, ?)
+                        ON CONFLICT(platform) DO UPDATE SET snapshot = excluded.snapshot, updated_at = excluded.updated_at
+                    ''', (platform, json.dumps(current), now))
+
+            event_id = None
+            if deltas:
+                cursor = self.conn.execute(
+                    "INSERT INTO monitor_events (topic, message_type, payload, created_at) VALUES (?, ?, ?, ?)",
+                    ('metrics', None, json.dumps({"snapshot": False, "metrics": deltas}), now)
+                )
+                event_id = cursor.lastrowid
+            self.conn.commit()
+            return event_id
+        except Exception:
+            self.conn.rollback()
+            raise
+
+    def latest_id(self) -> int:
+        row = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM monitor_events").fetchone()
+        return row[0]
+
+    def read_since(self, last_id: int, limit: int = 500) -> List[Tuple[int, str, Optional[str], Dict[str, Any]]]:
+        rows = self.conn.execute(
+            "SELECT id, topic, message_type, payload FROM monitor_events WHERE id > ? ORDER BY id LIMIT ?",
+            (last_id, limit)
+        ).fetchall()
+        return [(row[0], row[1], row[2], json.loads(row[3])) for row in rows]
+
+    def prune(self, max_age_seconds: int = 86400) -> int:
+        cursor = self.conn.cursor()
+        cursor.execute("DELETE FROM monitor_events WHERE created_at < ?", (time.time() - max_age_seconds,))
+        self.conn.commit()
+        return cursor.rowcount
+
+
+# A command that was running under this many leaders in a row is given up as failed
+MAX_COMMAND_ATTEMPTS = 3
+
+
+class MonitorCommandQueue:
+    """Work requested by API workers (manual cycles, manual posts) for the active monitor"""
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.conn = _connect(db_path)
+
+    def enqueue(self, command: str, payload: Optional[Dict[str, Any]] = None) -> int:
+        cursor = self.conn.cursor()
+        cursor.execute(
+            "INSERT INTO monitor_commands (command, payload, created_at) VALUES (?, ?, ?)",
+            (command, json.dumps(payload or {}, default=str), time.time())
+        )
+        self.conn.commit()
+        return cursor.lastrowid
+
+    def claim_next(self, holder: str) -> Optional[Tuple[int, str, Dict[str, Any]]]:
+        """Mark the oldest pending command as running under `holder` and return it"""
+        row = self.conn.execute(
+            "SELECT id, command, payload FROM monitor_commands WHERE status = 'pending' ORDER BY id LIMIT 1"
+        ).fetchone()
+        if not row:
+            return None
+
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            UPDATE monitor_commands
+            SET status = 'running', holder = ?, claimed_at = ?, attempts = COALESCE(attempts, 0) + 1
+            WHERE id = ? AND status = 'pending'
+        ''', (holder, time.time(), row[0]))
+        self.conn.commit()
+
+        if cursor.rowcount != 1:
+            return None
+        return row[0], row[1], json.loads(row[2] or '{}')
+
+    def requeue_stale(self, holder: str) -> int:
+        """On takeover, return commands still running under a previous leader to the queue
+
+        Only the lease holder runs commands, so a running row claimed by anyone else
+        belongs to a leader that crashed or lost its lease before finishing it.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            UPDATE monitor_commands
+            SET status = CASE WHEN COALESCE(attempts, 0) >= ? THEN 'failed' ELSE 'pending' END,
+                finished_at = CASE WHEN COALESCE(attempts, 0) >= ? THEN ? END,
+                holder = NULL, claimed_at = NULL
+            WHERE status = 'running' AND (holder IS NULL OR holder != ?)
+        ''', (MAX_COMMAND_ATTEMPTS, MAX_COMMAND_ATTEMPTS, time.time(), holder))
+        self.conn.commit()
+        if cursor.rowcount:
+            logger.warning(f"Recovered {cursor.rowcount} monitor commands left running by a previous leader")
+        return cursor.rowcount
+
+    def complete(self, command_id: int, status: str = 'done'):
+        self.conn.execute(
+            "UPDATE monitor_commands SET status = ?, finished_at = ? WHERE id = ?",
+            (status, time.time(), command_id)
+        )
+        self.conn.commit()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+TreasureCorp Commander - Dedicated Monitor Worker
+Runs the DAO monitoring cycle in exactly one process, guarded by a leader lease,
+so the API tier can scale to many uvicorn workers without duplicate posts
+"""
+
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Awaitable, Dict, Optional
+import logging
+
+from content_model import ContentItem
+from monitor_coordination import LeaderLease, MonitorEventLog, MonitorCommandQueue
+from posting_scheduler import PostingScheduler
+from engagement_ingest import ENGAGEMENT_REFRESH_SECONDS
+from content_retention import RETENTION_INTERVAL_SECONDS, run_retention
+from metrics_registry import REGISTRY
+from storage_backends import get_storage
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Seconds between scheduled monitoring cycles
+MONITOR_INTERVAL_SECONDS = int(os.getenv("MONITOR_INTERVAL_SECONDS", "3600"))
+
+# How often the leader looks for commands queued by API workers
+COMMAND_POLL_SECONDS = 2
+
+# How often the leader publishes its metrics for /metrics on the API workers
+METRICS_PUBLISH_SECONDS = 30
+
+
+class MonitorService:
+    """Leader-elected monitoring loop shared by the worker process and embedded mode"""
+
+    def __init__(self, lease_ttl_seconds: int = 120):
+        self.lease = LeaderLease(ttl_seconds=lease_ttl_seconds)
+        self.events = MonitorEventLog()
+        self.commands = MonitorCommandQueue()
+        self.monitor = None
+        self.scheduler = None
+        self._work_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lease_lost = threading.Event()
+        self.next_cycle_at = 0.0
+        self.next_ingest_at = 0.0
+        self.next_retention_at = 0.0
+        self.next_metrics_at = 0.0
+
+    async def run(self):
+        """Wait for leadership, then run cycles and queued commands until leadership is lost"""
+        while not self.lease.try_acquire():
+            logger.info(f"Monitor standby: lease held by {self.lease.current_holder()}")
+            await asyncio.sleep(self.lease.ttl_seconds / 2)
+
+        logger.info(f"Monitor leadership acquired by {self.lease.holder_id}")
+        self.commands.requeue_stale(self.lease.holder_id)
+
+        # Only the leader pays for building the LLM and social clients, and it does so
+        # in a thread so an embedded API worker keeps answering requests meanwhile
+        if self.monitor is None:
+            self.monitor = await asyncio.to_thread(self._build_monitor)
+            self.monitor.add_event_listener(self.events.listener)
+            self.scheduler = PostingScheduler(self.monitor)
+
+        # The lease is renewed from its own thread, so a long or blocked cycle cannot
+        # let it expire; scheduled posts fire (on the work loop) only while we hold it
+        self._lease_lost.clear()
+        stop_renewal = threading.Event()
+        renewal = threading.Thread(target=self._renew_lease, args=(stop_renewal,),
+                                   name='monitor-lease', daemon=True)
+        renewal.start()
+        posting = asyncio.run_coroutine_threadsafe(self.scheduler.run(), self._get_work_loop())
+        try:
+            await self._leader_loop()
+        finally:
+            stop_renewal.set()
+            posting.cancel()
+            await asyncio.to_thread(renewal.join)
+            self.lease.release()
+            logger.info("Monitor leadership released")
+
+    @staticmethod
+    def _build_monitor():
+        from dao_monitoring_llm import DAOMonitoringLLM
+        monitor = DAOMonitoringLLM()
+        monitor.preload_dependencies()
+        return monitor
+
+    def _get_work_loop(self) -> asyncio.AbstractEventLoop:
+        """Event loop thread for cycles, posts and commands
+
+        The pipeline still makes blocking calls (feedparser, requests, tweepy, PIL);
+        running it here keeps the lease renewal and, in embedded mode, the API
+        workers' event loop responsive. The loop lives as long as the service so
+        per-loop clients (LLM gateway session, Postgres pool) are reused across cycles.
+        """
+        if self._work_loop is None:
+            self._work_loop = asyncio.new_event_loop()
+            threading.Thread(target=self._work_loop.run_forever, name='monitor-work', daemon=True).start()
+        return self._work_loop
+
+    async def _on_work_loop(self, coroutine: Awaitable):
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coroutine, self._get_work_loop()))
+
+    def _renew_lease(self, stop: threading.Event):
+        """Keep the lease alive until stopped; flag the leader loop as soon as it is lost"""
+        while not stop.wait(self.lease.ttl_seconds / 3):
+            try:
+                renewed = self.lease.try_acquire()
+            except Exception as e:
+                logger.error(f"Error renewing monitor lease: {e}")
+                continue
+            if not renewed:
+                logger.error("Monitor lease lost to another worker, stopping")
+                self._lease_lost.set()
+                return
+
+    async def _leader_loop(self):
+        while not self._lease_lost.is_set():
+            command = self.commands.claim_next(self.lease.holder_id)
+            if command:
+                await self._run_command(*command)
+                continue
+
+            if time.time() >= self.next_cycle_at:
+                await self._run_cycle()
+                continue
+
+            if time.time() >= self.next_ingest_at:
+                await self._run_engagement_ingest()
+                continue
+
+            if time.time() >= self.next_retention_at:
+                await self._run_retention()
+                continue
+
+            if time.time() >= self.next_metrics_at:
+                self._publish_metrics()
+                continue
+
+            await asyncio.sleep(COMMAND_POLL_SECONDS)
+
+    async def _run_cycle(self):
+        try:
+            logger.info("Running background monitoring cycle...")
+            await self._on_work_loop(self.monitor.daily_monitoring_cycle(post_content=False))
+            self.events.append('monitoring', {"message": "Monitoring cycle completed"})
+            
+            # New backlog content may fill upcoming posting slots
+            self._get_work_loop().call_soon_threadsafe(self.scheduler.notify)
+            self.events.prune()
+
+            # Wait 1 hour before next cycle (aggressive monitoring)
+            self.next_cycle_at = time.time() + MONITOR_INTERVAL_SECONDS
+
+        except Exception as e:
+            logger.error(f"Error in background monitoring: {e}")
+            self.next_cycle_at = time.time() + 300  # Wait 5 minutes on error
+
+    async def _run_engagement_ingest(self):
+        self.next_ingest_at = time.time() + ENGAGEMENT_REFRESH_SECONDS
+        if not self.monitor.twitter_api:
+            return
+
+        try:
+            # tweepy is synchronous; keep the event loop (and scheduled posts) responsive
+            await asyncio.to_thread(self.monitor.engagement_ingestor.ingest)
+        except Exception as e:
+            logger.error(f"Error ingesting engagement: {e}")
+
+    async def _run_retention(self):
+        self.next_retention_at = time.time() + RETENTION_INTERVAL_SECONDS
+        try:
+            # On the work loop so a Postgres backend reuses that loop's pool
+            await self._on_work_loop(run_retention())
+        except Exception as e:
+            logger.error(f"Error archiving expired content: {e}")
+
+    def _publish_metrics(self):
+        self.next_metrics_at = time.time() + METRICS_PUBLISH_SECONDS
+        try:
+            REGISTRY.publish()
+        except Exception as e:
+            logger.error(f"Error publishing metrics: {e}")
+
+    async def _run_command(self, command_id: int, command: str, payload: Dict[str, Any]):
+        try:
+            if command == 'run_cycle':
+                await self._run_cycle()
+            elif command == 'manual_post':
+                await self._on_work_loop(self._process_manual_post(payload))
+            else:
+                logger.warning(f"Unknown monitor command: {command}")
+                self.commands.complete(command_id, 'unknown')
+                return
+
+            self.commands.complete(command_id)
+
+        except Exception as e:
+            logger.error(f"Error running monitor command {command}: {e}")
+            self.commands.complete(command_id, 'failed')
+
+    async def _process_manual_post(self, payload: Dict[str, Any]):
+        """Post content submitted from the mobile app"""
+        summaries = {payload['platform']: payload['content']}
+
+        # Create mock content item
+        content_item = ContentItem(
+            source='mobile_app',
+            title='Manual Post',
+            type='manual',
+            manual=True
+        )
+
+        # Generate images if needed
+        images = self.monitor.generate_social_images(content_item)
+
+        # Post to social media (results are published on the 'posting' topic)
+        await self.monitor.post_to_social_media(content_item, summaries, images)
+
+        for img_path in images.values():
+            try:
+                os.remove(img_path)
+            except OSError:
+                pass
+
+        logger.info(f"Manual post processed for {payload['platform']}")
+
+
+async def run_worker():
+    """Run the monitor forever, re-entering standby whenever leadership is lost"""
+    await get_storage().open()
+    service = MonitorService()
+    while True:
+        await service.run()
+
+
+if __name__ == "__main__":
+    print("🛰️ Starting TreasureCorp monitor worker...")
+    asyncio.run(run_worker())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Post Batch Generation
+Generates every theme of a Marketing generator's weekly batch concurrently
+through the LLM gateway. Accepted posts enter the generator's history as soon
+as they pass, so each candidate is checked for uniqueness against history and
+against the rest of the batch.
+
+A generator provides `llm`, `model`, `build_prompt(theme)`, `is_duplicate(post)`
+and `add_to_history(post)`, and optionally a static `system_prompt`.
+"""
+
+import asyncio
+import time
+from typing import Callable, List, Optional
+
+from post_validator import repair_post, validate_post
+
+FAILED_POST = "Failed to generate a unique post after multiple attempts. Please try again later."
+
+
+def post_system_prompt(generator):
+    """The generator's static instructions as the system prompt, if it has any
+
+    Not marked for prompt caching: a generator's instructions are ~200 tokens, far below
+    the API's 1024-token minimum, so cache_control would never produce a cache hit.
+    """
+    return getattr(generator, 'system_prompt', None) or None
+
+
+async def generate_unique_post_async(generator, theme: str, max_attempts: int = 5) -> str:
+    """One theme's retry loop: repair, validate and deduplicate each candidate"""
+    for attempt in range(1, max_attempts + 1):
+        try:
+            post = (await generator.llm.complete(generator.build_prompt(theme), model=generator.model,
+                                                 max_tokens=300, system=post_system_prompt(generator),
+                                                 caller=type(generator).__name__)).strip()
+        except Exception as e:
+            print(f"API Error: {e}")
+            post = None
+
+        # Fix length, hashtag and formatting problems locally instead of spending a retry
+        problems = []
+        if post:
+            post = repair_post(post)
+            problems = validate_post(post)
+
+        # No await between the check and the insert, so concurrent themes cannot both claim a near-identical post
+        if post and not problems and not generator.is_duplicate(post):
+            generator.add_to_history(post)
+            return post
+
+        if problems:
+            print(f"[{theme}] Generated invalid post ({'; '.join(problems)}), retrying... (Attempt {attempt}/{max_attempts})")
+        elif post:
+            print(f"[{theme}] Generated duplicate post, retrying... (Attempt {attempt}/{max_attempts})")
+        else:
+            print(f"[{theme}] Failed to generate post, retrying... (Attempt {attempt}/{max_attempts})")
+
+    return FAILED_POST
+
+
+async def generate_batch(generator, themes: List[str], max_attempts: int = 5,
+                         on_post: Optional[Callable[[int, str, str], None]] = None) -> List[str]:
+    """Posts for all themes, in theme order; `on_post(index, theme, post)` fires as each one finishes"""
+    async def generate(index: int, theme: str):
+        post = await generate_unique_post_async(generator, theme, max_attempts)
+        return index, theme, post
+
+    posts: List[str] = [FAILED_POST] * len(themes)
+    for finished in asyncio.as_completed([generate(i, theme) for i, theme in enumerate(themes)]):
+        index, theme, post = await finished
+        posts[index] = post
+        if on_post:
+            on_post(index, theme, post)
+    return posts
+
+
+def run_batch(generator, themes: List[str], max_attempts: int = 5,
+              on_post: Optional[Callable[[int, str, str], None]] = None) -> List[str]:
+    """Blocking generate_batch() for the Marketing scripts"""
+    async def main():
+        try:
+            return await generate_batch(generator, themes, max_attempts, on_post)
+        finally:
+            await generator.llm.close()
+
+    return asyncio.run(main())
+
+
+def print_progress(started: float) -> Callable[[int, str, str], None]:
+    """on_post callback printing each post as it finishes"""
+    def report(index: int, theme: str, post: str):
+        print(f"✅ {theme} ready after {time.monotonic() - started:.1f}s")
+    return report
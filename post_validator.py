@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Post Validator
+Local checks and a deterministic repair pass for social posts, so length,
+hashtag and formatting problems are fixed without another LLM round trip.
+Twitter lengths follow twitter-text: every URL counts as 23 characters and
+characters outside the Latin/punctuation ranges (emoji, CJK) count double.
+"""
+
+import re
+from typing import List, Tuple
+
+# Character budgets per platform
+PLATFORM_LIMITS = {
+    'twitter': 280,
+    'telegram': 500,
+}
+
+# Length Twitter charges for any link after t.co wrapping
+TWITTER_URL_LENGTH = 23
+
+# Hashtags beyond this many are dropped (prompts ask for 2-3)
+MAX_HASHTAGS = 3
+
+# Code point ranges twitter-text weighs as a single character
+_SINGLE_WEIGHT_RANGES = ((0, 4351), (8192, 8205), (8208, 8223), (8242, 8247))
+
+URL_PATTERN = re.compile(r'https?://[^\s]+[^\s.,;:!?)\]\'"]')
+HASHTAG_PATTERN = re.compile(r'(?<![\w#])#\w+')
+
+# Lead-in lines models add before the actual post ("Here's a tweet:")
+_PREAMBLE_PATTERN = re.compile(r"^(here'?s|here is|sure|certainly|tweet|post)\b[^\n]*:\s*\n", re.IGNORECASE)
+
+_ELLIPSIS = '…'
+
+
+def _char_weight(code_point: int) -> int:
+    for low, high in _SINGLE_WEIGHT_RANGES:
+        if low <= code_point <= high:
+            return 1
+    return 2
+
+
+def tweet_length(text: str) -> int:
+    """Weighted length as Twitter counts it"""
+    length = 0
+    for segment, is_url in _split_urls(text):
+        if is_url:
+            length += TWITTER_URL_LENGTH
+            continue
+        skip_next = False
+        for char in segment:
+            code_point = ord(char)
+            # Emoji modifiers and ZWJ sequences count as part of the emoji before them
+            if skip_next or code_point == 0xFE0F or 0x1F3FB <= code_point <= 0x1F3FF:
+                skip_next = False
+                continue
+            if code_point == 0x200D:
+                skip_next = True
+                continue
+            length += _char_weight(code_point)
+    return length
+
+
+def post_length(text: str, platform: str = 'twitter') -> int:
+    return tweet_length(text) if platform == 'twitter' else len(text)
+
+
+def _split_urls(text: str) -> List[Tuple[str, bool]]:
+    segments = []
+    position = 0
+    for match in URL_PATTERN.finditer(text):
+        segments.append((text[position:match.start()], False))
+        segments.append((match.group(), True))
+        position = match.end()
+    segments.append((text[position:], False))
+    return segments
+
+
+def validate_post(text: str, platform: str = 'twitter') -> List[str]:
+    """Problems that would stop the post from going out as-is (empty when valid)"""
+    if not text or not text.strip():
+        return ['post is empty']
+
+    problems = []
+    length = post_length(text, platform)
+    if length > PLATFORM_LIMITS[platform]:
+        problems.append(f"post is {length} characters, over the {PLATFORM_LIMITS[platform]} character limit")
+
+    hashtags = HASHTAG_PATTERN.findall(text)
+    if len(hashtags) > MAX_HASHTAGS:
+        problems.append(f"post has {len(hashtags)} hashtags, over the budget of {MAX_HASHTAGS}")
+    if len({tag.lower() for tag in hashtags}) < len(hashtags):
+        problems.append("post repeats a hashtag")
+
+    if text != text.strip() or (len(text) > 1 and text[0] == text[-1] and text[0] in '"\''):
+        problems.append("post has surrounding whitespace or quotes")
+    if _PREAMBLE_PATTERN.match(text) or '**' in text:
+        problems.append("post has model formatting (preamble or markdown)")
+
+    return problems
+
+
+def repair_post(text: str, platform: str = 'twitter') -> str:
+    """Deterministically clean up a generated post and fit it into the platform budget"""
+    text = _strip_model_formatting(text)
+    text = _enforce_hashtag_budget(text)
+
+    limit = PLATFORM_LIMITS[platform]
+    if post_length(text, platform) <= limit:
+        return text
+
+    body, tail = _split_tail(text)
+    tail_tokens = tail.split()
+
+    # Keep the source link and hashtags; shorten the body around them
+    while tail_tokens and post_length(' '.join(tail_tokens), platform) > limit // 2:
+        hashtag_positions = [i for i, token in enumerate(tail_tokens) if token.startswith('#')]
+        if not hashtag_positions:
+            break
+        del tail_tokens[hashtag_positions[-1]]
+
+    tail = ' '.join(tail_tokens)
+    budget = limit - (post_length(tail, platform) + 1 if tail else 0)
+    body = _trim_body(body, budget, platform)
+    return f"{body} {tail}".strip() if tail else body
+
+
+def _strip_model_formatting(text: str) -> str:
+    text = text.strip()
+    text = _PREAMBLE_PATTERN.sub('', text, count=1).strip()
+    if len(text) > 1 and text[0] == text[-1] and text[0] in '"\'':
+        text = text[1:-1].strip()
+    text = text.replace('**', '')
+    text = re.sub(r'[ \t]+', ' ', text)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    return text
+
+
+def _enforce_hashtag_budget(text: str) -> str:
+    """Drop repeated hashtags and any beyond MAX_HASHTAGS, keeping the first ones"""
+    seen = set()
+
+    def keep(match):
+        tag = match.group().lower()
+        if tag in seen or len(seen) >= MAX_HASHTAGS:
+            return ''
+        seen.add(tag)
+        return match.group()
+
+    text = HASHTAG_PATTERN.sub(keep, text)
+    text = re.sub(r'[ \t]+', ' ', text)
+    return re.sub(r' +\n', '\n', text).strip()
+
+
+def _split_tail(text: str) -> Tuple[str, str]:
+    """Split off trailing URLs and hashtags, which trimming must preserve
+
+    Tokens are split on any whitespace, so hashtags on a line of their own count as tail too.
+    """
+    tokens = text.split()
+    position = len(tokens)
+    while position > 0 and (URL_PATTERN.fullmatch(tokens[position - 1])
+                            or HASHTAG_PATTERN.fullmatch(tokens[position - 1])):
+        position -= 1
+    if position == len(tokens):
+        return text, ''
+
+    # Cut the original text after the last body token, keeping its own spacing and line breaks
+    body_end = 0
+    for token in tokens[:position]:
+        body_end = text.index(token, body_end) + len(token)
+    return text[:body_end].rstrip(), ' '.join(tokens[position:])
+
+
+def _trim_body(body: str, budget: int, platform: str) -> str:
+    """Cut at the last sentence end that fits, else at a word boundary with an ellipsis"""
+    if post_length(body, platform) <= budget:
+        return body
+    if budget <= 1:
+        return ''
+
+    sentences = re.split(r'(?<=[.!?])\s+', body)
+    kept = ''
+    for sentence in sentences:
+        candidate = f"{kept} {sentence}".strip()
+        if post_length(candidate, platform) > budget:
+            break
+        kept = candidate
+    if kept and post_length(kept, platform) >= budget // 2:
+        return kept
+
+    words = body.split(' ')
+    kept = ''
+    for word in words:
+        candidate = f"{kept} {word}".strip()
+        if post_length(candidate + _ELLIPSIS, platform) > budget:
+            break
+        kept = candidate
+    return kept.rstrip(',;:-') + _ELLIPSIS if kept else ''
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Posting Schedule Executor
+Materializes the aggressive growth schedule into posting_schedule, fills each slot
+from the ranked content backlog and fires posts on time from a min-heap
+"""
+
+import asyncio
+import heapq
+import json
+import os
+import sqlite3
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from aggressive_growth_config import AggressiveGrowthConfig
+from content_model import ContentItem
+from db_migrations import connect
+from posting_time_optimizer import attach_optimizer
+from social_summaries import parse_summaries
+from storage_backends import get_storage
+
+logger = logging.getLogger(__name__)
+
+# Platforms the monitor can post to (LinkedIn posting removed for deployment simplicity)
+SCHEDULED_PLATFORMS = ['twitter', 'telegram']
+
+# Slots found this far in the past on startup still fire; older ones are marked missed
+MISSED_SLOT_GRACE_SECONDS = 300
+
+# Content is assigned only to slots starting within this window, so fresher
+# items from later monitoring cycles can still claim the later slots
+FILL_HORIZON_HOURS = 6
+
+# Backlog items older than this are not worth posting anymore
+BACKLOG_MAX_AGE_HOURS = 48
+
+
+def load_day_slots(conn: sqlite3.Connection, day: date) -> Dict[str, List[Dict]]:
+    """A day's materialized slots per platform in time order, with their execution state
+
+    Superseded slots are left out; slots that already ran keep the time they ran at
+    even if the optimizer has since moved that platform's posting times.
+    """
+    start = datetime.combine(day, datetime.min.time())
+    rows = conn.execute('''
+        SELECT platform, scheduled_time, content_type, priority, engagement_target,
+               status, posted_at, post_id, engagement_score
+        FROM posting_schedule
+        WHERE scheduled_time >= ? AND scheduled_time < ? AND status != 'superseded'
+        ORDER BY scheduled_time
+    ''', (start, start + timedelta(days=1))).fetchall()
+
+    slots: Dict[str, List[Dict]] = {}
+    for row in rows:
+        slots.setdefault(row[0], []).append({
+            'time': str(row[1])[11:16], 'content_type': row[2], 'platform': row[0], 'priority': row[3],
+            'automation_level': 'high', 'engagement_target': json.loads(row[4]) if row[4] else {},
+            'status': row[5], 'posted_at': row[6], 'post_id': row[7], 'engagement_score': row[8]
+        })
+    return slots
+
+
+class PostingScheduler:
+    """Runs each posting_schedule slot at its time using the monitor's posting pipeline"""
+
+    def __init__(self, monitor, growth_config: Optional[AggressiveGrowthConfig] = None,
+                 db_path: Optional[str] = None):
+        self.monitor = monitor
+        self.growth_config = growth_config or AggressiveGrowthConfig()
+        self.conn = connect(db_path, check_same_thread=False)
+        self.storage = get_storage()
+
+        # Slot times come from engagement-learned curves when available
+        if self.growth_config.time_optimizer is None:
+            attach_optimizer(self.growth_config)
+
+        # (fire_at, slot_id) for every pending slot, earliest first; entries whose
+        # fire_at no longer matches _queued (rescheduled slots) are skipped when popped
+        self._heap: List[Tuple[float, int]] = []
+        self._queued: Dict[int, float] = {}
+        self._materialized_day: Optional[date] = None
+        self._wakeup = asyncio.Event()
+
+    def notify(self):
+        """Wake the executor to pick up new backlog content or schedule changes"""
+        self._wakeup.set()
+
+    async def run(self):
+        """Sleep until the next slot is due (or a notify), then fire every due slot"""
+        logger.info("Posting scheduler started")
+
+        while True:
+            await self._refresh()
+
+            while self._heap and self._queued.get(self._heap[0][1]) != self._heap[0][0]:
+                heapq.heappop(self._heap)
+
+            now = time.time()
+            next_fire_at = self._heap[0][0] if self._heap else float('inf')
+            wait_seconds = min(next_fire_at, self._next_midnight()) - now
+
+            if wait_seconds > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=wait_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+
+            while self._heap and self._heap[0][0] <= time.time():
+                fire_at, slot_id = heapq.heappop(self._heap)
+                if self._queued.get(slot_id) != fire_at:
+                    continue
+                del self._queued[slot_id]
+                try:
+                    await self.fire_slot(slot_id)
+                except Exception as e:
+                    logger.error(f"Error firing posting slot {slot_id}: {e}")
+                    self._finish_slot(slot_id, 'failed', error=str(e))
+
+    async def _refresh(self):
+        """Materialize new days, fill upcoming slots and queue any pending slot not yet in the heap"""
+        today = date.today()
+        if self._materialized_day != today:
+            self.growth_config.time_optimizer.refresh(self.conn)
+            for day in (today, today + timedelta(days=1)):
+                self.materialize_day(day)
+            self._materialized_day = today
+
+        self._mark_missed()
+        await self.fill_slots()
+
+        horizon = datetime.combine(today + timedelta(days=2), datetime.min.time())
+        rows = self.conn.execute(
+            "SELECT id, scheduled_time FROM posting_schedule WHERE status = 'pending' AND scheduled_time < ?",
+            (horizon,)
+        ).fetchall()
+
+        for slot_id, scheduled_time in rows:
+            fire_at = datetime.fromisoformat(str(scheduled_time)).timestamp()
+            if self._queued.get(slot_id) != fire_at:
+                heapq.heappush(self._heap, (fire_at, slot_id))
+                self._queued[slot_id] = fire_at
+
+    @staticmethod
+    def _next_midnight() -> float:
+        tomorrow = datetime.combine(date.today() + timedelta(days=1), datetime.min.time())
+        return tomorrow.timestamp()
+
+    def materialize_day(self, day: date) -> int:
+        """Write the day's slots for every scheduled platform in one transaction
+
+        Slots that already ran are kept. Pending slots at times the optimizer no longer
+        schedules are marked 'superseded', which also releases any content reserved for
+        them, so the day never holds more than posts_per_day live slots per platform.
+        """
+        cursor = self.conn.cursor()
+        start = datetime.combine(day, datetime.min.time())
+        created = 0
+        superseded = 0
+
+        for platform in SCHEDULED_PLATFORMS:
+            slot_times = []
+            for slot in self.growth_config.get_daily_aggressive_schedule(platform, day.weekday()):
+                hour, minute = map(int, slot['time'].split(':'))
+                scheduled_time = start.replace(hour=hour, minute=minute)
+                slot_times.append(scheduled_time)
+                cursor.execute('''
+                    INSERT INTO posting_schedule
+                    (platform, scheduled_time, content_type, priority, engagement_target, status)
+                    VALUES (?, ?, ?, ?, ?, 'pending')
+                    ON CONFLICT(platform, scheduled_time) DO UPDATE SET
+                        content_type = excluded.content_type, priority = excluded.priority,
+                        engagement_target = excluded.engagement_target, status = 'pending'
+                    WHERE posting_schedule.status = 'superseded'
+                ''', (
+                    platform, scheduled_time, slot['content_type'], slot['priority'],
+                    json.dumps(slot['engagement_target'])
+                ))
+                created += cursor.rowcount
+
+            cursor.execute(f'''
+                UPDATE posting_schedule SET status = 'superseded', content_id = NULL
+                WHERE platform = ? AND status = 'pending'
+                  AND scheduled_time >= ? AND scheduled_time < ?
+                  AND scheduled_time NOT IN ({','.join('?' * len(slot_times))})
+            ''', (platform, start, start + timedelta(days=1), *slot_times))
+            superseded += cursor.rowcount
+
+        self.conn.commit()
+        if created or superseded:
+            logger.info(f"Materialized {created} posting slots for {day.isoformat()} ({superseded} superseded)")
+        return created
+
+    def _mark_missed(self):
+        cutoff = datetime.now() - timedelta(seconds=MISSED_SLOT_GRACE_SECONDS)
+        cursor = self.conn.cursor()
+        cursor.execute(
+            "UPDATE posting_schedule SET status = 'missed' WHERE status = 'pending' AND scheduled_time < ?",
+            (cutoff,)
+        )
+        self.conn.commit()
+        if cursor.rowcount:
+            logger.info(f"Marked {cursor.rowcount} posting slots as missed")
+
+    async def fill_slots(self) -> int:
+        """Assign the best unposted backlog items to upcoming empty slots, viral slots first"""
+        now = datetime.now()
+        slots = self.conn.execute('''
+            SELECT id, platform FROM posting_schedule
+            WHERE status = 'pending' AND content_id IS NULL
+              AND scheduled_time >= ? AND scheduled_time < ?
+            ORDER BY CASE priority WHEN 'viral' THEN 0 ELSE 1 END, scheduled_time
+        ''', (now - timedelta(seconds=MISSED_SLOT_GRACE_SECONDS), now + timedelta(hours=FILL_HORIZON_HOURS))).fetchall()
+
+        by_platform: Dict[str, List[int]] = {}
+        for slot_id, platform in slots:
+            by_platform.setdefault(platform, []).append(slot_id)
+
+        filled = 0
+        cursor = self.conn.cursor()
+        for platform, slot_ids in by_platform.items():
+            backlog = await self._ranked_backlog(platform, len(slot_ids))
+            for slot_id, content_id in zip(slot_ids, backlog):
+                cursor.execute(
+                    "UPDATE posting_schedule SET content_id = ? WHERE id = ? AND content_id IS NULL",
+                    (content_id, slot_id)
+                )
+                filled += cursor.rowcount
+
+        self.conn.commit()
+        return filled
+
+    async def _ranked_backlog(self, platform: str, limit: int) -> List[int]:
+        """Recent summarized content not yet posted or reserved on `platform`, best first"""
+        if platform not in SCHEDULED_PLATFORMS:
+            return []
+
+        since = datetime.now() - timedelta(hours=BACKLOG_MAX_AGE_HOURS)
+        candidates = await self.storage.unposted_content(platform, since)
+        if not candidates:
+            return []
+
+        # Content in the window can only be reserved by slots filled after it was discovered
+        reserved = {row[0] for row in self.conn.execute('''
+            SELECT content_id FROM posting_schedule
+            WHERE platform = ? AND content_id IS NOT NULL AND status IN ('pending', 'posted')
+              AND scheduled_time >= ?
+        ''', (platform, since))}
+        candidates = [item for item in candidates if item['id'] not in reserved]
+
+        # Viral stories go first, then the freshest content
+        urls = [item['url'] for item in candidates]
+        viral_scores = dict(self.conn.execute(
+            f"SELECT url, viral_score FROM viral_alerts WHERE url IN ({','.join('?' * len(urls))})", urls
+        ).fetchall())
+        candidates.sort(key=lambda item: (viral_scores.get(item['url'], 0), item['discovered_at']), reverse=True)
+        return [item['id'] for item in candidates[:limit]]
+
+    async def fire_slot(self, slot_id: int):
+        """Post the slot's content and record the outcome"""
+        row = self.conn.execute(
+            "SELECT platform, content_type, content_id FROM posting_schedule WHERE id = ? AND status = 'pending'",
+            (slot_id,)
+        ).fetchone()
+        if not row:
+            return
+        platform, content_type, content_id = row
+
+        # Late fill for slots that opened up after the last backlog pass
+        if content_id is None:
+            backlog = await self._ranked_backlog(platform, 1)
+            content_id = backlog[0] if backlog else None
+        if content_id is None:
+            self._finish_slot(slot_id, 'skipped', error='No unposted content in backlog')
+            return
+
+        content = await self.storage.get_content(content_id)
+        text = parse_summaries(content['summary']).get(platform) if content else None
+        if not text:
+            self._finish_slot(slot_id, 'skipped', content_id=content_id, error=f'No {platform} summary')
+            return
+
+        content_item = ContentItem(
+            source=content['source'],
+            title=content['title'],
+            url=content['url'],
+            type=content_type
+        )
+        content_item.summary = content['summary']
+        content_item.content_id = content_id
+
+        images = self.monitor.generate_social_images(content_item)
+        try:
+            results = await self.monitor.post_to_social_media(content_item, {platform: text}, images)
+        finally:
+            for img_path in images.values():
+                try:
+                    os.remove(img_path)
+                except OSError:
+                    pass
+
+        result = results.get(platform, {'success': False, 'error': f'{platform} client not configured'})
+        if result['success']:
+            self._finish_slot(slot_id, 'posted', content_id=content_id, content=text, post_id=result.get('post_id'))
+            await self.storage.mark_posted(content_id, platform)
+            logger.info(f"Scheduled {platform} post sent: {content['title']}")
+        else:
+            self._finish_slot(slot_id, 'failed', content_id=content_id, content=text, error=result.get('error'))
+
+    def _finish_slot(self, slot_id: int, status: str, content_id: Optional[int] = None,
+                     content: Optional[str] = None, post_id: Optional[str] = None, error: Optional[str] = None):
+        self.conn.execute('''
+            UPDATE posting_schedule
+            SET status = ?, content_id = COALESCE(?, content_id), content = COALESCE(?, content),
+                post_id = ?, error = ?, posted_at = ?
+            WHERE id = ?
+        ''', (status, content_id, content, post_id, error, datetime.now() if status == 'posted' else None, slot_id))
+        self.conn.commit()
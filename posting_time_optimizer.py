@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Posting-Time Optimizer
+Learns per-platform, per-weekday engagement curves in half-hour buckets from
+content_performance and picks slot times with an upper-confidence-bound rule,
+using the configured optimal_times as the prior
+
+numpy is imported when an optimizer is built, not when this module is, because
+the API imports it through the posting scheduler on its cold-start path.
+"""
+
+import sqlite3
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+import logging
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+BUCKETS_PER_DAY = 48  # Half-hour buckets
+
+# Pseudo-posts given to the prior of every bucket
+PRIOR_WEIGHT = 3.0
+
+# Configured optimal times start this much above the platform mean, other times below
+PRIOR_LIFT = 1.25
+PRIOR_DISCOUNT = 0.75
+
+# Engagement rate (%) assumed before a platform has any data
+DEFAULT_RATE = 1.0
+
+
+def _bucket_of(hhmm: str) -> int:
+    hour, minute = map(int, hhmm.split(':'))
+    return hour * 2 + minute // 30
+
+
+def _time_of(bucket: int) -> str:
+    return f"{bucket // 2:02d}:{(bucket % 2) * 30:02d}"
+
+
+class PostingTimeOptimizer:
+    """Bucketed engagement statistics with a UCB choice of posting times"""
+
+    def __init__(self, static_times: Dict[str, List[str]], exploration: float = 0.5):
+        import numpy as np
+        self.exploration = exploration
+        self.version = 0
+
+        self._prior_buckets = {
+            platform: np.isin(np.arange(BUCKETS_PER_DAY), [_bucket_of(t) for t in times])
+            for platform, times in static_times.items()
+        }
+
+        # Ties keep the configured order, so without data the static schedule is reproduced
+        self._tie_break = {}
+        for platform, times in static_times.items():
+            rank = np.full(BUCKETS_PER_DAY, len(times), dtype=float)
+            for position, hhmm in enumerate(times):
+                rank[_bucket_of(hhmm)] = min(rank[_bucket_of(hhmm)], position)
+            self._tie_break[platform] = rank
+
+        # Minimum spacing between chosen slots, from the configured slot density
+        self._min_gap = {
+            platform: max(1, BUCKETS_PER_DAY // (2 * max(len(times), 1)))
+            for platform, times in static_times.items()
+        }
+
+        self._posts = {platform: np.zeros((7, BUCKETS_PER_DAY)) for platform in static_times}
+        self._rate_sums = {platform: np.zeros((7, BUCKETS_PER_DAY)) for platform in static_times}
+
+        # Latest rate counted per post, so re-measured posts replace their old reading
+        self._observed: Dict[Tuple[str, str], Tuple[int, int, float]] = {}
+        self._last_snapshot_id = 0
+
+    @classmethod
+    def from_config(cls, config, **kwargs) -> 'PostingTimeOptimizer':
+        """Build from any config exposing posting_strategies[platform]['optimal_times']"""
+        return cls({
+            platform: strategy['optimal_times']
+            for platform, strategy in config.posting_strategies.items()
+        }, **kwargs)
+
+    def observe(self, platform: str, post_id: str, posted_at: datetime, engagement_rate: float) -> bool:
+        """Record (or update) one post's engagement rate; returns True when the curves changed"""
+        if platform not in self._posts:
+            return False
+
+        local = posted_at.astimezone() if posted_at.tzinfo else posted_at
+        weekday, bucket = local.weekday(), local.hour * 2 + local.minute // 30
+        key = (platform, post_id)
+
+        previous = self._observed.get(key)
+        if previous:
+            prev_weekday, prev_bucket, prev_rate = previous
+            if prev_rate == engagement_rate:
+                return False
+            self._rate_sums[platform][prev_weekday, prev_bucket] -= prev_rate
+            self._posts[platform][prev_weekday, prev_bucket] -= 1
+
+        self._rate_sums[platform][weekday, bucket] += engagement_rate
+        self._posts[platform][weekday, bucket] += 1
+        self._observed[key] = (weekday, bucket, engagement_rate)
+        self.version += 1
+        return True
+
+    def refresh(self, conn: sqlite3.Connection) -> bool:
+        """Apply content_performance snapshots stored since the last refresh"""
+        rows = conn.execute('''
+            SELECT cp.id, cp.platform, cp.post_id, COALESCE(sp.created_at, cp.posted_at),
+                   cp.likes + cp.shares + cp.comments, cp.reach
+            FROM content_performance cp
+            LEFT JOIN social_posts sp ON sp.platform = cp.platform AND sp.post_id = cp.post_id
+            WHERE cp.id > ?
+            ORDER BY cp.id
+        ''', (self._last_snapshot_id,)).fetchall()
+
+        changed = False
+        for snapshot_id, platform, post_id, posted_at, interactions, reach in rows:
+            self._last_snapshot_id = snapshot_id
+            if not posted_at:
+                continue
+            try:
+                published = datetime.fromisoformat(str(posted_at))
+            except ValueError:
+                continue
+            rate = (interactions or 0) / max(reach or 0, 1) * 100
+            changed |= self.observe(platform, post_id, published, rate)
+
+        if changed:
+            logger.info(f"Posting-time curves updated to version {self.version}")
+        return changed
+
+    def curve(self, platform: str, weekday: int) -> Tuple['np.ndarray', 'np.ndarray']:
+        """(estimated mean rate, UCB score) for each half-hour bucket of a weekday"""
+        import numpy as np
+        posts = self._posts[platform]
+        rate_sums = self._rate_sums[platform]
+
+        total_posts = posts.sum()
+        platform_mean = rate_sums.sum() / total_posts if total_posts else DEFAULT_RATE
+        prior = np.where(self._prior_buckets[platform], platform_mean * PRIOR_LIFT, platform_mean * PRIOR_DISCOUNT)
+
+        # Shrink towards the same half-hour on other weekdays, then towards the prior
+        hour_posts = posts.sum(axis=0)
+        hour_mean = (rate_sums.sum(axis=0) + PRIOR_WEIGHT * prior) / (hour_posts + PRIOR_WEIGHT)
+        day_posts = posts[weekday]
+        mean = (rate_sums[weekday] + PRIOR_WEIGHT * hour_mean) / (day_posts + PRIOR_WEIGHT)
+
+        bonus = self.exploration * platform_mean * np.sqrt(
+            np.log(day_posts.sum() + BUCKETS_PER_DAY) / (day_posts + PRIOR_WEIGHT)
+        )
+        return mean, mean + bonus
+
+    def best_times(self, platform: str, weekday: int, count: int) -> List[str]:
+        """The `count` best-scoring slot times for the day, spread out
+
+        Configured times come first in their configured order and learned times follow
+        chronologically, so the content type a config assigns by slot index stays with
+        the same time while the curves still reproduce the static schedule.
+        """
+        import numpy as np
+        if platform not in self._posts or count <= 0:
+            return []
+
+        _, score = self.curve(platform, weekday)
+        min_gap = self._min_gap[platform]
+        available = np.ones(BUCKETS_PER_DAY, dtype=bool)
+        chosen = []
+
+        for bucket in np.lexsort((self._tie_break[platform], -np.round(score, 9))):
+            if len(chosen) == count:
+                break
+            if not available[bucket]:
+                continue
+            chosen.append(int(bucket))
+            # Block neighbours on the circular day so posts do not cluster
+            for offset in range(-min_gap + 1, min_gap):
+                available[(bucket + offset) % BUCKETS_PER_DAY] = False
+
+        tie_break = self._tie_break[platform]
+        return [_time_of(bucket) for bucket in sorted(chosen, key=lambda b: (tie_break[b], b))]
+
+    def report(self, platform: str, weekday: int) -> List[Dict]:
+        """Per-bucket curve for dashboards"""
+        mean, score = self.curve(platform, weekday)
+        posts = self._posts[platform][weekday]
+        return [
+            {'time': _time_of(b), 'posts': int(posts[b]), 'expected_rate': round(float(mean[b]), 3),
+             'score': round(float(score[b]), 3)}
+            for b in range(BUCKETS_PER_DAY)
+        ]
+
+
+def attach_optimizer(config, conn: Optional[sqlite3.Connection] = None) -> PostingTimeOptimizer:
+    """Create an optimizer for `config`, warm it from the database and make the config use it"""
+    optimizer = PostingTimeOptimizer.from_config(config)
+    if conn is not None:
+        optimizer.refresh(conn)
+    config.time_optimizer = optimizer
+    return optimizer
@@ -91,81 +91,11 @@ def create_directory_structure():
 
 def setup_database():
     """Initialize the SQLite database"""
-    import sqlite3
+    from db_migrations import DATABASE_PATH, migrate
     
-    db_path = 'dao_monitoring.db'
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    version = migrate(DATABASE_PATH)
     
-    # Create tables
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS monitored_content (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            source TEXT NOT NULL,
-            title TEXT NOT NULL,
-            url TEXT UNIQUE,
-            content_hash TEXT,
-            discovered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            processed_at TIMESTAMP,
-            summary TEXT,
-            posted_twitter BOOLEAN DEFAULT 0,
-            posted_linkedin BOOLEAN DEFAULT 0,
-            posted_telegram BOOLEAN DEFAULT 0,
-            engagement_score INTEGER DEFAULT 0,
-            retweets INTEGER DEFAULT 0,
-            likes INTEGER DEFAULT 0,
-            shares INTEGER DEFAULT 0
-        )
-    ''')
-    
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS dao_proposals (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            dao_name TEXT NOT NULL,
-            proposal_id TEXT,
-            title TEXT NOT NULL,
-            description TEXT,
-            status TEXT,
-            votes_for INTEGER DEFAULT 0,
-            votes_against INTEGER DEFAULT 0,
-            end_date TIMESTAMP,
-            url TEXT UNIQUE,
-            discovered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS growth_metrics (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            date DATE NOT NULL,
-            platform TEXT NOT NULL,
-            followers INTEGER DEFAULT 0,
-            posts_count INTEGER DEFAULT 0,
-            engagement_rate REAL DEFAULT 0.0,
-            reach INTEGER DEFAULT 0,
-            impressions INTEGER DEFAULT 0
-        )
-    ''')
-    
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS content_performance (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            content_id INTEGER,
-            platform TEXT,
-            post_id TEXT,
-            likes INTEGER DEFAULT 0,
-            shares INTEGER DEFAULT 0,
-            comments INTEGER DEFAULT 0,
-            reach INTEGER DEFAULT 0,
-            posted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (content_id) REFERENCES monitored_content (id)
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
-    
-    print(f"✓ Database initialized: {db_path}")
+    print(f"✓ Database initialized: {DATABASE_PATH} (schema version {version})")
 
 def create_systemd_service():
     """Create a systemd service file for Linux systems"""
@@ -251,11 +181,13 @@ def setup_logging():
 def create_monitoring_dashboard():
     """Create a simple web dashboard for monitoring"""
     dashboard_code = """#!/usr/bin/env python3
-import sqlite3
+import asyncio
 from flask import Flask, render_template, jsonify
 import json
 from datetime import datetime, timedelta
 
+from storage_backends import get_storage
+
 app = Flask(__name__)
 
 @app.route('/')
@@ -264,28 +196,11 @@ def dashboard():
 
 @app.route('/api/metrics')
 def get_metrics():
-    conn = sqlite3.connect('dao_monitoring.db')
-    cursor = conn.cursor()
-    
-    # Get recent content
-    cursor.execute('''
-        SELECT COUNT(*) as total,
-               SUM(posted_twitter) as twitter_posts,
-               SUM(posted_linkedin) as linkedin_posts,
-               SUM(posted_telegram) as telegram_posts
-        FROM monitored_content 
-        WHERE discovered_at > datetime('now', '-7 days')
-    ''')
-    
-    metrics = cursor.fetchone()
-    
-    conn.close()
+    # Content discovered and posted over the last week, from the configured backend
+    metrics = asyncio.run(get_storage().content_summary(days=7))
     
     return jsonify({
-        'total_content': metrics[0],
-        'twitter_posts': metrics[1],
-        'linkedin_posts': metrics[2],
-        'telegram_posts': metrics[3],
+        **metrics,
         'last_updated': datetime.now().isoformat()
     })
 
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Structured Social Summaries
+Per-platform post texts are requested from the LLM as a JSON object, validated
+locally and stored as JSON in monitored_content.summary. Older rows in the
+free-text "1. Twitter / 2. Telegram" format still parse.
+"""
+
+import json
+import re
+from typing import Dict, Optional
+
+from post_validator import PLATFORM_LIMITS, post_length, repair_post
+
+# Re-asks allowed per failing field before the platform is dropped
+MAX_FIELD_RETRIES = 2
+
+_LEGACY_HEADINGS = {'1. twitter': 'twitter', '2. telegram': 'telegram'}
+
+
+def _extract_json_object(text: str) -> Optional[Dict]:
+    """The first JSON object in `text` (tolerates code fences or chatter around it)"""
+    start = text.find('{')
+    while start != -1:
+        try:
+            value, _ = json.JSONDecoder().raw_decode(text[start:])
+            if isinstance(value, dict):
+                return value
+        except ValueError:
+            pass
+        start = text.find('{', start + 1)
+    return None
+
+
+def _parse_legacy(text: str) -> Dict[str, str]:
+    """Line-scanning parser for summaries stored before the JSON format"""
+    summaries = {}
+    current_platform = None
+    current_text = []
+
+    for line in text.split('\n'):
+        line = line.strip()
+        heading = next((platform for prefix, platform in _LEGACY_HEADINGS.items()
+                        if line.lower().startswith(prefix)), None)
+        if heading:
+            if current_platform:
+                summaries[current_platform] = '\n'.join(current_text).strip()
+            current_platform = heading
+            current_text = []
+        elif current_platform and line:
+            current_text.append(line)
+
+    if current_platform:
+        summaries[current_platform] = '\n'.join(current_text).strip()
+
+    return {platform: text for platform, text in summaries.items() if text}
+
+
+def parse_summaries(text: Optional[str]) -> Dict[str, str]:
+    """Platform -> post text from a stored or freshly generated summary"""
+    if not text:
+        return {}
+
+    data = _extract_json_object(text)
+    if data is not None:
+        return {
+            platform: value.strip()
+            for platform, value in data.items()
+            if platform in PLATFORM_LIMITS and isinstance(value, str) and value.strip()
+        }
+
+    return _parse_legacy(text)
+
+
+def dump_summaries(summaries: Dict[str, str]) -> str:
+    return json.dumps(summaries, ensure_ascii=False)
+
+
+def summary_problem(platform: str, text: Optional[str]) -> Optional[str]:
+    """Why a platform text cannot be posted as-is, or None when it is fine"""
+    if not text or not text.strip():
+        return "is missing"
+    length = post_length(text, platform)
+    if length > PLATFORM_LIMITS[platform]:
+        return f"is {length} characters, over the {PLATFORM_LIMITS[platform]} character limit"
+    return None
+
+
+def repair_summaries(summaries: Dict[str, str]) -> Dict[str, str]:
+    """Locally repaired platform texts, without the ones that still cannot be posted"""
+    repaired = {platform: repair_post(text, platform) for platform, text in summaries.items()}
+    return {platform: text for platform, text in repaired.items() if summary_problem(platform, text) is None}
+
+
+def preview(text: Optional[str], length: int = 200) -> str:
+    """Short human-readable preview of a stored summary (the Twitter text when available)"""
+    summaries = parse_summaries(text)
+    readable = summaries.get('twitter') or next(iter(summaries.values()), None) or re.sub(r'\s+', ' ', text or '')
+    return readable[:length] + "..." if len(readable) > length else readable
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Startup-time budget for the TreasureCorp Commander API
+Tracks time-to-ready at runtime and reports per-package import cost via `python -X importtime`
+
+Usage:
+    python startup_profile.py                      # report for mobile_app_backend
+    python startup_profile.py dao_monitoring_llm   # report for another module
+Exits with status 1 when the import exceeds STARTUP_BUDGET_MS, so it can gate CI.
+"""
+
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Captured on first import; the API imports this module before anything heavy
+BOOT_STARTED = time.perf_counter()
+
+# Maximum milliseconds from process boot until the API answers health checks
+STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "1500"))
+
+
+def elapsed_ms() -> float:
+    """Milliseconds since this process started importing the API"""
+    return (time.perf_counter() - BOOT_STARTED) * 1000
+
+
+def check_startup_budget(label: str = "API") -> float:
+    """Log time-to-ready and warn when it exceeds the budget"""
+    ready_ms = elapsed_ms()
+    if ready_ms > STARTUP_BUDGET_MS:
+        logger.warning(f"{label} ready in {ready_ms:.0f} ms, over the {STARTUP_BUDGET_MS:.0f} ms startup budget")
+    else:
+        logger.info(f"{label} ready in {ready_ms:.0f} ms (budget {STARTUP_BUDGET_MS:.0f} ms)")
+    return ready_ms
+
+
+def import_time_report(module: str = 'mobile_app_backend') -> Tuple[float, List[Tuple[str, float]]]:
+    """Import `module` in a fresh interpreter and return (total_ms, [(package, cumulative_ms)])"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    # Lines look like: "import time:       self [us] |  cumulative | imported package"
+    # with two extra spaces of indentation per nesting level
+    packages: Dict[str, float] = {}
+    total_ms = 0.0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        cumulative_ms = int(cumulative) / 1000
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        name = name.strip()
+
+        # Top-level entries carry the cost of their whole subtree; the packages
+        # imported directly by the target module show where that cost comes from
+        if depth == 0:
+            total_ms += cumulative_ms
+        elif depth == 1:
+            packages[name] = packages.get(name, 0.0) + cumulative_ms
+
+    ranked = sorted(packages.items(), key=lambda entry: entry[1], reverse=True)
+    return total_ms, ranked
+
+
+def main():
+    module = sys.argv[1] if len(sys.argv) > 1 else 'mobile_app_backend'
+    total_ms, ranked = import_time_report(module)
+
+    print(f"⏱️ Import-time report for {module}")
+    print("=" * 50)
+    for name, cumulative_ms in ranked[:20]:
+        print(f"  {cumulative_ms:8.1f} ms  {name}")
+    print("-" * 50)
+    print(f"  {total_ms:8.1f} ms  total (budget {STARTUP_BUDGET_MS:.0f} ms)")
+
+    if total_ms > STARTUP_BUDGET_MS:
+        print("❌ Over startup budget")
+        sys.exit(1)
+    print("✅ Within startup budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Shared fixtures; the modules under test live at the repository root"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Modules that open the default database must never touch the checked-in dao_monitoring.db
+os.environ["DATABASE_PATH"] = os.path.join(tempfile.mkdtemp(prefix='treasurecorp-tests-'), 'dao_monitoring.db')
+os.environ.pop("DATABASE_URL", None)
+os.environ.pop("STORAGE_BACKEND", None)
+
+# Postgres tests run against a throwaway local database, e.g.
+#   createdb treasurecorp_test
+#   TEST_DATABASE_URL=postgresql://localhost/treasurecorp_test python -m pytest tests
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL", "")
+
+POSTGRES_TABLES = ('monitored_content', 'archived_content', 'dao_proposals', 'growth_metrics', 'storage_host')
+
+
+def _reset_postgres():
+    asyncpg = pytest.importorskip("asyncpg")
+
+    async def drop():
+        conn = await asyncpg.connect(TEST_DATABASE_URL)
+        try:
+            await conn.execute(f"DROP TABLE IF EXISTS {', '.join(POSTGRES_TABLES)}")
+        finally:
+            await conn.close()
+
+    asyncio.run(drop())
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Fresh SQLite monitoring database, migrated on first connect"""
+    return str(tmp_path / 'dao_monitoring.db')
+
+
+@pytest.fixture
+def postgres_url():
+    """Empty local Postgres database, or skip when none is configured"""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    _reset_postgres()
+    return TEST_DATABASE_URL
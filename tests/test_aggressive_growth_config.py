@@ -0,0 +1,40 @@
+"""Precomputed weekly schedule matrix"""
+
+import pytest
+
+from aggressive_growth_config import AggressiveGrowthConfig
+
+
+def test_matrix_is_built_when_the_config_loads():
+    config = AggressiveGrowthConfig()
+    cache_key, matrix = config._schedule_cache
+    assert cache_key == config._current_cache_key()
+    assert set(matrix) == {(platform, day) for platform in config.posting_strategies for day in range(7)}
+
+
+def test_cached_slots_are_read_only():
+    config = AggressiveGrowthConfig()
+    slot = config.get_cached_schedule('twitter', 0)[0]
+
+    with pytest.raises(AttributeError):
+        slot.time = '03:00'
+    with pytest.raises(TypeError):
+        slot.engagement_target['likes'] = 0
+    # Dicts handed to callers are copies
+    config.get_daily_aggressive_schedule('twitter', 0)[0]['engagement_target']['likes'] = 0
+    assert config.get_cached_schedule('twitter', 0)[0].engagement_target['likes'] == 50
+
+
+def test_strategies_change_only_through_the_config():
+    config = AggressiveGrowthConfig()
+    with pytest.raises(TypeError):
+        config.posting_strategies['twitter']['posts_per_day'] = 3
+
+    config.update_posting_strategy('twitter', posts_per_day=3)
+    assert len(config.get_cached_schedule('twitter', 0)) == 3
+
+    strategies = {platform: dict(strategy) for platform, strategy in config.posting_strategies.items()}
+    strategies['linkedin']['optimal_times'] = ['08:00', '16:00']
+    strategies['linkedin']['posts_per_day'] = 2
+    config.posting_strategies = strategies
+    assert [slot.time for slot in config.get_cached_schedule('linkedin', 0)] == ['08:00', '16:00']
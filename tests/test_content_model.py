@@ -0,0 +1,43 @@
+"""Slotted pipeline items and their derived keys"""
+
+import hashlib
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from content_model import ContentItem, Proposal, from_struct_time
+
+
+def test_fingerprint_matches_hashes_already_stored():
+    item = ContentItem('forum', 'Treasury  Report Q3')
+    assert item.fingerprint == hashlib.md5('Treasury  Report Q3'.encode()).hexdigest()
+    assert item.normalized_title == 'treasury report q3'
+
+
+def test_content_key_prefers_the_url():
+    assert ContentItem('forum', 'Same title', url='https://a.example/1').content_key != \
+        ContentItem('news', 'Same title', url='https://b.example/1').content_key
+    assert ContentItem('forum', 'Same title').content_key == ContentItem('news', 'Same title').content_key
+
+
+def test_items_are_slotted():
+    with pytest.raises(AttributeError):
+        ContentItem('forum', 'Title').extra = 1
+    with pytest.raises(AttributeError):
+        Proposal('snapshot', 'MoonDAO', '1', 'Title', 'https://snapshot.org/1', 'active').extra = 1
+
+
+def test_proposal_keeps_its_description_as_the_snippet():
+    start = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    proposal = Proposal('snapshot', 'MoonDAO', '1', 'Fund lunar mission', 'https://snapshot.org/1', 'active',
+                        description='Send a rover', start_date=start)
+    assert proposal.type == 'proposal'
+    assert proposal.description == proposal.snippet == 'Send a rover'
+    assert proposal.published == start
+
+
+def test_from_struct_time():
+    assert from_struct_time(time.gmtime(0)) == datetime(1970, 1, 1, tzinfo=timezone.utc)
+    assert from_struct_time(None) is None
+    assert from_struct_time('not a time') is None
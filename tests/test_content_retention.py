@@ -0,0 +1,70 @@
+"""Archiving expired monitored_content rows"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from content_retention import ContentArchiver, read_segment
+from db_migrations import connect
+from storage_backends import SQLiteStorage
+
+
+@pytest.fixture
+def archive(db_path, tmp_path):
+    """Run one archival pass over the test database"""
+    async def run():
+        archiver = ContentArchiver(db_path, archive_dir=str(tmp_path / 'archive'), retention_days=30)
+        try:
+            return await archiver.run()
+        finally:
+            await archiver.close()
+    return lambda: asyncio.run(run())
+
+
+def add_content(db_path, key: str, days_old: int) -> int:
+    conn = connect(db_path)
+    cursor = conn.execute(
+        "INSERT INTO monitored_content (source, title, url, content_hash, discovered_at, summary) "
+        "VALUES ('forum', ?, ?, ?, ?, 'summary')",
+        (key, f"https://forum.example/{key}", f"hash-{key}", datetime.now() - timedelta(days=days_old))
+    )
+    conn.commit()
+    return cursor.lastrowid
+
+
+def test_expired_rows_move_to_an_archive_segment(archive, db_path, tmp_path):
+    add_content(db_path, 'old', days_old=45)
+    add_content(db_path, 'fresh', days_old=2)
+
+    stats = archive()
+
+    assert stats['archived'] == 1
+    segment, = stats['segments']
+    assert [row['title'] for row in read_segment(tmp_path / 'archive' / segment)] == ['old']
+    assert [row[0] for row in connect(db_path).execute("SELECT title FROM monitored_content")] == ['fresh']
+    assert archive()['archived'] == 0
+
+
+def test_archived_hashes_still_count_as_seen(archive, db_path):
+    add_content(db_path, 'old', days_old=45)
+    archive()
+
+    storage = SQLiteStorage(db_path)
+    assert asyncio.run(storage.content_exists('hash-old'))
+    assert not asyncio.run(storage.content_exists('hash-unknown'))
+
+
+def test_content_with_a_pending_slot_is_kept(archive, db_path):
+    scheduled = add_content(db_path, 'scheduled', days_old=45)
+    posted = add_content(db_path, 'posted', days_old=45)
+    conn = connect(db_path)
+    conn.executemany(
+        "INSERT INTO posting_schedule (platform, scheduled_time, content_id, status) VALUES ('twitter', ?, ?, ?)",
+        [(datetime.now() + timedelta(hours=1), scheduled, 'pending'),
+         (datetime.now() - timedelta(days=40), posted, 'posted')]
+    )
+    conn.commit()
+
+    assert archive()['archived'] == 1
+    assert [row[0] for row in connect(db_path).execute("SELECT title FROM monitored_content")] == ['scheduled']
@@ -0,0 +1,42 @@
+"""Cycle span trees and the trace ring buffer"""
+
+import time
+
+import pytest
+
+import cycle_trace
+from cycle_trace import CycleTraceLog, cycle_trace as trace_cycle, span
+
+
+def record(log: CycleTraceLog, name: str, over_budget: bool = False) -> int:
+    return log.record(name, time.time(), 1.0, 1.0, over_budget, {'root': {'name': name, 'duration': 1.0}})
+
+
+def test_ring_buffer_keeps_the_newest_traces_and_the_newest_slow_ones(db_path):
+    log = CycleTraceLog(db_path, keep=3)
+    slow = [record(log, f"slow-{i}", over_budget=True) for i in range(4)]
+    fast = [record(log, f"fast-{i}") for i in range(5)]
+
+    kept = [entry['id'] for entry in log.recent(limit=20)]
+    assert kept == sorted(fast[-3:] + slow[-3:], reverse=True)
+    assert [entry['id'] for entry in log.recent(limit=20, slow_only=True)] == slow[:0:-1]
+
+
+def test_traced_cycle_is_stored_with_its_spans(db_path, monkeypatch):
+    monkeypatch.setattr(cycle_trace, 'CycleTraceLog', lambda: CycleTraceLog(db_path))
+    with trace_cycle('daily_monitoring_cycle', budget=60):
+        with span('collect', source='forum'):
+            pass
+        with pytest.raises(ValueError), span('post'):
+            raise ValueError("rate limited")
+
+    entry, = CycleTraceLog(db_path).recent()
+    assert not entry['over_budget']
+    collect, post = entry['root']['children']
+    assert collect['attrs'] == {'source': 'forum'}
+    assert post['error'] == "ValueError: rate limited"
+
+
+def test_spans_outside_a_cycle_are_no_ops():
+    with span('collect') as current:
+        assert current is None
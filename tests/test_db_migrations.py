@@ -0,0 +1,100 @@
+"""Schema migrations from the layouts older code paths created"""
+
+import sqlite3
+
+from db_migrations import LATEST_VERSION, migrate
+
+# monitored_content and content_performance as setup_dao_monitoring.py created them
+SETUP_SCRIPT_SCHEMA = '''
+    CREATE TABLE monitored_content (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, source TEXT NOT NULL, title TEXT NOT NULL, url TEXT UNIQUE,
+        content_hash TEXT, discovered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, processed_at TIMESTAMP,
+        summary TEXT, posted_twitter BOOLEAN DEFAULT 0, posted_linkedin BOOLEAN DEFAULT 0,
+        posted_telegram BOOLEAN DEFAULT 0, engagement_score INTEGER DEFAULT 0, retweets INTEGER DEFAULT 0,
+        likes INTEGER DEFAULT 0, shares INTEGER DEFAULT 0
+    );
+    CREATE TABLE content_performance (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, content_id INTEGER, platform TEXT, post_id TEXT,
+        likes INTEGER DEFAULT 0, shares INTEGER DEFAULT 0, comments INTEGER DEFAULT 0, reach INTEGER DEFAULT 0,
+        posted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    INSERT INTO monitored_content (source, title, url, content_hash, summary)
+    VALUES ('Snapshot', 'Old item', 'https://example.org/old', 'abc', 'old summary');
+    INSERT INTO content_performance (content_id, platform, post_id, likes) VALUES (1, 'twitter', '42', 7);
+'''
+
+# viral_alerts and posting_schedule as unified_deployment.py created them
+DEPLOYER_SCHEMA = '''
+    CREATE TABLE viral_alerts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, content_title TEXT NOT NULL, viral_score INTEGER NOT NULL,
+        trending_hashtags TEXT, recommended_action TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        acted_upon BOOLEAN DEFAULT 0, result_engagement INTEGER DEFAULT 0
+    );
+    CREATE TABLE posting_schedule (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, platform TEXT NOT NULL, scheduled_time TIMESTAMP NOT NULL,
+        content_type TEXT, content TEXT, status TEXT DEFAULT 'pending', posted_at TIMESTAMP,
+        engagement_score INTEGER DEFAULT 0
+    );
+    INSERT INTO viral_alerts (content_title, viral_score) VALUES ('Old alert', 80);
+    INSERT INTO posting_schedule (platform, scheduled_time, status) VALUES ('twitter', '2025-01-01 09:00:00', 'posted');
+'''
+
+
+def legacy_database(path, schema: str):
+    conn = sqlite3.connect(path)
+    conn.executescript(schema)
+    conn.close()
+
+
+def columns(conn, table: str):
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def test_setup_script_database_is_upgraded_in_place(db_path):
+    legacy_database(db_path, SETUP_SCRIPT_SCHEMA)
+
+    assert migrate(db_path) == LATEST_VERSION
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == LATEST_VERSION
+    assert conn.execute("SELECT title, summary FROM monitored_content").fetchall() == [('Old item', 'old summary')]
+    assert {'viral_score', 'engagement_twitter'} <= columns(conn, 'monitored_content')
+    assert 'captured_at' in columns(conn, 'content_performance')
+    assert conn.execute("SELECT likes FROM content_performance WHERE post_id = '42'").fetchone() == (7,)
+    # Tables the old layout never had are created
+    assert {'dao_proposals', 'growth_metrics', 'monitor_events', 'social_posts', 'llm_calls'} <= {
+        row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    }
+
+
+def test_deployer_database_gets_the_new_alert_and_schedule_columns(db_path):
+    legacy_database(db_path, DEPLOYER_SCHEMA)
+
+    assert migrate(db_path) == LATEST_VERSION
+
+    conn = sqlite3.connect(db_path)
+    assert {'content_key', 'url', 'source', 'updated_at'} <= columns(conn, 'viral_alerts')
+    assert {'priority', 'content_id', 'post_id'} <= columns(conn, 'posting_schedule')
+    assert conn.execute("SELECT content_title, viral_score FROM viral_alerts").fetchall() == [('Old alert', 80)]
+    assert conn.execute("SELECT status FROM posting_schedule").fetchall() == [('posted',)]
+
+
+def test_migrate_is_safe_to_run_twice(db_path):
+    legacy_database(db_path, SETUP_SCRIPT_SCHEMA)
+    assert migrate(db_path) == LATEST_VERSION
+    schema = sqlite3.connect(db_path).execute("SELECT sql FROM sqlite_master ORDER BY name").fetchall()
+
+    assert migrate(db_path) == LATEST_VERSION
+    assert sqlite3.connect(db_path).execute("SELECT sql FROM sqlite_master ORDER BY name").fetchall() == schema
+
+
+def test_interrupted_version_reruns_its_migrations(db_path):
+    """Migrations only add what is missing, so replaying them over a half-migrated file is harmless"""
+    legacy_database(db_path, SETUP_SCRIPT_SCHEMA)
+    migrate(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA user_version = 0")
+    conn.close()
+
+    assert migrate(db_path) == LATEST_VERSION
+    assert sqlite3.connect(db_path).execute("SELECT COUNT(*) FROM monitored_content").fetchone() == (1,)
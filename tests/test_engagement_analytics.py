@@ -0,0 +1,53 @@
+"""Columnar engagement reports over content_performance snapshots"""
+
+import pytest
+
+from db_migrations import connect
+from engagement_analytics import EngagementFrame
+
+
+@pytest.fixture
+def frame(db_path):
+    conn = connect(db_path)
+    conn.executemany("INSERT INTO social_posts (platform, post_id, text, created_at) VALUES ('twitter', ?, ?, ?)", [
+        ('1', 'Morning recap', '2030-01-01 09:00:00'),
+        ('2', 'Afternoon recap', '2030-01-01T14:00:00+00:00'),
+        ('3', 'Governance alpha', '2030-01-03 09:00:00'),
+    ])
+    # Post 1 has an older snapshot that must be ignored
+    conn.executemany('''
+        INSERT INTO content_performance (platform, post_id, likes, shares, comments, reach)
+        VALUES ('twitter', ?, ?, ?, ?, ?)
+    ''', [('1', 1, 0, 0, 100), ('2', 1, 0, 0, 100), ('1', 10, 5, 5, 1000), ('3', 30, 0, 0, 100)])
+    conn.execute("INSERT INTO posting_schedule (platform, scheduled_time, content_type, post_id, status) "
+                 "VALUES ('twitter', '2030-01-03 09:00:00', 'alpha', '3', 'posted')")
+    conn.commit()
+    return EngagementFrame.from_db(conn)
+
+
+def test_latest_snapshot_per_post_is_used(frame):
+    assert len(frame) == 3
+    assert sorted(frame.engagement_rate.tolist()) == [1.0, 2.0, 30.0]
+    assert frame.average_rate() == pytest.approx(11.0)
+
+
+def test_breakdowns(frame):
+    assert [frame.post(i)['post_id'] for i in frame.outliers()] == ['3']
+    assert [frame.post(i)['post_id'] for i in frame.top(2)] == ['3', '1']
+    assert frame.hour_of_day() == {9: {'posts': 2, 'avg_rate': 16.0}, 14: {'posts': 1, 'avg_rate': 1.0}}
+    assert frame.by_content_type() == {'alpha': {'posts': 1, 'avg_rate': 30.0},
+                                       'unknown': {'posts': 2, 'avg_rate': 1.5}}
+
+
+def test_rolling_rate_pools_interactions_over_the_window(frame):
+    assert frame.rolling_rate(window_days=2) == [
+        {'date': '2030-01-01', 'rate': 1.91},
+        {'date': '2030-01-02', 'rate': 1.91},
+        {'date': '2030-01-03', 'rate': 30.0},
+    ]
+
+
+def test_empty_history_reports_zeroes(db_path):
+    report = EngagementFrame.from_db(connect(db_path)).report()
+    assert report['total_posts'] == 0 and report['average_rate'] == 0.0
+    assert report['high_performers'] == [] and report['rolling_rate'] == []
@@ -0,0 +1,105 @@
+"""Incremental timeline ingestion into the engagement store"""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+import engagement_ingest
+from db_migrations import connect
+from engagement_ingest import EngagementIngestor
+
+PAGE_SIZE = 2
+
+
+class FakeTimeline:
+    """Twitter v2 user timeline with since_id/until_id filtering and fixed-size pages"""
+
+    def __init__(self):
+        self.tweets = []
+
+    def post(self, *ids):
+        for tweet_id in ids:
+            self.tweets.append(SimpleNamespace(
+                id=tweet_id, text=f"tweet {tweet_id}", created_at=datetime.now(timezone.utc),
+                public_metrics={'like_count': 1, 'retweet_count': 0, 'reply_count': 0, 'impression_count': 10}
+            ))
+
+    def get_users_tweets(self, id, since_id=None, until_id=None, pagination_token=None, **kwargs):
+        matching = sorted((t for t in self.tweets
+                           if (since_id is None or t.id > int(since_id))
+                           and (until_id is None or t.id < int(until_id))), key=lambda t: -t.id)
+        start = int(pagination_token or 0)
+        page = matching[start:start + PAGE_SIZE]
+        meta = {'newest_id': str(page[0].id), 'oldest_id': str(page[-1].id)} if page else {}
+        if start + PAGE_SIZE < len(matching):
+            meta['next_token'] = str(start + PAGE_SIZE)
+        return SimpleNamespace(data=page, meta=meta)
+
+    def get_tweets(self, ids, **kwargs):
+        wanted = {int(i) for i in ids}
+        return SimpleNamespace(data=[t for t in self.tweets if t.id in wanted])
+
+
+@pytest.fixture
+def timeline(monkeypatch):
+    monkeypatch.setattr(engagement_ingest, 'MAX_TIMELINE_PAGES', 2)
+    return FakeTimeline()
+
+
+def stored_ids(conn):
+    return sorted(int(row[0]) for row in conn.execute("SELECT post_id FROM social_posts"))
+
+
+def test_backlog_beyond_the_page_limit_is_ingested_over_later_runs(timeline, db_path):
+    conn = connect(db_path)
+    ingestor = EngagementIngestor(timeline, conn)
+
+    timeline.post(1, 2)
+    ingestor.ingest()
+    assert ingestor._state() == ('2', None, None)
+
+    # Ten new tweets: two pages of two per run is not enough to reach since_id
+    timeline.post(*range(3, 13))
+    ingestor.ingest()
+    assert ingestor._state() == ('2', '9', '12')
+    ingestor.ingest()
+    assert ingestor._state() == ('2', '5', '12')
+
+    # Posted while the backlog drains; picked up once since_id advances
+    timeline.post(13)
+    ingestor.ingest()
+    assert ingestor._state() == ('12', None, None)
+    ingestor.ingest()
+
+    assert stored_ids(conn) == list(range(1, 14))
+    assert ingestor._state() == ('13', None, None)
+
+
+
+def test_pages_stored_before_a_failure_are_kept(timeline, db_path):
+    conn = connect(db_path)
+    ingestor = EngagementIngestor(timeline, conn)
+    timeline.post(1, 2)
+    ingestor.ingest()
+    timeline.post(3, 4, 5, 6)
+
+    fetch_page = timeline.get_users_tweets
+
+    def fail_after_first_page(**kwargs):
+        if kwargs.get('pagination_token'):
+            raise ConnectionError("timeline unavailable")
+        return fetch_page(**kwargs)
+
+    timeline.get_users_tweets = fail_after_first_page
+    with pytest.raises(ConnectionError):
+        ingestor.ingest()
+
+    # The first page and its place in the pass were committed together
+    assert stored_ids(conn) == [1, 2, 5, 6]
+    assert ingestor._state() == ('2', '5', '6')
+
+    timeline.get_users_tweets = fetch_page
+    ingestor.ingest()
+    assert stored_ids(conn) == list(range(1, 7))
+    assert ingestor._state() == ('6', None, None)
@@ -0,0 +1,58 @@
+"""Message Batches bulk generation"""
+
+import asyncio
+import json
+
+import pytest
+
+from llm_batch import MARKETING_GENERATORS, batch_results, load_marketing_generator
+from llm_gateway import LLMGateway, get_gateway
+from llm_metrics import LLMMetricsRecorder
+
+
+class FakeBatchGateway(LLMGateway):
+    """Gateway serving a fixed results file instead of calling the API"""
+
+    def __init__(self, results_body: str):
+        super().__init__(api_key="test")
+        self.metrics = LLMMetricsRecorder(enabled=True)
+        self.results_body = results_body
+        self.requested = []
+
+    async def request(self, method, path, body=None, as_json=True):
+        self.requested.append((method, path))
+        return self.results_body
+
+
+def succeeded(custom_id: str, text: str) -> dict:
+    return {'custom_id': custom_id, 'result': {'type': 'succeeded', 'message': {
+        'model': 'claude-3-5-sonnet-20241022', 'content': [{'type': 'text', 'text': text}],
+        'usage': {'input_tokens': 100, 'output_tokens': 20}}}}
+
+
+def test_errored_and_expired_requests_map_to_none():
+    lines = [
+        succeeded('day-1', 'first post'),
+        {'custom_id': 'day-2', 'result': {'type': 'errored',
+                                          'error': {'type': 'invalid_request_error', 'message': 'too long'}}},
+        {'custom_id': 'day-3', 'result': {'type': 'expired'}},
+        succeeded('day-4', 'fourth post'),
+    ]
+    gateway = FakeBatchGateway('\n'.join(json.dumps(line) for line in lines) + '\n\n')
+
+    results = asyncio.run(batch_results({'results_url': 'https://results/batch_1'}, gateway, caller="batch.test"))
+
+    assert results == {'day-1': 'first post', 'day-2': None, 'day-3': None, 'day-4': 'fourth post'}
+    assert gateway.requested == [('GET', 'https://results/batch_1')]
+    # Only succeeded requests count towards token usage; every request is recorded in the metrics
+    assert gateway.usage.requests == 2
+    assert gateway.usage.totals['input_tokens'] == 200
+    statuses = [row[3] for row in gateway.metrics._pending]
+    assert statuses == ['ok', 'errored', 'expired', 'ok']
+    assert all(row[-1] == 1 for row in gateway.metrics._pending)
+
+
+@pytest.mark.parametrize('name', sorted(MARKETING_GENERATORS))
+def test_marketing_generators_share_the_process_gateway(name, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert load_marketing_generator(name).llm is get_gateway()
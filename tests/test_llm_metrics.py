@@ -0,0 +1,43 @@
+"""Cost estimates and the buffered llm_calls log"""
+
+import pytest
+
+from db_migrations import connect
+from llm_metrics import LLMMetricsRecorder, estimate_cost, llm_metrics_summary
+
+
+def test_cost_uses_the_longest_matching_model_family():
+    usage = {'input_tokens': 1_000_000, 'output_tokens': 100_000}
+    assert estimate_cost('claude-3-5-haiku-20241022', usage) == pytest.approx(0.8 + 0.4)
+    assert estimate_cost('claude-3-haiku-20240307', usage) == pytest.approx(0.25 + 0.125)
+    assert estimate_cost('gpt-4o', usage) is None
+
+
+def test_cache_and_batch_pricing():
+    usage = {'cache_creation_input_tokens': 1_000_000, 'cache_read_input_tokens': 1_000_000}
+    assert estimate_cost('claude-3-5-sonnet-20241022', usage) == pytest.approx(3.0 * 1.25 + 3.0 * 0.1)
+    assert estimate_cost('claude-3-5-sonnet-20241022', {'output_tokens': 1_000_000}, batch=True) == \
+        pytest.approx(7.5)
+
+
+def test_calls_are_buffered_then_summarized(db_path):
+    recorder = LLMMetricsRecorder(db_path, enabled=True)
+    usage = {'input_tokens': 1000, 'output_tokens': 200}
+    for latency in (0.4, 1.5, 3.0):
+        recorder.record('DAOMonitoringLLM', 'claude-3-5-haiku-20241022', latency, usage)
+    recorder.record('DAOMonitoringLLM', 'claude-3-5-haiku-20241022', 0.2, status='error', http_status=529)
+
+    assert connect(db_path).execute("SELECT COUNT(*) FROM llm_calls").fetchone() == (0,)
+    recorder.flush()
+
+    group, = llm_metrics_summary(db_path=db_path)['by_caller']
+    assert (group['calls'], group['errors'], group['input_tokens']) == (4, 1, 3000)
+    assert group['latency_p50'] == 0.4 and group['latency_max'] == 3.0
+    assert group['latency_histogram']['le_0.5s'] == 2 and group['latency_histogram']['le_5s'] == 1
+
+
+def test_disabled_recorder_writes_nothing(db_path):
+    recorder = LLMMetricsRecorder(db_path, enabled=False)
+    recorder.record('DAOMonitoringLLM', 'claude-3-5-haiku-20241022', 0.4)
+    recorder.flush()
+    assert connect(db_path).execute("SELECT COUNT(*) FROM llm_calls").fetchone() == (0,)
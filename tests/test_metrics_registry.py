@@ -0,0 +1,31 @@
+"""Prometheus text exposition of counters and histograms"""
+
+from metrics_registry import Counter, Histogram, _render_metric
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram('step_seconds', 'Step duration', ('step',), buckets=(1.0, 0.1))
+    for value in (0.05, 0.5, 0.5, 1.0, 5.0):
+        histogram.observe(value, step='collect')
+
+    lines = _render_metric('step_seconds', [(None, histogram.snapshot())])
+
+    assert lines == [
+        '# HELP step_seconds Step duration',
+        '# TYPE step_seconds histogram',
+        'step_seconds_bucket{step="collect",le="0.1"} 1',
+        'step_seconds_bucket{step="collect",le="1"} 4',
+        'step_seconds_bucket{step="collect",le="+Inf"} 5',
+        'step_seconds_sum{step="collect"} 7.050000',
+        'step_seconds_count{step="collect"} 5',
+    ]
+
+
+def test_other_processes_render_under_a_process_label():
+    local, worker = Counter('posts_total', 'Posts', ('platform',)), Counter('posts_total', 'Posts', ('platform',))
+    local.inc(platform='twitter')
+    worker.inc(3, platform='twitter')
+
+    lines = _render_metric('posts_total', [(None, local.snapshot()), ('worker:42', worker.snapshot())])
+
+    assert lines[2:] == ['posts_total{platform="twitter"} 1', 'posts_total{platform="twitter",process="worker:42"} 3']
@@ -0,0 +1,18 @@
+"""WebSocket connection bookkeeping in the mobile backend"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+import mobile_app_backend
+
+
+def test_failed_websocket_is_removed_from_every_topic():
+    client = TestClient(mobile_app_backend.app)
+    # Binary frames are not part of the protocol and make the handler raise
+    with pytest.raises(KeyError):
+        with client.websocket_connect('/ws') as websocket:
+            assert websocket.receive_json()['type'] == 'welcome'
+            assert len(mobile_app_backend.manager.active_connections) == 1
+            websocket.send_bytes(b'\x00')
+
+    assert mobile_app_backend.manager.active_connections == {}
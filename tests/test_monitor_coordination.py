@@ -0,0 +1,51 @@
+"""Event log and command queue shared between API workers and the monitor"""
+
+from monitor_coordination import MAX_COMMAND_ATTEMPTS, MonitorCommandQueue, MonitorEventLog
+
+
+def test_metric_deltas_are_logged_once_across_workers(db_path):
+    first, second = MonitorEventLog(db_path), MonitorEventLog(db_path)
+    metrics = {'twitter': {'followers': 10, 'engagement_rate': 0.5}}
+
+    event_id = first.append_metric_deltas(metrics)
+    assert event_id is not None
+    assert second.append_metric_deltas(metrics) is None
+
+    [(logged_id, topic, _, payload)] = second.read_since(0)
+    assert (logged_id, topic) == (event_id, 'metrics')
+    assert payload == {'snapshot': False, 'metrics': metrics}
+
+
+def test_metric_deltas_carry_only_changed_fields(db_path):
+    first, second = MonitorEventLog(db_path), MonitorEventLog(db_path)
+    first.append_metric_deltas({'twitter': {'followers': 10, 'engagement_rate': 0.5}})
+    last_id = first.latest_id()
+
+    second.append_metric_deltas({'twitter': {'followers': 12, 'engagement_rate': 0.5}})
+
+    [(_, _, _, payload)] = first.read_since(last_id)
+    assert payload['metrics'] == {'twitter': {'followers': 12}}
+
+
+def test_commands_left_running_by_a_crashed_leader_are_requeued(db_path):
+    queue = MonitorCommandQueue(db_path)
+    command_id = queue.enqueue('manual_post', {'platform': 'twitter', 'content': 'gm'})
+    assert queue.claim_next('old-leader')[0] == command_id
+    assert queue.claim_next('old-leader') is None
+
+    assert queue.requeue_stale('new-leader') == 1
+    assert queue.claim_next('new-leader') == (command_id, 'manual_post', {'platform': 'twitter', 'content': 'gm'})
+    # The new leader's own running command is not touched by its next takeover check
+    assert queue.requeue_stale('new-leader') == 0
+
+
+def test_command_that_keeps_outliving_leaders_is_failed(db_path):
+    queue = MonitorCommandQueue(db_path)
+    command_id = queue.enqueue('run_cycle')
+    for attempt in range(MAX_COMMAND_ATTEMPTS):
+        assert queue.claim_next(f'leader-{attempt}')[0] == command_id
+        queue.requeue_stale(f'leader-{attempt + 1}')
+
+    assert queue.claim_next('last-leader') is None
+    status = queue.conn.execute("SELECT status FROM monitor_commands WHERE id = ?", (command_id,)).fetchone()
+    assert status == ('failed',)
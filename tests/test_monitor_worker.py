@@ -0,0 +1,57 @@
+"""Leader lease handling of the monitor service"""
+
+import asyncio
+import time
+
+from monitor_coordination import LeaderLease
+from monitor_worker import MonitorService
+
+
+class BlockingMonitor:
+    """Monitoring cycle that blocks its thread, like feedparser or tweepy calls do"""
+
+    twitter_api = None
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.cycles = 0
+
+    async def daily_monitoring_cycle(self, post_content: bool = True):
+        time.sleep(self.seconds)
+        self.cycles += 1
+
+
+class IdleScheduler:
+    async def run(self):
+        await asyncio.Event().wait()
+
+    def notify(self):
+        pass
+
+
+def test_blocking_cycle_neither_loses_the_lease_nor_stalls_the_loop():
+    async def scenario():
+        service = MonitorService(lease_ttl_seconds=1)
+        service.monitor = BlockingMonitor(seconds=2.5)
+        service.scheduler = IdleScheduler()
+        rival = LeaderLease(ttl_seconds=1)
+
+        task = asyncio.create_task(service.run())
+        try:
+            started = time.monotonic()
+            await asyncio.sleep(2)
+            # The caller's loop kept running while the cycle blocked its own thread
+            assert time.monotonic() - started < 2.4
+            assert service.monitor.cycles == 0
+            # Well past the TTL, the lease is still renewed
+            assert not rival.try_acquire()
+            await asyncio.sleep(1)
+            assert service.monitor.cycles == 1
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        assert rival.try_acquire()
+        rival.release()
+
+    asyncio.run(scenario())
@@ -0,0 +1,79 @@
+"""Concurrent weekly batch generation for the Marketing generators"""
+
+import asyncio
+
+from post_batch import FAILED_POST, generate_batch, run_batch
+
+
+class ScriptedLLM:
+    """Replies with the next scripted post for each theme"""
+
+    def __init__(self, replies):
+        self.replies = {theme: list(posts) for theme, posts in replies.items()}
+        self.prompts = []
+        self.closed = False
+
+    async def complete(self, prompt, model, max_tokens, system=None, caller=None):
+        self.prompts.append((prompt, system))
+        await asyncio.sleep(0)
+        reply = self.replies[prompt].pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeGenerator:
+    model = 'claude-test'
+    system_prompt = 'Write DAO treasury posts.'
+
+    def __init__(self, replies):
+        self.llm = ScriptedLLM(replies)
+        self.history = []
+
+    def build_prompt(self, theme):
+        return theme
+
+    def is_duplicate(self, post):
+        return post in self.history
+
+    def add_to_history(self, post):
+        self.history.append(post)
+
+
+def test_posts_come_back_in_theme_order_and_are_repaired():
+    generator = FakeGenerator({
+        'runway': ["Here's a tweet:\n**Runway** check #DAO"],
+        'diversification': [RuntimeError("overloaded"), 'Diversify the treasury #DAO'],
+    })
+    finished = []
+
+    posts = asyncio.run(generate_batch(generator, ['runway', 'diversification'],
+                                       on_post=lambda index, theme, post: finished.append(index)))
+
+    assert posts == ['Runway check #DAO', 'Diversify the treasury #DAO']
+    assert sorted(finished) == [0, 1]
+    assert generator.history == ['Runway check #DAO', 'Diversify the treasury #DAO']
+    assert {system for _, system in generator.llm.prompts} == {'Write DAO treasury posts.'}
+
+
+def test_a_post_accepted_for_one_theme_is_a_duplicate_for_the_others():
+    generator = FakeGenerator({
+        'runway': ['Treasury tip #DAO', 'Plan 18 months of runway #DAO'],
+        'reserves': ['Treasury tip #DAO', 'Keep reserves in stablecoins #DAO'],
+    })
+
+    posts = asyncio.run(generate_batch(generator, ['runway', 'reserves']))
+
+    # Both themes draft the same post at once; whichever finishes second retries
+    assert posts.count('Treasury tip #DAO') == 1
+    assert FAILED_POST not in posts and len(set(generator.history)) == 2
+
+
+def test_theme_gives_up_after_max_attempts_and_the_gateway_is_closed():
+    generator = FakeGenerator({'runway': ['', '   ']})
+
+    assert run_batch(generator, ['runway'], max_attempts=2) == [FAILED_POST]
+    assert generator.llm.closed
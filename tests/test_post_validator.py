@@ -0,0 +1,41 @@
+"""Local validation and repair of generated posts"""
+
+from post_validator import PLATFORM_LIMITS, repair_post, tweet_length, validate_post
+
+SENTENCE = "Treasury diversification keeps runway stable through drawdowns."
+LONG_BODY = "📊 " + " ".join([SENTENCE] * 8)
+SOURCE = "https://forum.arbitrum.foundation/t/treasury-diversification"
+
+
+def test_over_length_post_is_trimmed_at_a_sentence_keeping_link_and_hashtags():
+    post = repair_post(f"{LONG_BODY} {SOURCE} #DAO #Treasury")
+
+    assert validate_post(post) == []
+    assert tweet_length(post) <= PLATFORM_LIMITS['twitter']
+    assert post.endswith(f"drawdowns. {SOURCE} #DAO #Treasury")
+
+
+def test_hashtags_on_their_own_line_survive_trimming():
+    post = repair_post(f"{LONG_BODY}\n\n#DAO #Treasury")
+
+    assert validate_post(post) == []
+    assert post.endswith("drawdowns. #DAO #Treasury")
+
+
+def test_link_before_a_hashtag_line_survives_trimming():
+    post = repair_post(f"{LONG_BODY} {SOURCE}\n#DAO #Treasury #DeFi #Web3")
+
+    assert validate_post(post) == []
+    assert SOURCE in post and '#DAO' in post
+    assert '#Web3' not in post
+
+
+def test_short_post_only_loses_formatting_and_extra_hashtags():
+    post = repair_post('Here\'s a tweet:\n"**Runway** check\nfor DAOs #DAO #dao #Treasury #DeFi #Web3"')
+    assert post == "Runway check\nfor DAOs #DAO #Treasury #DeFi"
+
+
+def test_telegram_uses_plain_character_count():
+    post = repair_post("💰 " + " ".join([SENTENCE] * 12), platform='telegram')
+    assert len(post) <= PLATFORM_LIMITS['telegram']
+    assert validate_post(post, 'telegram') == []
@@ -0,0 +1,101 @@
+"""Materialization of posting_schedule when learned posting times move"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from aggressive_growth_config import AggressiveGrowthConfig
+from db_migrations import connect
+from posting_scheduler import PostingScheduler, load_day_slots
+
+
+class FixedTimes:
+    """Stand-in optimizer whose best times the test moves by hand"""
+
+    def __init__(self, times):
+        self.times = times
+        self.version = 0
+
+    def move_to(self, times):
+        self.times = times
+        self.version += 1
+
+    def best_times(self, platform, weekday, count):
+        return self.times[:count]
+
+    def refresh(self, conn):
+        return False
+
+
+@pytest.fixture
+def scheduler(db_path):
+    config = AggressiveGrowthConfig()
+    config.time_optimizer = FixedTimes(['09:00', '13:00', '18:00'])
+    return PostingScheduler(monitor=None, growth_config=config, db_path=db_path)
+
+
+def day_slots(conn, day, platform='twitter'):
+    start = datetime.combine(day, datetime.min.time())
+    return conn.execute('''
+        SELECT substr(scheduled_time, 12, 5), status FROM posting_schedule
+        WHERE platform = ? AND scheduled_time >= ? AND scheduled_time < ?
+        ORDER BY scheduled_time
+    ''', (platform, start, start + timedelta(days=1))).fetchall()
+
+
+def test_moved_times_supersede_pending_slots(scheduler, db_path):
+    # A Monday, so posts_per_day is not reduced for the weekend
+    day = date(2030, 1, 7)
+    scheduler.materialize_day(day)
+    scheduler.growth_config.time_optimizer.move_to(['10:00', '13:00', '20:00'])
+    scheduler.materialize_day(day)
+
+    live = [time for time, status in day_slots(connect(db_path), day) if status == 'pending']
+    assert live == ['10:00', '13:00', '20:00']
+
+
+def test_slots_that_ran_are_kept(scheduler, db_path):
+    day = date(2030, 1, 7)
+    scheduler.materialize_day(day)
+    conn = connect(db_path)
+    conn.execute("UPDATE posting_schedule SET status = 'posted' WHERE scheduled_time = ?",
+                 (datetime.combine(day, datetime.min.time()).replace(hour=9),))
+    conn.commit()
+
+    scheduler.growth_config.time_optimizer.move_to(['10:00', '13:00', '20:00'])
+    scheduler.materialize_day(day)
+
+    assert dict(day_slots(conn, day)) == {
+        '09:00': 'posted', '10:00': 'pending', '13:00': 'pending', '18:00': 'superseded', '20:00': 'pending'
+    }
+
+
+def test_superseded_slot_is_revived_when_its_time_returns(scheduler, db_path):
+    day = date(2030, 1, 7)
+    optimizer = scheduler.growth_config.time_optimizer
+    scheduler.materialize_day(day)
+    optimizer.move_to(['10:00', '13:00', '20:00'])
+    scheduler.materialize_day(day)
+    optimizer.move_to(['09:00', '13:00', '18:00'])
+    scheduler.materialize_day(day)
+
+    live = [time for time, status in day_slots(connect(db_path), day) if status == 'pending']
+    assert live == ['09:00', '13:00', '18:00']
+
+
+def test_day_slots_report_materialized_rows(scheduler, db_path):
+    day = date(2030, 1, 7)
+    scheduler.materialize_day(day)
+    conn = connect(db_path)
+    conn.execute("UPDATE posting_schedule SET status = 'failed' WHERE scheduled_time = ?",
+                 (datetime.combine(day, datetime.min.time()).replace(hour=18),))
+    conn.commit()
+
+    scheduler.growth_config.time_optimizer.move_to(['10:00', '13:00', '20:00'])
+    scheduler.materialize_day(day)
+
+    twitter = load_day_slots(conn, day)['twitter']
+    assert [(slot['time'], slot['status']) for slot in twitter] == [
+        ('10:00', 'pending'), ('13:00', 'pending'), ('18:00', 'failed'), ('20:00', 'pending')
+    ]
+    assert twitter[0]['engagement_target']
@@ -0,0 +1,36 @@
+"""Learned posting times and the schedules built from them"""
+
+from datetime import datetime
+
+from aggressive_growth_config import AggressiveGrowthConfig
+from posting_time_optimizer import attach_optimizer
+
+
+def test_schedule_without_engagement_data_equals_the_static_one():
+    static = AggressiveGrowthConfig()
+    learned = AggressiveGrowthConfig()
+    attach_optimizer(learned)
+
+    for platform in static.posting_strategies:
+        for day_of_week in range(7):
+            assert (learned.get_daily_aggressive_schedule(platform, day_of_week)
+                    == static.get_daily_aggressive_schedule(platform, day_of_week))
+
+
+def test_configured_times_keep_their_content_type_when_a_learned_time_joins():
+    config = AggressiveGrowthConfig()
+    optimizer = attach_optimizer(config)
+    static_types = {slot['time']: slot['content_type'] for slot in config.get_daily_aggressive_schedule('linkedin', 0)}
+
+    # Strong results at 14:00 and weak ones at 17:00 on Mondays move a slot
+    monday = datetime(2026, 10, 19)
+    for post in range(30):
+        optimizer.observe('linkedin', f'strong-{post}', monday.replace(hour=14), 10.0)
+        optimizer.observe('linkedin', f'weak-{post}', monday.replace(hour=17), 0.1)
+    schedule = config.get_daily_aggressive_schedule('linkedin', 0)
+
+    times = [slot['time'] for slot in schedule]
+    assert '14:00' in times and '17:00' not in times
+    for slot in schedule:
+        if slot['time'] in static_types:
+            assert slot['content_type'] == static_types[slot['time']]
@@ -0,0 +1,30 @@
+"""System prompts in the request bodies sent to the Messages API"""
+
+import asyncio
+import json
+from datetime import datetime
+
+from dao_monitoring_llm import SUMMARY_INSTRUCTIONS, SUMMARY_SYSTEM_PROMPT, DAOMonitoringLLM, educational_item
+from llm_gateway import get_gateway
+
+
+def test_summary_request_sends_uncached_instructions_as_system(monkeypatch):
+    bodies = []
+
+    async def fake_request(method, path, body=None, as_json=True):
+        bodies.append(body)
+        reply = json.dumps({'twitter': "📊 Runway check. #DAO", 'telegram': "💰 Runway memo."})[1:]
+        return {'model': body['model'], 'content': [{'type': 'text', 'text': reply}],
+                'usage': {'input_tokens': 900, 'output_tokens': 40}}
+
+    monkeypatch.setattr(get_gateway(), 'request', fake_request)
+    item = educational_item('treasury_education', datetime(2026, 10, 19), "Runway should cover 12-18 months.")
+    assert asyncio.run(DAOMonitoringLLM()._generate_summary(item))
+
+    body, = bodies
+    # Below the 1024-token minimum, so no cache_control marker anywhere in the request
+    assert body['system'] == SUMMARY_SYSTEM_PROMPT
+    assert 'cache_control' not in json.dumps(body)
+    assert SUMMARY_INSTRUCTIONS not in json.dumps(body['messages'])
+    # Only instructions and the worked example; no sample posts with made-up figures
+    assert 'REFERENCE POSTS' not in body['system']
@@ -0,0 +1,47 @@
+"""Parsing and repair of per-platform summaries"""
+
+from social_summaries import dump_summaries, parse_summaries, repair_summaries, summary_problem
+
+TWEET = "📊 Arbitrum moves 35M ARB into stablecoins. #TreasuryAnalysis #DAO"
+MEMO = "💰 Treasury memo: two years of grants no longer depend on ARB price."
+
+
+def test_json_object_with_chatter_and_code_fences():
+    reply = f'Sure, here it is:\n```json\n{dump_summaries({"twitter": TWEET, "telegram": MEMO})}\n```'
+    assert parse_summaries(reply) == {'twitter': TWEET, 'telegram': MEMO}
+
+
+def test_malformed_json_yields_nothing_instead_of_raising():
+    assert parse_summaries('{"twitter": "unterminated') == {}
+    assert parse_summaries('{"twitter": ') == {}
+    assert parse_summaries('') == {}
+    assert parse_summaries(None) == {}
+
+
+def test_missing_empty_and_unknown_fields_are_dropped():
+    reply = dump_summaries({'twitter': '  ', 'telegram': MEMO, 'linkedin': "not a platform"})
+    assert parse_summaries(reply) == {'telegram': MEMO}
+    assert parse_summaries('{"twitter": 42, "telegram": null}') == {}
+
+
+def test_legacy_free_text_format_still_parses():
+    stored = f"1. Twitter\n{TWEET}\n\n2. Telegram\n{MEMO}\nSecond line."
+    assert parse_summaries(stored) == {'twitter': TWEET, 'telegram': f"{MEMO}\nSecond line."}
+
+
+def test_summary_problem_names_missing_and_over_length_fields():
+    assert summary_problem('twitter', None) == "is missing"
+    assert summary_problem('twitter', '   ') == "is missing"
+    assert "over the 500 character limit" in summary_problem('telegram', "x" * 501)
+    assert summary_problem('twitter', TWEET) is None
+
+
+def test_repair_trims_long_fields_and_leaves_missing_ones_out():
+    long_tweet = "📊 " + " ".join(["Stablecoin runway protects grant budgets."] * 10) + " #DAO"
+    repaired = repair_summaries({'twitter': long_tweet})
+
+    assert set(repaired) == {'twitter'}
+    assert summary_problem('twitter', repaired['twitter']) is None
+    assert repaired['twitter'].endswith('#DAO')
+    # Fields that come back empty after cleanup cannot be posted
+    assert repair_summaries({'twitter': '""', 'telegram': MEMO}) == {'telegram': MEMO}
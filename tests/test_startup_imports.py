@@ -0,0 +1,29 @@
+"""Importing the monitor must not pull in heavy dependencies"""
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def loaded_after_import(module: str, candidates):
+    code = (f"import sys, {module}; "
+            f"print(','.join(name for name in {list(candidates)!r} if name in sys.modules))")
+    output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=os.environ,
+                            capture_output=True, text=True, check=True).stdout.strip()
+    return set(filter(None, output.split(',')))
+
+
+def test_monitor_import_stays_lazy():
+    heavy = ('numpy', 'tweepy', 'telegram', 'PIL', 'feedparser', 'bs4', 'engagement_ingest')
+    assert loaded_after_import('dao_monitoring_llm', heavy) == set()
+
+
+def test_engagement_ingest_does_not_load_the_scheduler():
+    assert loaded_after_import('engagement_ingest', ('posting_scheduler', 'numpy')) == set()
+
+
+def test_api_import_does_not_load_numpy():
+    heavy = ('numpy', 'tweepy', 'telegram', 'PIL', 'feedparser', 'bs4')
+    assert loaded_after_import('mobile_app_backend', heavy) == set()
@@ -0,0 +1,167 @@
+"""Repository contract shared by the SQLite and Postgres storage backends"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from content_model import Proposal
+from storage_backends import HostConflictError, PostgresStorage, SQLiteStorage, Storage
+
+
+@pytest.fixture(params=['sqlite', 'postgres'])
+def make_storage(request, db_path):
+    if request.param == 'sqlite':
+        return lambda: SQLiteStorage(db_path)
+    postgres_url = request.getfixturevalue('postgres_url')
+    return lambda: PostgresStorage(postgres_url, min_size=1, max_size=2, host_id='test-host')
+
+
+def run(make_storage, scenario):
+    """Run `scenario(storage)` on one event loop and close the storage afterwards"""
+    async def main():
+        storage = make_storage()
+        try:
+            return await scenario(storage)
+        finally:
+            await storage.close()
+    return asyncio.run(main())
+
+
+def proposal(n: int, status: str = 'active') -> Proposal:
+    return Proposal(source='snapshot', dao_name='MoonDAO', proposal_id=str(n), title=f"Proposal {n}", description='',
+                    status=status, end_date=datetime(2026, 1, 1), url=f"https://snapshot.org/#/p/{n}")
+
+
+def test_storage_is_abstract():
+    with pytest.raises(TypeError):
+        Storage()
+
+
+def test_insert_content_ignores_duplicate_urls(make_storage):
+    async def scenario(storage):
+        first = await storage.insert_content('rss', 'Title', 'https://a.example/1', 'hash-1', 'Summary')
+        again = await storage.insert_content('rss', 'Title', 'https://a.example/1', 'hash-1', 'Summary')
+        return first, again, await storage.content_exists('hash-1'), await storage.content_exists('hash-2')
+
+    first, again, exists, missing = run(make_storage, scenario)
+    assert first is not None and again is None
+    assert exists and not missing
+
+
+def test_mark_posted_removes_content_from_unposted(make_storage):
+    async def scenario(storage):
+        since = datetime.now() - timedelta(hours=1)
+        content_id = await storage.insert_content('rss', 'Title', 'https://a.example/2', 'hash-2', 'Summary')
+        before = await storage.unposted_content('twitter', since)
+        await storage.mark_posted(content_id, 'twitter')
+        return (content_id, before, await storage.unposted_content('twitter', since),
+                await storage.unposted_content('telegram', since), await storage.content_summary())
+
+    content_id, before, twitter, telegram, summary = run(make_storage, scenario)
+    assert [row['id'] for row in before] == [content_id]
+    assert twitter == []
+    assert [row['id'] for row in telegram] == [content_id]
+    assert summary == {'total_content': 1, 'twitter_posts': 1, 'linkedin_posts': 0, 'telegram_posts': 0}
+
+
+def test_future_content_is_held_back(make_storage):
+    async def scenario(storage):
+        await storage.insert_content('batch', 'Later', 'https://a.example/3', 'hash-3', 'Summary',
+                                     discovered_at=datetime.now() + timedelta(hours=2))
+        return await storage.unposted_content('twitter', datetime.now() - timedelta(hours=1))
+
+    assert run(make_storage, scenario) == []
+
+
+def test_upsert_proposals_returns_only_new(make_storage):
+    async def scenario(storage):
+        first = await storage.upsert_proposals([proposal(1), proposal(2)])
+        second = await storage.upsert_proposals([proposal(2, 'closed'), proposal(3), proposal(3)])
+        return first, second
+
+    first, second = run(make_storage, scenario)
+    assert [p.proposal_id for p in first] == ['1', '2']
+    assert [p.proposal_id for p in second] == ['3']
+
+
+def test_bulk_ingest_skips_existing_rows(make_storage):
+    columns = ('source', 'title', 'url', 'content_hash', 'discovered_at', 'summary')
+    now = datetime.now()
+    rows = [('rss', f"T{n}", f"https://b.example/{n}", f"h{n}", now, 'S') for n in range(3)]
+
+    async def scenario(storage):
+        loaded = await storage.bulk_ingest('monitored_content', columns, rows)
+        reloaded = await storage.bulk_ingest('monitored_content', columns, rows[:1])
+        return loaded, reloaded, await storage.recent_content(10)
+
+    loaded, reloaded, recent = run(make_storage, scenario)
+    assert (loaded, reloaded) == (3, 0)
+    assert len(recent) == 3
+
+
+def test_bulk_ingest_rejects_unknown_columns(make_storage):
+    async def scenario(storage):
+        await storage.bulk_ingest('monitored_content', ('source', 'secret'), [('rss', 'x')])
+
+    with pytest.raises(ValueError):
+        run(make_storage, scenario)
+
+
+def test_archived_content_is_deleted_but_still_seen(make_storage):
+    async def scenario(storage):
+        old = datetime.now() - timedelta(days=40)
+        for n in (1, 2, 3):
+            await storage.insert_content('rss', f"Title {n}", f"https://a.example/old-{n}", f"hash-old-{n}",
+                                         'Summary', discovered_at=old)
+        await storage.insert_content('rss', 'Fresh', 'https://a.example/fresh', 'hash-fresh', 'Summary')
+
+        cutoff = datetime.now() - timedelta(days=30)
+        first = await storage.expired_content(cutoff, limit=10)
+        kept = [row['id'] for row in first if row['content_hash'] == 'hash-old-2']
+        expired = await storage.expired_content(cutoff, limit=1, keep_ids=kept)
+        await storage.archive_content(expired, 'segment-1')
+        return (first, expired, await storage.expired_content(cutoff, limit=10, keep_ids=kept),
+                await storage.content_exists('hash-old-1'), await storage.content_summary(days=60))
+
+    first, expired, remaining, still_seen, summary = run(make_storage, scenario)
+    assert [row['content_hash'] for row in first] == ['hash-old-1', 'hash-old-2', 'hash-old-3']
+    assert [row['title'] for row in expired] == ['Title 1']
+    assert [row['content_hash'] for row in remaining] == ['hash-old-3']
+    assert still_seen
+    assert summary['total_content'] == 3
+
+
+def test_second_host_is_refused(postgres_url):
+    async def scenario():
+        first = PostgresStorage(postgres_url, min_size=1, max_size=2, host_id='host-a')
+        second = PostgresStorage(postgres_url, min_size=1, max_size=2, host_id='host-b')
+        same_host = PostgresStorage(postgres_url, min_size=1, max_size=2, host_id='host-a')
+        try:
+            await first.open()
+            await same_host.open()
+            with pytest.raises(HostConflictError):
+                await second.open()
+            # The refusal sticks for the rest of the process
+            with pytest.raises(HostConflictError):
+                await second.content_exists('anything')
+        finally:
+            for storage in (first, second, same_host):
+                await storage.close()
+
+    asyncio.run(scenario())
+
+
+def test_lapsed_host_claim_can_be_taken_over(postgres_url):
+    async def scenario():
+        first = PostgresStorage(postgres_url, min_size=1, max_size=2, host_id='host-a', host_ttl_seconds=1)
+        second = PostgresStorage(postgres_url, min_size=1, max_size=2, host_id='host-b', host_ttl_seconds=1)
+        try:
+            await first.open()
+            await first.close()
+            await asyncio.sleep(1.5)
+            await second.open()
+        finally:
+            await second.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,98 @@
+"""Incremental viral scoring and the alert board"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from content_model import ContentItem, Proposal
+from db_migrations import connect
+from viral_alerts import ViralScorer
+
+NOW = datetime(2030, 1, 7, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def scorer(db_path):
+    return ViralScorer(connect(db_path), threshold=60)
+
+
+def news(source: str, title: str, hours_old: float = 0.5) -> ContentItem:
+    return ContentItem(source=source, title=title, url=f"https://{source}.example/{abs(hash(title))}",
+                       type='news', published=NOW - timedelta(hours=hours_old))
+
+
+def test_single_fresh_news_item_does_not_alert(scorer):
+    assert scorer.ingest(news('coindesk', 'Arbitrum treasury diversification vote'), NOW.timestamp()) is None
+
+
+def test_story_trending_across_sources_alerts_without_votes(scorer, db_path):
+    now = NOW.timestamp()
+    title = 'Arbitrum treasury diversification vote'
+    scorer.ingest(news('twitter', title), now)
+    scorer.ingest(news('forum', title), now)
+    alert = scorer.ingest(news('coindesk', title), now)
+
+    assert alert is not None and alert['viral_score'] >= 60
+    stored = connect(db_path).execute(
+        "SELECT id, url FROM viral_alerts WHERE content_key = ?", (alert['content_key'],)
+    ).fetchone()
+    assert stored == (alert['alert_id'], alert['url'])
+    assert 'content_id' not in alert
+
+
+def test_stale_news_does_not_alert_even_when_mentioned(scorer):
+    now = NOW.timestamp()
+    title = 'Arbitrum treasury diversification vote'
+    for source in ('twitter', 'forum', 'coindesk'):
+        alert = scorer.ingest(news(source, title, hours_old=72), now)
+    assert alert is None
+
+
+def test_fast_voting_proposal_alerts(scorer):
+    proposal = Proposal(source='snapshot', dao_name='MoonDAO', proposal_id='1', title='Fund lunar mission',
+                        url='https://snapshot.org/#/moondao/p/1', status='active', votes_total=2000,
+                        start_date=NOW - timedelta(hours=1))
+    alert = scorer.ingest(proposal, NOW.timestamp())
+    assert alert is not None and alert['viral_score'] >= 60
+
+
+def test_one_shared_word_is_not_a_cross_source_story(scorer):
+    now = NOW.timestamp()
+    assert scorer.ingest(news('coindesk', 'Stablecoin reserves hit record at MakerDAO'), now) is None
+    assert scorer.ingest(news('theblock', 'Curve launches stablecoin lending market'), now) is None
+
+
+def test_re_ingesting_an_alerted_item_does_not_alert_again(scorer, db_path):
+    now = NOW.timestamp()
+    title = 'Arbitrum treasury diversification vote'
+    scorer.ingest(news('twitter', title), now)
+    scorer.ingest(news('forum', title), now)
+    item = news('coindesk', title)
+    assert scorer.ingest(item, now) is not None
+
+    # The next hourly cycles collect the same items again
+    for hour in (1, 2):
+        later = now + hour * 3600
+        assert all(scorer.ingest(news(source, title), later) is None for source in ('twitter', 'forum'))
+        assert scorer.ingest(item, later) is None
+
+    # A scorer started after a restart remembers what was already alerted
+    restarted = ViralScorer(connect(db_path), threshold=60)
+    for source in ('twitter', 'forum', 'coindesk'):
+        assert restarted.ingest(news(source, title), now) is None
+
+
+def test_alerted_story_alerts_again_once_its_score_rises(scorer):
+    proposal = Proposal(source='snapshot', dao_name='MoonDAO', proposal_id='1', title='Fund lunar mission',
+                        url='https://snapshot.org/#/moondao/p/1', status='active', votes_total=150,
+                        start_date=NOW - timedelta(hours=1))
+    now = NOW.timestamp()
+    first = scorer.ingest(proposal, now)
+    assert first is not None
+
+    # Coverage elsewhere is the same story, not a new alert of its own
+    assert scorer.ingest(news('twitter', 'Fund lunar mission'), now + 600) is None
+
+    proposal.votes_total = 1500
+    second = scorer.ingest(proposal, now + 1800)
+    assert second is not None and second['viral_score'] >= first['viral_score'] + 10
@@ -15,6 +15,8 @@ import asyncio
 import concurrent.futures
 import logging
 
+from db_migrations import migrate
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -133,81 +135,13 @@ POSTS_PER_DAY_TELEGRAM=12
         """Initialize SQLite database with all required tables"""
         logger.info("🗄️ Initializing database...")
         
-        db_path = self.base_dir / 'dao_monitoring.db'
+        db_path = self.base_dir / os.getenv('DATABASE_PATH', 'dao_monitoring.db')
+
+        # Tables, columns and indexes come from the shared numbered migrations
+        migrate(str(db_path))
         conn = sqlite3.connect(db_path)
         cursor = conn.cursor()
         
-        # Create tables for aggressive growth tracking
-        tables = [
-            '''CREATE TABLE IF NOT EXISTS monitored_content (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                source TEXT NOT NULL,
-                title TEXT NOT NULL,
-                url TEXT UNIQUE,
-                content_hash TEXT,
-                discovered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                processed_at TIMESTAMP,
-                summary TEXT,
-                viral_score INTEGER DEFAULT 0,
-                posted_twitter BOOLEAN DEFAULT 0,
-                posted_linkedin BOOLEAN DEFAULT 0,
-                posted_telegram BOOLEAN DEFAULT 0,
-                engagement_twitter INTEGER DEFAULT 0,
-                engagement_linkedin INTEGER DEFAULT 0,
-                engagement_telegram INTEGER DEFAULT 0
-            )''',
-            
-            '''CREATE TABLE IF NOT EXISTS growth_metrics (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                date DATE NOT NULL,
-                platform TEXT NOT NULL,
-                followers INTEGER DEFAULT 0,
-                following INTEGER DEFAULT 0,
-                posts_count INTEGER DEFAULT 0,
-                likes_received INTEGER DEFAULT 0,
-                shares_received INTEGER DEFAULT 0,
-                comments_received INTEGER DEFAULT 0,
-                engagement_rate REAL DEFAULT 0.0,
-                reach INTEGER DEFAULT 0,
-                impressions INTEGER DEFAULT 0
-            )''',
-            
-            '''CREATE TABLE IF NOT EXISTS viral_alerts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                content_title TEXT NOT NULL,
-                viral_score INTEGER NOT NULL,
-                trending_hashtags TEXT,
-                recommended_action TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                acted_upon BOOLEAN DEFAULT 0,
-                result_engagement INTEGER DEFAULT 0
-            )''',
-            
-            '''CREATE TABLE IF NOT EXISTS posting_schedule (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                platform TEXT NOT NULL,
-                scheduled_time TIMESTAMP NOT NULL,
-                content_type TEXT,
-                content TEXT,
-                status TEXT DEFAULT 'pending',
-                posted_at TIMESTAMP,
-                engagement_score INTEGER DEFAULT 0
-            )''',
-            
-            '''CREATE TABLE IF NOT EXISTS growth_targets (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                platform TEXT NOT NULL,
-                target_date DATE NOT NULL,
-                target_followers INTEGER NOT NULL,
-                current_followers INTEGER DEFAULT 0,
-                daily_target REAL NOT NULL,
-                progress_percentage REAL DEFAULT 0.0
-            )'''
-        ]
-        
-        for table_sql in tables:
-            cursor.execute(table_sql)
-        
         # Insert initial growth targets for 2-month aggressive plan
         targets = [
             ('twitter', '2024-04-01', 4500, 0, 75.0, 0.0),
@@ -293,15 +227,15 @@ POSTS_PER_DAY_TELEGRAM=12
         
         services = []
         
-        # Start FastAPI backend
+        # Start FastAPI backend (monitoring runs in the dedicated worker below)
         backend_process = subprocess.Popen([
             sys.executable, 'mobile_app_backend.py'
-        ], cwd=self.base_dir)
+        ], cwd=self.base_dir, env={**os.environ, 'MONITOR_MODE': 'external'})
         services.append(('Backend API', backend_process))
         
         # Start DAO monitoring
         monitor_process = subprocess.Popen([
-            sys.executable, 'dao_monitoring_llm.py'
+            sys.executable, 'monitor_worker.py'
         ], cwd=self.base_dir)
         services.append(('DAO Monitor', monitor_process))
         
@@ -349,6 +283,7 @@ ExecStart={sys.executable} mobile_app_backend.py
 Restart=always
 RestartSec=10
 Environment=PYTHONPATH={self.base_dir}
+Environment=MONITOR_MODE=external
 
 [Install]
 WantedBy=multi-user.target
@@ -361,7 +296,7 @@ After=network.target
 Type=simple
 User=treasurecorp
 WorkingDirectory={self.base_dir}
-ExecStart={sys.executable} dao_monitoring_llm.py
+ExecStart={sys.executable} monitor_worker.py
 Restart=always
 RestartSec=10
 Environment=PYTHONPATH={self.base_dir}
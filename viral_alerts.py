@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Viral Alert Engine
+Streams collected items through an incremental viral scorer and keeps the
+top alerts in a heap, so /api/viral/alerts never rescans the table
+"""
+
+import heapq
+import json
+import math
+import os
+import re
+import sqlite3
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Deque, Dict, FrozenSet, List, Optional, Set, Tuple
+import logging
+
+from content_model import ContentItem, Proposal
+
+logger = logging.getLogger(__name__)
+
+# Alerts at or above this score are persisted and pushed to the mobile app
+VIRAL_ALERT_THRESHOLD = int(os.getenv("VIRAL_ALERT_THRESHOLD", "60"))
+
+# Scores halve every DECAY_HALF_LIFE_HOURS after their last update
+DECAY_HALF_LIFE_HOURS = 6.0
+
+# Cross-source mentions only count inside this window
+MENTION_WINDOW_HOURS = 48
+
+# Two items are the same story when they share at least this many terms and this
+# share (Jaccard) of their combined terms; one common word is not enough
+MIN_SHARED_TERMS = 2
+SAME_STORY_SIMILARITY = 0.5
+
+# An alert already raised for an item is only pushed again once its score has
+# risen this many points above the score it was last alerted at
+VIRAL_REALERT_MARGIN = 10.0
+
+# Points each signal contributes at most; without a vote signal (news, forum and
+# Twitter items) mentions and recency are scaled up to fill the whole 0-100 range
+VELOCITY_WEIGHT = 40.0
+MENTION_WEIGHT = 30.0
+RECENCY_WEIGHT = 30.0
+
+# Words too generic to identify a story across sources
+GENERIC_TERMS = {
+    'dao', 'daos', 'treasury', 'governance', 'proposal', 'proposals', 'defi', 'crypto',
+    'token', 'tokens', 'blockchain', 'update', 'community', 'report', 'analysis', 'about',
+    'with', 'from', 'this', 'that', 'will', 'into', 'your', 'their', 'what', 'how', 'why',
+    'after', 'over', 'more', 'than', 'have', 'new', 'the', 'and', 'for'
+}
+
+_DECAY_RATE = math.log(2) / (DECAY_HALF_LIFE_HOURS * 3600)
+
+
+def decayed_score(score: float, updated_at: float, now: Optional[float] = None) -> float:
+    """Score after exponential decay since its last update"""
+    now = time.time() if now is None else now
+    return score * math.exp(-_DECAY_RATE * max(now - updated_at, 0))
+
+
+class ViralAlertBoard:
+    """Top-K viral alerts in a max-heap with lazy invalidation.
+
+    Every alert decays at the same rate, so ordering by log(score) + rate * updated_at
+    never changes over time; updates push a new heap entry and stale ones are skipped.
+    """
+
+    def __init__(self, max_alerts: int = 500):
+        self.max_alerts = max_alerts
+        self._heap: List[Tuple[float, int, str]] = []
+        self._alerts: Dict[str, Dict] = {}
+        self._versions: Dict[str, int] = {}
+        self._counter = 0
+
+    def __len__(self):
+        return len(self._alerts)
+
+    def upsert(self, alert: Dict):
+        """Insert or replace an alert keyed by its content_key"""
+        key = alert['content_key']
+        self._counter += 1
+        self._alerts[key] = alert
+        self._versions[key] = self._counter
+
+        order_key = math.log(max(alert['viral_score'], 1e-6)) + _DECAY_RATE * alert['updated_at']
+        heapq.heappush(self._heap, (-order_key, self._counter, key))
+
+        if len(self._heap) > 4 * len(self._alerts) + 64 or len(self._alerts) > self.max_alerts:
+            self._compact()
+
+    def top(self, k: int = 10, now: Optional[float] = None) -> List[Dict]:
+        """Return the k highest alerts with their current decayed scores"""
+        popped = []
+        results = []
+
+        while self._heap and len(results) < k:
+            entry = heapq.heappop(self._heap)
+            _, version, key = entry
+            if self._versions.get(key) != version:
+                continue  # Superseded by a newer update
+            popped.append(entry)
+            alert = self._alerts[key]
+            results.append({**alert, 'viral_score': round(decayed_score(alert['viral_score'], alert['updated_at'], now))})
+
+        for entry in popped:
+            heapq.heappush(self._heap, entry)
+
+        return results
+
+    def _compact(self):
+        """Drop stale heap entries and, if over capacity, the lowest-ranked alerts"""
+        live = [entry for entry in self._heap if self._versions.get(entry[2]) == entry[1]]
+        heapq.heapify(live)
+
+        if len(live) > self.max_alerts:
+            live = heapq.nsmallest(self.max_alerts, live)
+            kept = {entry[2] for entry in live}
+            for key in list(self._alerts):
+                if key not in kept:
+                    del self._alerts[key]
+                    del self._versions[key]
+            heapq.heapify(live)
+
+        self._heap = live
+
+    def load_recent(self, conn: sqlite3.Connection, limit: int = 500):
+        """Warm the board from persisted alerts"""
+        rows = conn.execute('''
+            SELECT id, content_key, content_title, url, source, viral_score,
+                   trending_hashtags, recommended_action, updated_at
+            FROM viral_alerts
+            WHERE content_key IS NOT NULL
+            ORDER BY updated_at DESC
+            LIMIT ?
+        ''', (limit,)).fetchall()
+
+        for row in rows:
+            self.upsert(_row_to_alert(row))
+
+
+class ViralScorer:
+    """Incremental viral scoring from vote velocity, cross-source mentions and recency"""
+
+    def __init__(self, conn: sqlite3.Connection, board: Optional[ViralAlertBoard] = None,
+                 threshold: int = VIRAL_ALERT_THRESHOLD):
+        self.conn = conn
+        self.board = board or ViralAlertBoard()
+        self.threshold = threshold
+
+        # Last (votes, seen_at, velocity) per proposal for velocity estimates
+        self._vote_history: Dict[str, Tuple[int, float, float]] = {}
+
+        # (source, content_key) -> (seen_at, terms) of items inside the mention window,
+        # with (seen_at, (source, content_key)) in arrival order for expiry
+        self._stories: Dict[Tuple[str, str], Tuple[float, FrozenSet[str]]] = {}
+        self._story_times: Deque[Tuple[float, Tuple[str, str]]] = deque()
+
+        # term -> recent (seen_at, (source, content_key)) mentions, to find items sharing terms
+        self._mentions: Dict[str, Deque[Tuple[float, Tuple[str, str]]]] = defaultdict(deque)
+
+        # content_key -> score it was last alerted at; items are re-scored every cycle
+        self._alerted: Dict[str, float] = dict(conn.execute(
+            "SELECT content_key, viral_score FROM viral_alerts WHERE content_key IS NOT NULL"
+        ).fetchall())
+
+    def ingest(self, item: ContentItem, now: Optional[float] = None) -> Optional[Dict]:
+        """Score one collected item; persist and return an alert when it crosses the threshold
+
+        Items are re-collected every cycle, so a story that already raised an alert only
+        raises another once its score is VIRAL_REALERT_MARGIN points above that one.
+        """
+        now = time.time() if now is None else now
+        key = item.content_key
+        terms = _story_terms(item.normalized_title)
+        source = item.source
+
+        same_story = self._record_mentions(key, terms, source, now)
+        mention_sources = len({story_source for story_source, _ in same_story})
+
+        mention_points = MENTION_WEIGHT * (1 - math.exp(-max(mention_sources - 1, 0) / 2))
+
+        age_hours = _age_hours(item, now)
+        if age_hours is not None:
+            recency_points = RECENCY_WEIGHT * 0.5 ** (age_hours / DECAY_HALF_LIFE_HOURS)
+        else:
+            recency_points = RECENCY_WEIGHT / 3
+
+        if isinstance(item, Proposal) and item.votes_total is not None:
+            velocity = self._vote_velocity(key, item, now)
+            score = mention_points + recency_points + VELOCITY_WEIGHT * (1 - math.exp(-velocity / 50))  # votes per hour
+        else:
+            score = (mention_points + recency_points) * 100 / (MENTION_WEIGHT + RECENCY_WEIGHT)
+
+        score = min(score, 100.0)
+        if score < self.threshold:
+            return None
+
+        # Already alerted for this item or the same story from another source:
+        # only push again when the story has clearly grown
+        alerted_scores = [self._alerted[story_key] for _, story_key in same_story if story_key in self._alerted]
+        if alerted_scores and score < max(alerted_scores) + VIRAL_REALERT_MARGIN:
+            return None
+
+        alert = {
+            'content_key': key,
+            'title': item.title,
+            'url': item.url,
+            'source': source,
+            'viral_score': score,
+            'trending_hashtags': _hashtags(terms),
+            'recommended_action': _recommended_action(item, score),
+            'updated_at': now
+        }
+        alert['alert_id'] = self._persist(alert)
+        self._alerted[key] = score
+        self.board.upsert(alert)
+        return {**alert, 'viral_score': round(score)}
+
+    def _record_mentions(self, key: str, terms: Set[str], source: str, now: float) -> Set[Tuple[str, str]]:
+        """Add this item's mentions and return the (source, content_key) of every recent item
+        carrying the same story, this one included"""
+        cutoff = now - MENTION_WINDOW_HOURS * 3600
+        while self._story_times and self._story_times[0][0] < cutoff:
+            seen_at, story = self._story_times.popleft()
+            if story in self._stories and self._stories[story][0] == seen_at:
+                del self._stories[story]
+
+        story = (source, key)
+        candidates = set()
+        for term in terms:
+            mentions = self._mentions[term]
+            while mentions and mentions[0][0] < cutoff:
+                mentions.popleft()
+            candidates.update(other for _, other in mentions)
+            mentions.append((now, story))
+
+        story_terms = frozenset(terms)
+        self._stories[story] = (now, story_terms)
+        self._story_times.append((now, story))
+
+        same_story = {story}
+        for other in candidates - {story}:
+            if other not in self._stories:
+                continue
+            other_terms = self._stories[other][1]
+            shared = len(story_terms & other_terms)
+            if shared >= MIN_SHARED_TERMS and shared / len(story_terms | other_terms) >= SAME_STORY_SIMILARITY:
+                same_story.add(other)
+
+        return same_story
+
+    def _vote_velocity(self, key: str, item: Proposal, now: float) -> float:
+        """Votes per hour, smoothed across observations of the same proposal"""
+        votes = int(item.votes_total or 0)
+        previous = self._vote_history.get(key)
+
+        if previous:
+            prev_votes, prev_seen, prev_velocity = previous
+            hours = max((now - prev_seen) / 3600, 1 / 60)
+            velocity = 0.5 * prev_velocity + 0.5 * max(votes - prev_votes, 0) / hours
+        else:
+            # First sighting: average rate since the vote opened
+            started_ts = item.start_date.timestamp() if item.start_date else None
+            hours = max((now - started_ts) / 3600, 1.0) if started_ts else 24.0
+            velocity = votes / hours
+
+        self._vote_history[key] = (votes, now, velocity)
+        return velocity
+
+    def _persist(self, alert: Dict) -> int:
+        """Upsert the alert by content_key; returns its viral_alerts row id"""
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            INSERT INTO viral_alerts
+            (content_key, content_title, url, source, viral_score, trending_hashtags,
+             recommended_action, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(content_key) DO UPDATE SET
+                viral_score = excluded.viral_score,
+                trending_hashtags = excluded.trending_hashtags,
+                recommended_action = excluded.recommended_action,
+                updated_at = excluded.updated_at
+        ''', (
+            alert['content_key'], alert['title'], alert['url'], alert['source'],
+            round(alert['viral_score']), json.dumps(alert['trending_hashtags']),
+            alert['recommended_action'], datetime.now(), alert['updated_at']
+        ))
+        self.conn.commit()
+
+        row = self.conn.execute(
+            "SELECT id FROM viral_alerts WHERE content_key = ?", (alert['content_key'],)
+        ).fetchone()
+        return row[0]
+
+
+def _row_to_alert(row) -> Dict:
+    return {
+        'alert_id': row[0],
+        'content_key': row[1],
+        'title': row[2],
+        'url': row[3] or '',
+        'source': row[4] or '',
+        'viral_score': float(row[5]),
+        'trending_hashtags': json.loads(row[6]) if row[6] else [],
+        'recommended_action': row[7] or '',
+        'updated_at': float(row[8] or 0)
+    }
+
+
+def _story_terms(normalized_title: str) -> Set[str]:
+    words = re.findall(r"[a-z0-9][a-z0-9\-\.]{2,}", normalized_title)
+    return {word.strip('.-') for word in words if word not in GENERIC_TERMS}
+
+
+def _age_hours(item: ContentItem, now: float) -> Optional[float]:
+    """Hours since publication (feed time or proposal start)"""
+    if item.published is None:
+        return None
+    return max((now - item.published.timestamp()) / 3600, 0.0)
+
+
+def _hashtags(terms: Set[str]) -> List[str]:
+    tags = ['#DAO']
+    for term in sorted(terms, key=len, reverse=True):
+        if term.isalpha() and len(tags) < 3:
+            tags.append('#' + term.capitalize())
+    return tags
+
+
+def _recommended_action(item: ContentItem, score: float) -> str:
+    if score >= 85:
+        return "Create breaking news thread immediately"
+    if isinstance(item, Proposal) and item.votes_total is not None:
+        return "Share analysis and predictions before the vote closes"
+    if item.type == 'news':
+        return "Post treasury analysis while the story is trending"
+    return "Queue for the next viral posting slot"